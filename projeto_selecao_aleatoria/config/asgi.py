@@ -11,6 +11,16 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'projeto_selecao_aleatoria.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Importado após o setup do Django (depende dos models)
+from core.asgi import criar_aplicacao  # noqa: E402
+from core.views.processors.docker_processor import RPADockerProcessor  # noqa: E402
+
+# Rotas de streaming (SSE) são atendidas direto em ASGI; o resto vai para o Django
+application = criar_aplicacao(django_application)
+
+# Término de containers órfãos de um reinício é tratado sem esperar um novo disparo
+RPADockerProcessor.iniciar_ouvinte()
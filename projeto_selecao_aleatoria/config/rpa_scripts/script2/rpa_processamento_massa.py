@@ -1,4 +1,5 @@
 # teste_processamento_massa.py
+import os
 import subprocess
 import shlex
 import threading
@@ -7,15 +8,91 @@ import json
 import re
 import concurrent.futures
 
+
+class ArquivoCheckpoint:
+    """
+    Registro append-only dos itens concluídos (uma linha JSON por item).
+
+    Cada item é gravado assim que seu resultado chega, então uma execução
+    interrompida perde no máximo a linha que estava sendo escrita.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+
+    def carregar(self):
+        """Retorna {item_id: resultado} dos itens já concluídos."""
+        concluidos = {}
+        if not os.path.exists(self.caminho):
+            return concluidos
+        with open(self.caminho, encoding="utf-8") as f:
+            for linha in f:
+                try:
+                    registro = json.loads(linha)
+                    concluidos[int(registro["id"])] = registro["resultado"]
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    # Última linha incompleta de uma execução interrompida
+                    continue
+        return concluidos
+
+    @staticmethod
+    def _termina_com_quebra(f):
+        f.buffer.seek(f.buffer.seek(0, os.SEEK_END) - 1)
+        return f.buffer.read(1) == b"\n"
+
+    def registrar(self, item_id, resultado):
+        """Acrescenta um item concluído e força a gravação em disco."""
+        linha = json.dumps({"id": item_id, "resultado": resultado}, ensure_ascii=False)
+        with self._lock:
+            with open(self.caminho, "a+", encoding="utf-8") as f:
+                # Linha incompleta de uma execução interrompida: começa em uma nova linha
+                if f.tell() and not self._termina_com_quebra(f):
+                    linha = "\n" + linha
+                f.write(linha + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def faixas_pendentes(total_itens, concluidos, itens_por_lote):
+    """
+    Divide os itens ainda não concluídos em faixas contíguas de até `itens_por_lote`.
+
+    Returns:
+        Lista de (start_id, quantidade)
+    """
+    faixas = []
+    inicio = None
+    for item_id in range(1, total_itens + 2):
+        pendente = item_id <= total_itens and item_id not in concluidos
+        if pendente and inicio is None:
+            inicio = item_id
+        if inicio is not None and (not pendente or item_id - inicio == itens_por_lote):
+            faixas.append((inicio, item_id - inicio))
+            inicio = item_id if pendente else None
+    return faixas
+
+
 class DockerRPAProcessor:
     """Classe para gerenciar RPAs Docker para processamento em massa"""
     
-    def __init__(self, imagem_docker):
+    def __init__(self, imagem_docker, checkpoint=None):
+        """
+        Args:
+            imagem_docker: Imagem que processa um lote ("start_id quantidade complexidade")
+            checkpoint: Caminho do arquivo de itens concluídos (permite retomar a execução)
+        """
         self.imagem_docker = imagem_docker
+        self.checkpoint = ArquivoCheckpoint(checkpoint) if checkpoint else None
         self.progresso_geral = 0
         self.itens_processados = 0
         self.total_itens = 0
         self.resultados = []
+        self._lock = threading.Lock()
+
+    def _registrar_item(self, item_id, resultado):
+        if self.checkpoint:
+            self.checkpoint.registrar(item_id, resultado)
     
     def processar_lote(self, start_id, quantidade, complexidade=1):
         """Processa um lote de itens via Docker"""
@@ -54,8 +131,14 @@ class DockerRPAProcessor:
                     try:
                         resultado_json = linha.split('resultado:')[1]
                         resultado = json.loads(resultado_json)
+                        if not isinstance(resultado, dict):
+                            raise ValueError(f"resultado não é um objeto JSON: {resultado_json}")
+                        # Sem id no resultado, os itens chegam na ordem do lote
+                        item_id = int(resultado.get('id', start_id + len(resultados_lote)))
                         resultados_lote.append(resultado)
-                    except (json.JSONDecodeError, IndexError) as e:
+                        self._registrar_item(item_id, resultado)
+                    except (IndexError, TypeError, ValueError) as e:
+                        # Linha malformada (JSONDecodeError é ValueError): descarta só este item
                         print(f"Erro ao processar resultado: {e}")
         
         # Capturar erros
@@ -70,20 +153,33 @@ class DockerRPAProcessor:
         return resultados_lote
     
     def processar_muitos(self, total_itens, itens_por_lote=10, workers=3, complexidade=1):
-        """Processa muitos itens dividindo em lotes e usando múltiplos workers"""
+        """
+        Processa muitos itens dividindo em lotes e usando múltiplos workers.
+
+        Com checkpoint, os itens já concluídos em execuções anteriores são
+        reaproveitados e apenas as faixas restantes são enviadas aos containers.
+        """
         self.total_itens = total_itens
         
-        # Calcular número de lotes
-        num_lotes = (total_itens + itens_por_lote - 1) // itens_por_lote  # Arredonda para cima
+        concluidos = {}
+        if self.checkpoint:
+            concluidos = {
+                item_id: resultado
+                for item_id, resultado in self.checkpoint.carregar().items()
+                if 1 <= item_id <= total_itens
+            }
+        self.resultados = [concluidos[item_id] for item_id in sorted(concluidos)]
+        self.itens_processados = len(concluidos)
         
-        print(f"Iniciando processamento de {total_itens} itens em {num_lotes} lotes usando {workers} workers")
+        # Criar os lotes (somente com os itens pendentes)
+        lotes = [
+            (start_id, quant, complexidade)
+            for start_id, quant in faixas_pendentes(total_itens, concluidos, itens_por_lote)
+        ]
         
-        # Criar os lotes
-        lotes = []
-        for i in range(num_lotes):
-            start_id = i * itens_por_lote + 1
-            quant = min(itens_por_lote, total_itens - (i * itens_por_lote))
-            lotes.append((start_id, quant, complexidade))
+        if concluidos:
+            print(f"Retomando: {len(concluidos)} itens já concluídos no checkpoint")
+        print(f"Iniciando processamento de {total_itens - len(concluidos)} itens em {len(lotes)} lotes usando {workers} workers")
         
         # Processar lotes em paralelo
         with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
@@ -95,9 +191,10 @@ class DockerRPAProcessor:
                 lote = future_to_lote[future]
                 try:
                     resultados_lote = future.result()
-                    self.resultados.extend(resultados_lote)
-                    self.itens_processados += lote[1]
-                    self.progresso_geral = int((self.itens_processados / self.total_itens) * 100)
+                    with self._lock:
+                        self.resultados.extend(resultados_lote)
+                        self.itens_processados += lote[1]
+                        self.progresso_geral = int((self.itens_processados / self.total_itens) * 100)
                     print(f"Progresso geral: {self.progresso_geral}% ({self.itens_processados}/{self.total_itens})")
                 except Exception as e:
                     print(f"Lote {lote[0]} gerou uma exceção: {e}")
@@ -122,9 +219,10 @@ if __name__ == "__main__":
     ITENS_POR_LOTE = 5
     WORKERS = 3
     COMPLEXIDADE = 0.5  # Tempo menor para teste
+    CHECKPOINT = "checkpoint_massa.jsonl"  # Reexecutar o teste retoma de onde parou
     
     # Criar o processador
-    processador = DockerRPAProcessor(IMAGEM_DOCKER)
+    processador = DockerRPAProcessor(IMAGEM_DOCKER, checkpoint=CHECKPOINT)
     
     # Iniciar o teste em thread separada para simular o comportamento do Django
     def executar_teste():
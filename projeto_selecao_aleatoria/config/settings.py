@@ -15,6 +15,7 @@ Django settings for projeto_selecao_aleatoria project.
 11. ARQUIVOS ESTÁTICOS
 12. REST FRAMEWORK
 13. LOGGING
+14. EXECUÇÃO DOCKER RPA
 
 Para documentação completa do Django, veja:
 https://docs.djangoproject.com/en/5.2/topics/settings/
@@ -297,4 +298,55 @@ LOGGING = {
             'propagate': False,
         },
     },
-}
\ No newline at end of file
+}
+
+#==============================================================================
+# 14. EXECUÇÃO DOCKER RPA
+#==============================================================================
+# Raiz das áreas de trabalho temporárias (temp_output/ e temp_dados/).
+# Pode apontar para um tmpfs do host (ex.: /dev/shm/rpa) para evitar I/O em disco.
+RPA_SCRATCH_ROOT = Path(os.getenv("RPA_SCRATCH_ROOT", BASE_DIR))
+
+# Monta /app/dados do container como tmpfs em vez de um diretório do host
+RPA_SCRATCH_TMPFS = os.getenv("RPA_SCRATCH_TMPFS", "0").lower() in ("1", "true", "sim")
+RPA_SCRATCH_TMPFS_TAMANHO = os.getenv("RPA_SCRATCH_TMPFS_TAMANHO", "512m")
+
+# Tempo (horas) que a área de trabalho de um processamento com falha é mantida para depuração
+RPA_SCRATCH_TTL_FALHA_HORAS = int(os.getenv("RPA_SCRATCH_TTL_FALHA_HORAS", "48"))
+
+# Limites usados pelo comando limpar_temporarios
+RPA_SCRATCH_IDADE_MAX_HORAS = int(os.getenv("RPA_SCRATCH_IDADE_MAX_HORAS", "168"))
+RPA_SCRATCH_LIMITE_MB = int(os.getenv("RPA_SCRATCH_LIMITE_MB", "2048"))
+
+# Intervalo (segundos) entre varreduras do diretório de saída durante a execução
+RPA_COLETA_INTERVALO = float(os.getenv("RPA_COLETA_INTERVALO", "1.0"))
+
+# Envios simultâneos de arquivos de resultado por processamento
+RPA_UPLOAD_WORKERS = int(os.getenv("RPA_UPLOAD_WORKERS", "4"))
+
+# Glob padrão dos arquivos de resultado (perfis podem definir outro; sem "/" nem "..")
+RPA_OUTPUT_GLOB = os.getenv("RPA_OUTPUT_GLOB", "SA_*.xlsx")
+
+# Logs por processamento (compactados por blocos e enviados ao S3 ao final)
+RPA_LOG_DIR = Path(os.getenv("RPA_LOG_DIR", BASE_DIR / "logs" / "processamentos"))
+RPA_LOG_LINHAS_POR_BLOCO = int(os.getenv("RPA_LOG_LINHAS_POR_BLOCO", "500"))
+# Tempo máximo (s) até um bloco parcial ser gravado, para a leitura do log durante a execução
+RPA_LOG_INTERVALO_GRAVACAO = float(os.getenv("RPA_LOG_INTERVALO_GRAVACAO", "2"))
+
+# Linhas de log mantidas em memória por processamento em execução (tail via SSE)
+RPA_LOG_TAIL_LINHAS = int(os.getenv("RPA_LOG_TAIL_LINHAS", "500"))
+
+# Finalizações (coleta, upload e status) executadas em paralelo a partir dos eventos do Docker
+RPA_FINALIZACAO_WORKERS = int(os.getenv("RPA_FINALIZACAO_WORKERS", "4"))
+
+# Assina os eventos do Docker (e reconcilia órfãos) ao subir o servidor (config/wsgi.py e asgi.py)
+RPA_EVENTOS_NA_INICIALIZACAO = os.getenv("RPA_EVENTOS_NA_INICIALIZACAO", "True").lower() in ("true", "1", "yes")
+
+# Intervalo mínimo (ms) entre gravações de progresso de um processamento
+RPA_PROGRESSO_FLUSH_MS = int(os.getenv("RPA_PROGRESSO_FLUSH_MS", "500"))
+
+# Intervalo máximo (s) para um processo perceber perfis de execução alterados em outro processo
+RPA_PERFIS_VERIFICACAO = float(os.getenv("RPA_PERFIS_VERIFICACAO", "30"))
+
+# Validade (s) do estado de processamentos ativos lido do banco pelo registro em memória
+RPA_REGISTRO_TTL = float(os.getenv("RPA_REGISTRO_TTL", "5"))
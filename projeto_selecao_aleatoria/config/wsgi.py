@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Importado após o setup do Django (depende dos models). Também vale para o
+# runserver, que carrega WSGI_APPLICATION no processo que atende as requisições
+from core.views.processors.docker_processor import RPADockerProcessor  # noqa: E402
+
+# Término de containers órfãos de um reinício é tratado sem esperar um novo disparo
+RPADockerProcessor.iniciar_ouvinte()
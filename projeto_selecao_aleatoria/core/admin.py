@@ -3,7 +3,34 @@
 # Cada classe define como um modelo específico é exibido e gerenciado no painel admin.
 
 from django.contrib import admin
-from .models import ProcessamentoRPA, ProcessamentoRPATemplate, ResultadoProcessamento, Resultado
+from .models import (
+    ProcessamentoRPA, ProcessamentoRPATemplate, ResultadoProcessamento, Resultado, PerfilExecucao,
+    ProcessamentoEvento, ContainerExecucao,
+)
+
+# Metadados do container (somente leitura) exibidos dentro do processamento
+class ContainerExecucaoInline(admin.StackedInline):
+    model = ContainerExecucao
+    readonly_fields = (
+        'container_id', 'container_name', 'imagem', 'comando', 'perfil', 'exit_code', 'oom',
+        'iniciado_em', 'finalizado_em', 'duracao_segundos', 's3_directory', 'logs_s3', 'output_dir',
+    )
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+# Linha do tempo (somente leitura) exibida dentro do processamento
+class ProcessamentoEventoInline(admin.TabularInline):
+    model = ProcessamentoEvento
+    fields = ('tipo', 'criado_em', 'dados')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 # Configuração do admin para ProcessamentoRPA
 # Exibe e gerencia os processamentos RPA, permitindo filtrar por status, tipo e usuário
@@ -23,15 +50,27 @@ class ProcessamentoRPAAdmin(admin.ModelAdmin):
     
     # Navegação hierárquica por data
     date_hierarchy = 'criado_em'
+    
+    # Eventos da execução
+    inlines = [ContainerExecucaoInline, ProcessamentoEventoInline]
 
 # Configuração do admin para Templates de ProcessamentoRPA
 # Gerencia modelos de processamento que podem ser reutilizados
 @admin.register(ProcessamentoRPATemplate)
 class ProcessamentoRPATemplateAdmin(admin.ModelAdmin):
-    list_display = ('id', 'tipo', 'descricao')
+    list_display = ('id', 'tipo', 'descricao', 'perfil')
     list_filter = ('tipo',)
     search_fields = ('id', 'descricao')
 
+# Configuração do admin para Perfis de Execução
+# Define imagem, comando, limites e marcadores usados pelos processamentos Docker
+@admin.register(PerfilExecucao)
+class PerfilExecucaoAdmin(admin.ModelAdmin):
+    list_display = ('nome', 'tipo', 'imagem', 'output_glob', 'ativo', 'atualizado_em')
+    list_filter = ('ativo', 'tipo')
+    search_fields = ('nome', 'imagem')
+    readonly_fields = ('id', 'atualizado_em')
+
 # Configuração do admin para ResultadoProcessamento
 # Exibe e gerencia os arquivos de resultado gerados pelos processamentos
 @admin.register(ResultadoProcessamento)
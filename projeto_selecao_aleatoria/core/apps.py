@@ -18,4 +18,6 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         import core.services.s3.signals
+        import core.services.perfis
+        import core.services.resumo_diario
   
\ No newline at end of file
@@ -0,0 +1,8 @@
+# core/asgi/__init__.py
+"""
+Endpoints ASGI de streaming (SSE e WebSocket), montados em config/asgi.py ao lado do Django.
+"""
+
+from .roteador import criar_aplicacao
+
+__all__ = ['criar_aplicacao']
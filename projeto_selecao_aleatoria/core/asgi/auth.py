@@ -0,0 +1,47 @@
+# core/asgi/auth.py
+"""
+Autenticação JWT para os endpoints ASGI de streaming.
+
+Valida o token de acesso do SimpleJWT sem consultar o banco: o ID do usuário
+vem da própria claim do token. O token pode vir no header Authorization
+(Bearer) ou no parâmetro ?token= (EventSource não envia headers).
+"""
+
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def _token_do_escopo(scope):
+    for nome, valor in scope.get("headers", []):
+        if nome == b"authorization":
+            partes = valor.decode("latin-1").split()
+            if len(partes) == 2 and partes[0] in settings.SIMPLE_JWT["AUTH_HEADER_TYPES"]:
+                return partes[1]
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return (query.get("token") or [None])[0]
+
+
+def usuario_do_escopo(scope):
+    """
+    Extrai o ID do usuário autenticado de um escopo ASGI.
+
+    A claim é convertida para o tipo da chave do usuário (o SimpleJWT grava
+    o ID como texto), para comparar com `user_id` dos processamentos.
+
+    Returns:
+        ID do usuário ou None se o token estiver ausente, inválido ou expirado
+    """
+    token = _token_do_escopo(scope)
+    if not token:
+        return None
+    try:
+        claim = AccessToken(token)[settings.SIMPLE_JWT["USER_ID_CLAIM"]]
+        campo = get_user_model()._meta.get_field(settings.SIMPLE_JWT["USER_ID_FIELD"])
+        return campo.to_python(claim)
+    except (TokenError, KeyError, ValidationError):
+        return None
@@ -0,0 +1,51 @@
+# core/asgi/roteador.py
+"""
+Roteador ASGI: encaminha rotas de streaming (SSE e WebSocket) para as
+aplicações ASGI nativas e todo o restante para a aplicação Django.
+"""
+
+import re
+
+from .sse import tail_logs
+from .websocket import status_processamentos
+
+UUID = r"[0-9a-fA-F-]{32,36}"
+
+ROTAS_HTTP = [
+    (re.compile(rf"^/api/docker-rpa/(?P<processamento_id>{UUID})/logs/stream/?$"), tail_logs),
+]
+
+ROTAS_WEBSOCKET = [
+    (re.compile(r"^/ws/processamentos/?$"), status_processamentos),
+]
+
+
+class RoteadorASGI:
+    """Despacha escopos ASGI por tipo e caminho."""
+
+    def __init__(self, django_app, rotas_http=None, rotas_websocket=None):
+        self.django_app = django_app
+        self.rotas_http = ROTAS_HTTP if rotas_http is None else rotas_http
+        self.rotas_websocket = ROTAS_WEBSOCKET if rotas_websocket is None else rotas_websocket
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for padrao, app in self.rotas_http:
+                encontrado = padrao.match(scope["path"])
+                if encontrado:
+                    return await app(scope, receive, send, **encontrado.groupdict())
+        elif scope["type"] == "websocket":
+            for padrao, app in self.rotas_websocket:
+                encontrado = padrao.match(scope["path"])
+                if encontrado:
+                    return await app(scope, receive, send, **encontrado.groupdict())
+            # O Django não atende WebSocket: recusa o handshake
+            await receive()
+            await send({"type": "websocket.close", "code": 1000})
+            return
+        return await self.django_app(scope, receive, send)
+
+
+def criar_aplicacao(django_app):
+    """Cria a aplicação ASGI do projeto a partir da aplicação Django."""
+    return RoteadorASGI(django_app)
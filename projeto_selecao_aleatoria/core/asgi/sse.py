@@ -0,0 +1,123 @@
+# core/asgi/sse.py
+"""
+Tail do log de um processamento Docker via Server-Sent Events.
+
+GET /api/docker-rpa/{id}/logs/stream/?token=<jwt>
+
+Envia as linhas ainda em memória e depois cada nova linha assim que o
+container a escreve. Suporta Last-Event-ID para retomar sem duplicar linhas.
+Disponível apenas enquanto o processamento roda neste processo; depois do
+término, use /api/docker-rpa/{id}/logs/.
+"""
+
+import asyncio
+import json
+import logging
+
+from core.services.logs.tail import obter_buffer
+
+from .auth import usuario_do_escopo
+
+logger = logging.getLogger("docker_rpa")
+
+INTERVALO_HEARTBEAT = 15  # segundos
+FIM = (None, None)
+
+
+async def _responder(send, status, corpo):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({"type": "http.response.body", "body": json.dumps(corpo).encode()})
+
+
+def _ultimo_evento(scope):
+    for nome, valor in scope.get("headers", []):
+        if nome == b"last-event-id":
+            try:
+                return int(valor)
+            except ValueError:
+                return None
+    return None
+
+
+def _evento(seq, linha):
+    # '\r' quebraria o enquadramento do SSE
+    return f"id: {seq}\ndata: {linha.replace(chr(13), '')}\n\n".encode("utf-8")
+
+
+async def tail_logs(scope, receive, send, processamento_id):
+    """Aplicação ASGI que transmite o log de um processamento em execução."""
+    user_id = usuario_do_escopo(scope)
+    if user_id is None:
+        await _responder(send, 401, {"detail": "Token ausente ou inválido."})
+        return
+
+    buffer = obter_buffer(processamento_id)
+    if buffer is None or str(buffer.user_id) != str(user_id):
+        await _responder(send, 404, {"detail": "Processamento não está em execução."})
+        return
+
+    loop = asyncio.get_running_loop()
+    fila = asyncio.Queue(maxsize=1000)
+
+    def _entregar(item):
+        try:
+            fila.put_nowait(item)
+        except asyncio.QueueFull:
+            # Cliente lento: descarta a linha; ele pode recuperá-la pelo endpoint /logs/
+            pass
+
+    def callback(seq, linha):
+        loop.call_soon_threadsafe(_entregar, (seq, linha))
+
+    historico = buffer.assinar(callback, desde=_ultimo_evento(scope))
+    if buffer.encerrado:
+        _entregar(FIM)
+
+    async def _aguardar_desconexao():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    desconexao = asyncio.ensure_future(_aguardar_desconexao())
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        })
+        for seq, linha in historico:
+            await send({"type": "http.response.body", "body": _evento(seq, linha), "more_body": True})
+
+        while not desconexao.done():
+            proximo = asyncio.ensure_future(fila.get())
+            feitos, _ = await asyncio.wait(
+                {proximo, desconexao},
+                timeout=INTERVALO_HEARTBEAT,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if proximo not in feitos:
+                proximo.cancel()
+                if not desconexao.done():
+                    await send({"type": "http.response.body", "body": b": ping\n\n", "more_body": True})
+                continue
+
+            seq, linha = proximo.result()
+            if (seq, linha) == FIM:
+                await send({"type": "http.response.body", "body": b"event: fim\ndata: {}\n\n", "more_body": True})
+                break
+            await send({"type": "http.response.body", "body": _evento(seq, linha), "more_body": True})
+
+        await send({"type": "http.response.body", "body": b""})
+    except OSError:
+        # Conexão caiu no meio do envio
+        pass
+    finally:
+        buffer.cancelar(callback)
+        desconexao.cancel()
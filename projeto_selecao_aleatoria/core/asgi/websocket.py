@@ -0,0 +1,108 @@
+# core/asgi/websocket.py
+"""
+Canal WebSocket com o estado dos processamentos do usuário.
+
+WS /ws/processamentos/?token=<jwt>
+
+Ao conectar, o servidor envia um snapshot dos processamentos ativos:
+  {"tipo": "snapshot", "processamentos": [{...}, ...]}
+e depois, a cada mudança de status, progresso ou fase, um delta:
+  {"tipo": "delta", "processamento": {"id": "...", "progresso": 40}}
+
+Deltas do mesmo processamento que chegam enquanto o cliente ainda não
+recebeu o anterior são combinados, então clientes lentos recebem apenas o
+estado mais recente. O cliente pode enviar {"acao": "ping"} para manter a
+conexão; a resposta é {"tipo": "pong"}.
+"""
+
+import asyncio
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.services.pubsub import barramento, topico_usuario
+
+from .auth import usuario_do_escopo
+
+logger = logging.getLogger("docker_rpa")
+
+CODIGO_NAO_AUTORIZADO = 4401
+
+
+def _texto(mensagem):
+    return json.dumps(mensagem, cls=JSONEncoder, ensure_ascii=False)
+
+
+def _snapshot(user_id):
+    from core.serializers import RPAStatusSerializer
+    from core.services.registro_vivo import obter_registro
+
+    estados = obter_registro().ativos_do_usuario(user_id)
+    return RPAStatusSerializer(estados, many=True).data
+
+
+async def status_processamentos(scope, receive, send):
+    """Aplicação ASGI que envia as mudanças de estado dos processamentos do usuário."""
+    if (await receive())["type"] != "websocket.connect":
+        return
+
+    user_id = usuario_do_escopo(scope)
+    if user_id is None:
+        await send({"type": "websocket.close", "code": CODIGO_NAO_AUTORIZADO})
+        return
+
+    loop = asyncio.get_running_loop()
+    pendentes = {}  # id -> delta combinado ainda não enviado
+    sinal = asyncio.Event()
+
+    def _acumular(mensagem):
+        pendentes.setdefault(mensagem["id"], {}).update(mensagem)
+        sinal.set()
+
+    def callback(mensagem):
+        loop.call_soon_threadsafe(_acumular, mensagem)
+
+    # Assina antes do snapshot: nenhuma mudança entre os dois é perdida
+    cancelar = barramento.assinar(topico_usuario(user_id), callback)
+    recebido = None
+    try:
+        await send({"type": "websocket.accept"})
+        processamentos = await sync_to_async(_snapshot)(user_id)
+        await send({"type": "websocket.send", "text": _texto({"tipo": "snapshot", "processamentos": processamentos})})
+
+        recebido = asyncio.ensure_future(receive())
+        while True:
+            aguardando_sinal = asyncio.ensure_future(sinal.wait())
+            feitos, _ = await asyncio.wait({recebido, aguardando_sinal}, return_when=asyncio.FIRST_COMPLETED)
+
+            if recebido in feitos:
+                aguardando_sinal.cancel()
+                mensagem = recebido.result()
+                if mensagem["type"] == "websocket.disconnect":
+                    break
+                if mensagem.get("text") and _eh_ping(mensagem["text"]):
+                    await send({"type": "websocket.send", "text": _texto({"tipo": "pong"})})
+                recebido = asyncio.ensure_future(receive())
+                continue
+
+            sinal.clear()
+            enviar = list(pendentes.values())
+            pendentes.clear()
+            for delta in enviar:
+                await send({"type": "websocket.send", "text": _texto({"tipo": "delta", "processamento": delta})})
+    except OSError:
+        # Conexão caiu no meio do envio
+        pass
+    finally:
+        cancelar()
+        if recebido:
+            recebido.cancel()
+
+
+def _eh_ping(texto):
+    try:
+        return json.loads(texto).get("acao") == "ping"
+    except (ValueError, AttributeError):
+        return False
@@ -0,0 +1,97 @@
+# core/management/commands/benchmark_resumo.py
+"""
+Mede o tempo do resumo do histórico Docker sobre uma massa sintética.
+
+Uso:
+    python manage.py benchmark_resumo [--linhas 100000] [--repeticoes 5]
+
+A massa (usuário, processamentos e execuções de container) é criada dentro
+de uma transação desfeita no final: o banco volta ao estado anterior. Para
+comparação, mede também o cálculo antigo em Python (leitura de
+`resultado['container_info']` linha a linha).
+"""
+
+import statistics
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import ContainerExecucao, ProcessamentoRPA
+from core.views.docker_rpa import DockerHistoricoViewSet
+
+LOTE = 5000
+IMAGENS = [f"rpa/etl:{versao}" for versao in range(1, 9)]
+STATUS = ["concluido", "concluido", "concluido", "falha", "pendente"]
+
+
+class _Desfazer(Exception):
+    """Interrompe a transação do benchmark para descartar a massa."""
+
+
+class Command(BaseCommand):
+    help = "Mede o endpoint /api/docker-historico/resumo/ sobre uma massa sintética."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--linhas", type=int, default=100_000, help="Processamentos na massa")
+        parser.add_argument("--repeticoes", type=int, default=5, help="Execuções medidas de cada variante")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user = self._criar_massa(options["linhas"])
+                self._medir(user, options["repeticoes"])
+                raise _Desfazer
+        except _Desfazer:
+            pass
+
+    def _criar_massa(self, linhas):
+        user = get_user_model().objects.create_user(f"benchmark-{uuid.uuid4().hex[:8]}")
+        inicio = time.perf_counter()
+        for base in range(0, linhas, LOTE):
+            processamentos, containers = [], []
+            for i in range(base, min(base + LOTE, linhas)):
+                status = STATUS[i % len(STATUS)]
+                info = {"imagem": IMAGENS[i % len(IMAGENS)], "duracao_segundos": float(i % 600)}
+                processamento = ProcessamentoRPA(
+                    user=user, tipo="docker_rpa", status=status, resultado={"container_info": info}
+                )
+                processamentos.append(processamento)
+                containers.append(ContainerExecucao(processamento=processamento, **info))
+            ProcessamentoRPA.objects.bulk_create(processamentos)
+            ContainerExecucao.objects.bulk_create(containers)
+        self.stdout.write(f"Massa: {linhas} processamentos em {time.perf_counter() - inicio:.1f}s")
+        return user
+
+    def _medir(self, user, repeticoes):
+        view = DockerHistoricoViewSet.as_view({"get": "resumo"})
+        fabrica = APIRequestFactory()
+
+        def endpoint():
+            request = fabrica.get("/api/docker-historico/resumo/")
+            force_authenticate(request, user=user)
+            return view(request).data
+
+        def python():
+            # Cálculo anterior: percorre todas as linhas e lê o JSON
+            qs = ProcessamentoRPA.objects.filter(user=user, tipo="docker_rpa")
+            duracoes, imagens = [], {}
+            for p in qs.filter(status="concluido"):
+                duracoes.append(p.resultado["container_info"]["duracao_segundos"])
+            for p in qs:
+                imagem = p.resultado["container_info"]["imagem"]
+                imagens[imagem] = imagens.get(imagem, 0) + 1
+            return sum(duracoes) / len(duracoes), sorted(imagens.items(), key=lambda x: x[1], reverse=True)[:5]
+
+        for nome, funcao in (("banco (aggregate/annotate)", endpoint), ("python (JSON por linha)", python)):
+            tempos = []
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                funcao()
+                tempos.append((time.perf_counter() - inicio) * 1000)
+            self.stdout.write(self.style.SUCCESS(
+                f"{nome}: mediana {statistics.median(tempos):.0f} ms, mínimo {min(tempos):.0f} ms"
+            ))
@@ -0,0 +1,52 @@
+# core/management/commands/limpar_temporarios.py
+"""
+Recolhe as áreas de trabalho temporárias (temp_output/ e temp_dados/).
+
+Uso:
+    python manage.py limpar_temporarios [--limite-mb 2048] [--idade-max-horas 168] [--simular]
+
+Pode ser agendado via cron; processamentos pendentes ou em execução nunca são tocados.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.models import ProcessamentoRPA
+from core.services.workspace import raiz_scratch, varrer_areas
+
+
+class Command(BaseCommand):
+    help = "Remove áreas de trabalho expiradas ou órfãs e aplica o orçamento de espaço."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limite-mb", type=int, default=None,
+            help="Orçamento total de espaço em MB (padrão: RPA_SCRATCH_LIMITE_MB)",
+        )
+        parser.add_argument(
+            "--idade-max-horas", type=int, default=None,
+            help="Idade máxima de áreas sem marcador (padrão: RPA_SCRATCH_IDADE_MAX_HORAS)",
+        )
+        parser.add_argument(
+            "--simular", action="store_true",
+            help="Mostra o que seria removido sem apagar nada",
+        )
+
+    def handle(self, *args, **options):
+        ids_ativos = ProcessamentoRPA.objects.filter(
+            status__in=["pendente", "processando"]
+        ).values_list("id", flat=True)
+
+        limite_mb = options["limite_mb"]
+        resultado = varrer_areas(
+            idade_max_horas=options["idade_max_horas"],
+            limite_bytes=limite_mb * 1024 * 1024 if limite_mb is not None else None,
+            ids_ativos=list(ids_ativos),
+            simular=options["simular"],
+        )
+
+        prefixo = "[simulação] " if options["simular"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefixo}{resultado['removidas']} área(s) removida(s) em {raiz_scratch()}, "
+            f"{resultado['bytes_liberados'] / (1024 * 1024):.1f} MB liberados, "
+            f"{resultado['bytes_restantes'] / (1024 * 1024):.1f} MB restantes"
+        ))
@@ -0,0 +1,30 @@
+# core/management/commands/reconstruir_resumo_diario.py
+"""
+Recalcula o resumo diário por usuário (ResumoDiarioUsuario) a partir dos processamentos.
+
+Uso:
+    python manage.py reconstruir_resumo_diario [--usuario 14 --usuario 15]
+
+O resumo é mantido incrementalmente a cada criação e transição de status;
+este comando corrige divergências (ex.: alterações feitas direto no banco
+ou por bulk_create) e deve ser usado após cargas em massa.
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.services.resumo_diario import reconstruir
+
+
+class Command(BaseCommand):
+    help = "Recalcula o resumo diário de processamentos por usuário."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--usuario", type=int, action="append", dest="usuarios",
+            help="ID do usuário a reconstruir (pode repetir; padrão: todos)",
+        )
+
+    def handle(self, *args, **options):
+        linhas = reconstruir(user_ids=options["usuarios"])
+        alvo = f"usuário(s) {', '.join(map(str, options['usuarios']))}" if options["usuarios"] else "todos os usuários"
+        self.stdout.write(self.style.SUCCESS(f"{linhas} linha(s) de resumo gravada(s) para {alvo}"))
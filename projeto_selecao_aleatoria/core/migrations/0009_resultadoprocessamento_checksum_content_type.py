@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-19 02:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_processamentorpa_s3_directory_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resultadoprocessamento',
+            name='checksum_sha256',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='resultadoprocessamento',
+            name='content_type',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+    ]
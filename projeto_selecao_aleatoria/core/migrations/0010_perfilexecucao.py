@@ -0,0 +1,43 @@
+# Generated by Django 5.2 on 2026-10-19 02:30
+
+import core.models
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_resultadoprocessamento_checksum_content_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerfilExecucao',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('nome', models.CharField(max_length=100, unique=True)),
+                ('tipo', models.CharField(blank=True, max_length=20, null=True, unique=True)),
+                ('imagem', models.CharField(default='selecao_aleatoria:v3.1', max_length=200)),
+                ('comando', models.CharField(blank=True, default='python -u main.py', max_length=500)),
+                ('env_padrao', models.JSONField(blank=True, default=dict)),
+                ('limites', models.JSONField(blank=True, default=dict)),
+                ('output_glob', models.CharField(default='SA_*.xlsx', max_length=100)),
+                ('bucket', models.CharField(default='appbeta-user-results', max_length=100)),
+                ('prefixo_s3', models.CharField(default='selecao_aleatoria', max_length=100)),
+                ('marcadores', models.JSONField(blank=True, default=core.models.marcadores_padrao)),
+                ('ativo', models.BooleanField(default=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Perfil de Execução',
+                'verbose_name_plural': 'Perfis de Execução',
+            },
+        ),
+        migrations.AddField(
+            model_name='processamentorpatemplate',
+            name='perfil',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='templates', to='core.perfilexecucao'),
+        ),
+    ]
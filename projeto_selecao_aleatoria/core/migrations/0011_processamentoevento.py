@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 02:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_perfilexecucao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessamentoEvento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('container_configurado', 'Container configurado'), ('diretorio_s3', 'Diretório S3 criado'), ('container_iniciado', 'Container iniciado'), ('resultados_coletados', 'Resultados coletados'), ('log_enviado', 'Log enviado'), ('container_finalizado', 'Container finalizado')], max_length=30)),
+                ('criado_em', models.DateTimeField(default=django.utils.timezone.now)),
+                ('dados', models.JSONField(blank=True, default=dict)),
+                ('processamento', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eventos', to='core.processamentorpa')),
+            ],
+            options={
+                'verbose_name': 'Evento de Processamento',
+                'verbose_name_plural': 'Eventos de Processamentos',
+                'ordering': ['criado_em', 'id'],
+                'indexes': [models.Index(fields=['processamento', 'criado_em'], name='evento_proc_criado_idx')],
+            },
+        ),
+    ]
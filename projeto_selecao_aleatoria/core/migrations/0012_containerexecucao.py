@@ -0,0 +1,110 @@
+# Generated by Django 5.2 on 2026-10-19 02:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+LOTE = 500
+
+
+def _data(valor):
+    if not isinstance(valor, str):
+        return None
+    try:
+        data = parse_datetime(valor)
+    except ValueError:
+        return None
+    if data is not None and timezone.is_naive(data):
+        # O processador gravava datetime.now() (horário local, sem fuso)
+        data = timezone.make_aware(data)
+    return data
+
+
+def _numero(valor, tipo):
+    try:
+        return tipo(valor) if valor is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _texto(valor, tamanho=None):
+    texto = "" if valor is None else str(valor)
+    return texto[:tamanho] if tamanho else texto
+
+
+def preencher_containers(apps, schema_editor):
+    """Copia os metadados de resultado['container_info'] para as colunas tipadas."""
+    ProcessamentoRPA = apps.get_model('core', 'ProcessamentoRPA')
+    ContainerExecucao = apps.get_model('core', 'ContainerExecucao')
+
+    lote = []
+    processamentos = (
+        ProcessamentoRPA.objects.filter(tipo='docker_rpa', resultado__isnull=False)
+        .values_list('id', 'resultado')
+    )
+    for processamento_id, resultado in processamentos.iterator(chunk_size=LOTE):
+        if not isinstance(resultado, dict):
+            continue
+        # Falhas gravam {"container_info": {...}}; sucessos gravam os campos no topo
+        info = resultado.get('container_info')
+        if not isinstance(info, dict):
+            info = resultado if ('imagem' in resultado or 'container_name' in resultado) else None
+        if not info:
+            continue
+
+        lote.append(ContainerExecucao(
+            processamento_id=processamento_id,
+            container_id=_texto(info.get('container_id'), 64),
+            container_name=_texto(info.get('container_name'), 100),
+            imagem=_texto(info.get('imagem'), 255),
+            comando=_texto(info.get('comando')),
+            perfil=_texto(info.get('perfil'), 50),
+            exit_code=_numero(info.get('exit_code'), int),
+            oom=bool(info.get('oom')),
+            iniciado_em=_data(info.get('container_iniciado')),
+            finalizado_em=_data(info.get('container_finalizado')),
+            duracao_segundos=_numero(info.get('duracao_segundos'), float),
+            s3_directory=_texto(info.get('s3_directory'), 500),
+            logs_s3=_texto(info.get('logs_s3'), 500),
+            output_dir=_texto(info.get('output_dir'), 500),
+        ))
+        if len(lote) >= LOTE:
+            ContainerExecucao.objects.bulk_create(lote, ignore_conflicts=True)
+            lote = []
+    if lote:
+        ContainerExecucao.objects.bulk_create(lote, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_processamentoevento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContainerExecucao',
+            fields=[
+                ('processamento', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='container', serialize=False, to='core.processamentorpa')),
+                ('container_id', models.CharField(blank=True, default='', max_length=64)),
+                ('container_name', models.CharField(blank=True, default='', max_length=100)),
+                ('imagem', models.CharField(blank=True, db_index=True, default='', max_length=255)),
+                ('comando', models.TextField(blank=True, default='')),
+                ('perfil', models.CharField(blank=True, default='', max_length=50)),
+                ('exit_code', models.IntegerField(blank=True, null=True)),
+                ('oom', models.BooleanField(default=False)),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True)),
+                ('finalizado_em', models.DateTimeField(blank=True, null=True)),
+                ('duracao_segundos', models.FloatField(blank=True, db_index=True, null=True)),
+                ('s3_directory', models.CharField(blank=True, default='', max_length=500)),
+                ('logs_s3', models.CharField(blank=True, default='', max_length=500)),
+                ('output_dir', models.CharField(blank=True, default='', max_length=500)),
+            ],
+            options={
+                'verbose_name': 'Execução de Container',
+                'verbose_name_plural': 'Execuções de Containers',
+            },
+        ),
+        migrations.RunPython(preencher_containers, migrations.RunPython.noop),
+    ]
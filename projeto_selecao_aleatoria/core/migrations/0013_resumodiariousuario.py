@@ -0,0 +1,63 @@
+# Generated by Django 5.2 on 2026-10-19 02:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+STATUS = ('pendente', 'processando', 'concluido', 'falha')
+
+
+def preencher_resumos(apps, schema_editor):
+    """Calcula o resumo diário inicial a partir dos processamentos existentes."""
+    ProcessamentoRPA = apps.get_model('core', 'ProcessamentoRPA')
+    ResumoDiarioUsuario = apps.get_model('core', 'ResumoDiarioUsuario')
+
+    concluidos_com_tempo = Q(status='concluido', tempo_real__isnull=False)
+    linhas = (
+        ProcessamentoRPA.objects.order_by()
+        .annotate(dia=TruncDate('criado_em'))
+        .values('user_id', 'dia', 'tipo')
+        .annotate(
+            **{status: Count('id', filter=Q(status=status)) for status in STATUS},
+            tempo_real_soma=Sum('tempo_real', filter=concluidos_com_tempo, default=0),
+            tempo_real_qtd=Count('id', filter=concluidos_com_tempo),
+        )
+    )
+    ResumoDiarioUsuario.objects.bulk_create(
+        (ResumoDiarioUsuario(**linha) for linha in linhas.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_containerexecucao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoDiarioUsuario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia', models.DateField()),
+                ('tipo', models.CharField(choices=[('planilha', 'Processamento de Planilha'), ('email', 'Automação de Email'), ('web', 'Automação Web'), ('sistema', 'Interação com Sistema'), ('docker_rpa', 'Processamento Docker RPA'), ('selecao_aleatoria', 'Seleção Aleatória')], max_length=20)),
+                ('pendente', models.IntegerField(default=0)),
+                ('processando', models.IntegerField(default=0)),
+                ('concluido', models.IntegerField(default=0)),
+                ('falha', models.IntegerField(default=0)),
+                ('tempo_real_soma', models.BigIntegerField(default=0)),
+                ('tempo_real_qtd', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resumos_diarios', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Resumo Diário de Usuário',
+                'verbose_name_plural': 'Resumos Diários de Usuários',
+                'ordering': ['-dia', 'tipo'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'dia', 'tipo'), name='resumo_diario_user_dia_tipo')],
+            },
+        ),
+        migrations.RunPython(preencher_resumos, migrations.RunPython.noop),
+    ]
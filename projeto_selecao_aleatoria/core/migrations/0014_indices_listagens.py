@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 02:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_resumodiariousuario'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='processamentorpa',
+            index=models.Index(fields=['user', '-criado_em', '-id'], name='proc_user_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processamentorpa',
+            index=models.Index(fields=['user', 'status', '-criado_em', '-id'], name='proc_user_status_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processamentorpa',
+            index=models.Index(fields=['user', 'tipo', '-criado_em', '-id'], name='proc_user_tipo_criado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='processamentorpa',
+            index=models.Index(condition=models.Q(('status__in', ('pendente', 'processando'))), fields=['user', 'status'], name='proc_ativos_idx'),
+        ),
+    ]
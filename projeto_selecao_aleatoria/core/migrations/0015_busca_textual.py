@@ -0,0 +1,94 @@
+# Generated by Django 5.2 on 2026-10-19 03:02
+
+import logging
+
+from django.db import DatabaseError, migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+SQLITE_CRIAR = [
+    # rowid estável (INTEGER PRIMARY KEY) para cada processamento; o rowid
+    # implícito da tabela principal pode mudar em um VACUUM
+    """CREATE TABLE core_processamento_busca_ids (
+        rowid INTEGER PRIMARY KEY,
+        processamento_id char(32) NOT NULL UNIQUE
+    )""",
+    """CREATE VIRTUAL TABLE core_processamento_busca USING fts5(
+        descricao, mensagem_erro, tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+    """INSERT INTO core_processamento_busca_ids (processamento_id)
+        SELECT id FROM core_processamentorpa""",
+    """INSERT INTO core_processamento_busca (rowid, descricao, mensagem_erro)
+        SELECT i.rowid, p.descricao, coalesce(p.mensagem_erro, '')
+        FROM core_processamentorpa p JOIN core_processamento_busca_ids i ON i.processamento_id = p.id""",
+    """CREATE TRIGGER core_processamento_busca_ai AFTER INSERT ON core_processamentorpa BEGIN
+        INSERT INTO core_processamento_busca_ids (processamento_id) VALUES (new.id);
+        INSERT INTO core_processamento_busca (rowid, descricao, mensagem_erro)
+            VALUES (last_insert_rowid(), new.descricao, coalesce(new.mensagem_erro, ''));
+    END""",
+    """CREATE TRIGGER core_processamento_busca_au AFTER UPDATE OF descricao, mensagem_erro ON core_processamentorpa BEGIN
+        UPDATE core_processamento_busca
+            SET descricao = new.descricao, mensagem_erro = coalesce(new.mensagem_erro, '')
+            WHERE rowid = (SELECT rowid FROM core_processamento_busca_ids WHERE processamento_id = old.id);
+    END""",
+    """CREATE TRIGGER core_processamento_busca_ad AFTER DELETE ON core_processamentorpa BEGIN
+        DELETE FROM core_processamento_busca
+            WHERE rowid = (SELECT rowid FROM core_processamento_busca_ids WHERE processamento_id = old.id);
+        DELETE FROM core_processamento_busca_ids WHERE processamento_id = old.id;
+    END""",
+]
+
+SQLITE_REMOVER = [
+    "DROP TRIGGER IF EXISTS core_processamento_busca_ai",
+    "DROP TRIGGER IF EXISTS core_processamento_busca_au",
+    "DROP TRIGGER IF EXISTS core_processamento_busca_ad",
+    "DROP TABLE IF EXISTS core_processamento_busca",
+    "DROP TABLE IF EXISTS core_processamento_busca_ids",
+]
+
+POSTGRES_CRIAR = [
+    """ALTER TABLE core_processamentorpa ADD COLUMN busca_vetor tsvector
+        GENERATED ALWAYS AS (to_tsvector('portuguese',
+            coalesce(descricao, '') || ' ' || coalesce(mensagem_erro, ''))) STORED""",
+    "CREATE INDEX core_processamentorpa_busca_gin ON core_processamentorpa USING GIN (busca_vetor)",
+]
+
+POSTGRES_REMOVER = [
+    "DROP INDEX IF EXISTS core_processamentorpa_busca_gin",
+    "ALTER TABLE core_processamentorpa DROP COLUMN IF EXISTS busca_vetor",
+]
+
+
+def criar_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        comandos = POSTGRES_CRIAR
+    elif vendor == 'sqlite':
+        comandos = SQLITE_CRIAR
+    else:
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            for sql in comandos:
+                schema_editor.execute(sql)
+    except DatabaseError as e:
+        # Ex.: SQLite compilado sem FTS5; a busca continua com icontains
+        logger.warning("Índice de busca textual não criado: %s", e)
+
+
+def remover_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    comandos = {'postgresql': POSTGRES_REMOVER, 'sqlite': SQLITE_REMOVER}.get(vendor, [])
+    for sql in comandos:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_indices_listagens'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice, remover_indice),
+    ]
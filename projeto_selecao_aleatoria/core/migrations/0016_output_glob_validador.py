@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 03:19
+
+import core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_busca_textual'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='perfilexecucao',
+            name='output_glob',
+            field=models.CharField(default='SA_*.xlsx', max_length=100, validators=[core.models.validar_output_glob]),
+        ),
+    ]
@@ -2,16 +2,116 @@
 # Este arquivo define os modelos de dados para o sistema de processamento RPA.
 # Inclui modelos para templates, processamentos e seus resultados.
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 import uuid
 import os
+import logging
 from datetime import datetime
 
+from core.services.coleta import padrao_valido
+from core.services.progresso import obter_escritor
+from core.services.registro_vivo import obter_registro
+
 # Obtém o modelo de usuário configurado no projeto
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+
+def validar_output_glob(valor):
+    """Glob de saída restrito ao diretório de saída (sem caminho absoluto, `..` ou `/`)."""
+    if not padrao_valido(valor):
+        raise ValidationError('Use apenas um nome de arquivo com curingas (ex.: SA_*.xlsx).')
+
+
+def marcadores_padrao():
+    """
+    Tabela padrão de marcadores de progresso do ETL de seleção aleatória.
+    Cada item associa trechos de log a um percentual e a uma fase.
+    """
+    return [
+        {'textos': ['Baixando arquivo', 'Extraindo dados'], 'progresso': 25, 'fase': 'extracao'},
+        {'textos': ['Transformação', 'Coluna para acessar'], 'progresso': 50, 'fase': 'transformacao'},
+        {'textos': ['Seleção de itens concluída'], 'progresso': 60, 'fase': 'selecao'},
+        {'textos': ['Resultado salvo como'], 'progresso': 75, 'fase': 'gravacao'},
+        {'textos': ['Upload concluído'], 'progresso': 90, 'fase': 'upload'},
+        {'textos': ['Pipeline ETL Concluído'], 'progresso': 100, 'fase': 'finalizacao'},
+    ]
+
+
+class PerfilExecucao(models.Model):
+    """
+    Perfil de execução de um processamento em container Docker.
+    
+    Define imagem, comando, variáveis de ambiente padrão, glob de saída,
+    limites de recursos e a tabela de marcadores de progresso. É associado
+    a um tipo de processamento ou a um template, permitindo adicionar
+    workloads ou trocar de imagem sem alterar código.
+    """
+    
+    # Identificador único
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    nome = models.CharField(max_length=100, unique=True)
+    
+    # Perfil padrão para um tipo de processamento (opcional; templates podem apontar direto)
+    tipo = models.CharField(max_length=20, unique=True, null=True, blank=True)
+    
+    # Container
+    imagem = models.CharField(max_length=200, default='selecao_aleatoria:v3.1')
+    comando = models.CharField(max_length=500, default='python -u main.py', blank=True)
+    env_padrao = models.JSONField(default=dict, blank=True)   # Variáveis de ambiente padrão
+    limites = models.JSONField(default=dict, blank=True)      # Ex.: {"cpus": "2", "memoria": "2g", "pids": 256}
+    
+    # Saída e armazenamento
+    output_glob = models.CharField(max_length=100, default='SA_*.xlsx', validators=[validar_output_glob])
+    bucket = models.CharField(max_length=100, default='appbeta-user-results')
+    prefixo_s3 = models.CharField(max_length=100, default='selecao_aleatoria')
+    
+    # Marcadores de progresso detectados no log do container
+    marcadores = models.JSONField(default=marcadores_padrao, blank=True)
+    
+    ativo = models.BooleanField(default=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Perfil de Execução'
+        verbose_name_plural = 'Perfis de Execução'
+    
+    def __str__(self):
+        return f"{self.nome} ({self.imagem})"
+    
+    def argumentos_limites(self):
+        """
+        Converte os limites de recursos em argumentos do `docker run`.
+        
+        Returns:
+            Lista de argumentos (--cpus, --memory, --pids-limit)
+        """
+        opcoes = (('cpus', '--cpus'), ('memoria', '--memory'), ('pids', '--pids-limit'))
+        args = []
+        for chave, opcao in opcoes:
+            valor = (self.limites or {}).get(chave)
+            if valor:
+                args += [opcao, str(valor)]
+        return args
+    
+    def marcador_para_linha(self, linha):
+        """
+        Procura o marcador de progresso correspondente a uma linha de log.
+        
+        Returns:
+            Tupla (progresso, fase) ou None se a linha não contém marcador
+        """
+        for marcador in self.marcadores or ():
+            if any(texto in linha for texto in marcador.get('textos', ())):
+                return marcador['progresso'], marcador.get('fase')
+        return None
+
 class ProcessamentoRPATemplate(models.Model):
     """
     Modelo de template para processamentos de automação RPA.
@@ -48,6 +148,15 @@ class ProcessamentoRPATemplate(models.Model):
     # Dados de configuração do template em formato JSON
     dados_entrada_template = models.JSONField(default=dict, blank=True)
     
+    # Perfil de execução (tem precedência sobre o perfil do tipo)
+    perfil = models.ForeignKey(
+        PerfilExecucao,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='templates'
+    )
+    
     class Meta:
         verbose_name = 'Template de Processamento RPA'
         verbose_name_plural = 'Templates de Processamento RPA'
@@ -143,86 +252,246 @@ class ProcessamentoRPA(models.Model):
         verbose_name = 'Processamento RPA'
         verbose_name_plural = 'Processamentos RPA'
         ordering = ['-criado_em']  # Mais recentes primeiro
+        # Índices no formato das consultas das listagens: filtro por usuário
+        # (+ status/tipo) e ordenação por -criado_em, desempatada por id (cursor)
+        indexes = [
+            models.Index(fields=['user', '-criado_em', '-id'], name='proc_user_criado_idx'),
+            models.Index(fields=['user', 'status', '-criado_em', '-id'], name='proc_user_status_criado_idx'),
+            models.Index(fields=['user', 'tipo', '-criado_em', '-id'], name='proc_user_tipo_criado_idx'),
+            # Apenas processamentos ativos (pequeno): hidratação do registro vivo e reconciliação
+            models.Index(
+                fields=['user', 'status'],
+                name='proc_ativos_idx',
+                condition=models.Q(status__in=('pendente', 'processando')),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.tipo} - {self.status} - {self.user.username} ({self.id})"
     
+    # Colunas que posicionam o processamento no resumo diário
+    CAMPOS_RESUMO = ('user_id', 'tipo', 'status', 'criado_em', 'tempo_real')
+
+    def save(self, *args, **kwargs):
+        """
+        Grava o processamento mantendo o resumo diário do usuário.
+
+        Na criação, conta o processamento; numa edição (admin, save() direto)
+        que mude status, tipo, usuário, data ou tempo_real, descarta a contagem
+        antiga e registra a nova na mesma transação.
+        """
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not self._state.adding:
+            alterados = {'user_id' if campo == 'user' else campo for campo in update_fields}
+            if not alterados & set(self.CAMPOS_RESUMO):
+                return super().save(*args, **kwargs)
+
+        with transaction.atomic(savepoint=False):
+            anterior = None
+            if not self._state.adding:
+                anterior = (
+                    ProcessamentoRPA.objects.select_for_update()
+                    .filter(id=self.id).values(*self.CAMPOS_RESUMO).first()
+                )
+            super().save(*args, **kwargs)
+            if anterior is None:
+                ResumoDiarioUsuario.registrar(self, self.status, 1, self.tempo_real)
+            elif any(anterior[campo] != getattr(self, campo) for campo in self.CAMPOS_RESUMO):
+                antigo = ProcessamentoRPA(**anterior)
+                ResumoDiarioUsuario.registrar(antigo, antigo.status, -1, antigo.tempo_real)
+                ResumoDiarioUsuario.registrar(self, self.status, 1, self.tempo_real)
+    
+    def _transicionar(self, de, para, **campos):
+        """
+        Aplica uma transição de status com compare-and-set.
+        
+        Executa `UPDATE ... WHERE id=? AND status=?` (para cada status de
+        origem aceito, começando pelo conhecido) gravando apenas o status e os
+        campos informados, sem reescrever os JSONs grandes que não mudaram. Se
+        outro escritor já mudou o status, nada é gravado. O resumo diário do
+        usuário é atualizado na mesma transação.
+        
+        Args:
+            de: Status de origem aceitos
+            para: Novo status
+            **campos: Demais colunas alteradas pela transição
+            
+        Returns:
+            True se a transição foi aplicada, False se a corrida foi perdida
+        """
+        # A origem exata é necessária para mover a contagem no resumo diário
+        origens = sorted(de, key=lambda origem: origem != self.status)
+        with transaction.atomic(savepoint=False):
+            for origem in origens:
+                if ProcessamentoRPA.objects.filter(id=self.id, status=origem).update(status=para, **campos):
+                    break
+            else:
+                logger.warning(
+                    "Transição %s -> %s ignorada: processamento %s mudou de status concorrentemente",
+                    "/".join(de), para, self.id
+                )
+                return False
+            tempo_anterior = self.tempo_real if origem == 'concluido' else None
+            ResumoDiarioUsuario.mover(self, origem, para, tempo_anterior, campos.get('tempo_real'))
+        
+        self.status = para
+        for campo, valor in campos.items():
+            setattr(self, campo, valor)
+        # update() não dispara post_save: mantém o registro em memória atualizado
+        obter_registro().registrar(self)
+        return True
+    
+    def _tempo_ate(self, momento):
+        if self.iniciado_em:
+            return int((momento - self.iniciado_em).total_seconds())
+        return None
+    
     def iniciar_processamento(self):
         """
-        Marca o processamento como iniciado.
+        Marca o processamento como iniciado (pendente -> processando).
         Atualiza o status e registra o momento de início.
+        
+        Returns:
+            True se iniciou; False se já foi iniciado por outro processo/thread
         """
-        self.status = 'processando'
-        self.iniciado_em = timezone.now()
-        self.save()
+        obter_escritor().encerrar(self.id)
+        return self._transicionar(
+            ('pendente',), 'processando', iniciado_em=timezone.now()
+        )
     
     def concluir(self, resultado):
         """
-        Marca o processamento como concluído.
+        Marca o processamento como concluído (processando -> concluido).
         
         Args:
             resultado: Dicionário com os resultados do processamento
             
+        Returns:
+            True se concluiu; False se o processamento não estava mais em execução
+            
         Efeitos:
             - Atualiza status, resultado e tempo de conclusão
             - Calcula o tempo real de execução
             - Cria registros de ResultadoProcessamento se aplicável
         """
-        self.status = 'concluido'
-        self.resultado = resultado
-        self.concluido_em = timezone.now()
-        self.progresso = 100
-        
-        # Calcula tempo de execução
-        if self.iniciado_em:
-            duracao = (self.concluido_em - self.iniciado_em).total_seconds()
-            self.tempo_real = int(duracao)
-        
-        self.save()
+        # O progresso final é gravado junto com o status; descarta o pendente
+        obter_escritor().encerrar(self.id)
+        concluido_em = timezone.now()
+        if not self._transicionar(
+            ('processando',), 'concluido',
+            resultado=resultado,
+            concluido_em=concluido_em,
+            progresso=100,
+            tempo_real=self._tempo_ate(concluido_em),
+        ):
+            return False
         
         # Verifica se há resultados para associar
         if resultado and isinstance(resultado, dict):
-            arquivo_resultado = resultado.get('resultado_arquivo')
-            if arquivo_resultado:
-                # Cria um registro de resultado associado
-                ResultadoProcessamento.objects.create(
+            arquivos = resultado.get('arquivos') or []
+            if not arquivos and resultado.get('resultado_arquivo'):
+                # Formato antigo: um único arquivo
+                arquivos = [{
+                    'nome': resultado['resultado_arquivo'],
+                    'caminho': resultado.get('caminho_arquivo', ''),
+                }]
+            
+            # Cria um registro de resultado para cada arquivo em uma única consulta
+            ResultadoProcessamento.objects.bulk_create([
+                ResultadoProcessamento(
                     processamento=self,
-                    nome_arquivo=arquivo_resultado,
-                    caminho_s3=resultado.get('caminho_arquivo', ''),
-                    tipo_resultado='arquivo_excel'
+                    nome_arquivo=arquivo['nome'],
+                    caminho_s3=arquivo.get('caminho', ''),
+                    tipo_resultado=ResultadoProcessamento.tipo_por_extensao(arquivo['nome']),
+                    tamanho_bytes=arquivo.get('tamanho_bytes', 0),
+                    content_type=arquivo.get('content_type', ''),
+                    checksum_sha256=arquivo.get('checksum_sha256', ''),
                 )
+                for arquivo in arquivos if arquivo.get('nome')
+            ])
+        return True
     
-    def falhar(self, mensagem_erro):
+    def falhar(self, mensagem_erro, resultado=None):
         """
-        Marca o processamento como falha.
+        Marca o processamento como falha (pendente/processando -> falha).
         
         Args:
             mensagem_erro: Descrição do erro ocorrido
+            resultado: Metadados finais (ex.: container_info), gravados na mesma atualização
+            
+        Returns:
+            True se registrou a falha; False se o processamento já havia terminado
             
         Efeitos:
             - Atualiza status, mensagem de erro e tempo de conclusão
             - Calcula o tempo até a falha
         """
-        self.status = 'falha'
-        self.mensagem_erro = mensagem_erro
-        self.concluido_em = timezone.now()
+        obter_escritor().encerrar(self.id)
+        concluido_em = timezone.now()
+        campos = {'resultado': resultado} if resultado is not None else {}
+        return self._transicionar(
+            ('pendente', 'processando'), 'falha',
+            **campos,
+            mensagem_erro=mensagem_erro,
+            concluido_em=concluido_em,
+            progresso=self.progresso,
+            tempo_real=self._tempo_ate(concluido_em),
+        )
+    
+    def reiniciar(self):
+        """
+        Volta um processamento encerrado para pendente (concluido/falha -> pendente),
+        limpando resultado, erro, tempos e progresso.
         
-        # Calcula tempo até falha
-        if self.iniciado_em:
-            duracao = (self.concluido_em - self.iniciado_em).total_seconds()
-            self.tempo_real = int(duracao)
-            
-        self.save()
+        Returns:
+            True se reiniciou; False se o processamento não estava encerrado
+        """
+        obter_escritor().encerrar(self.id)
+        return self._transicionar(
+            ('concluido', 'falha'), 'pendente',
+            iniciado_em=None,
+            concluido_em=None,
+            resultado=None,
+            mensagem_erro=None,
+            progresso=0,
+            tempo_real=None,
+        )
     
     def atualizar_progresso(self, progresso):
         """
         Atualiza o percentual de progresso do processamento.
         
+        Valores repetidos ou menores que o atual são ignorados; a gravação
+        é agrupada e limitada pelo EscritorProgresso (RPA_PROGRESSO_FLUSH_MS).
+        
         Args:
             progresso: Valor de 0 a 100 indicando o percentual de conclusão
         """
-        self.progresso = progresso
-        self.save(update_fields=['progresso'])
+        if obter_escritor().registrar(self.id, progresso):
+            self.progresso = progresso
+            obter_registro().atualizar(self.id, progresso=progresso)
+    
+    def registrar_evento(self, tipo, **dados):
+        """
+        Acrescenta um evento à linha do tempo do processamento (um INSERT).
+        
+        Args:
+            tipo: Tipo do evento (ver ProcessamentoEvento.TIPO_CHOICES)
+            **dados: Payload pequeno do evento
+        """
+        return ProcessamentoEvento.objects.create(processamento=self, tipo=tipo, dados=dados)
+    
+    def dados_eventos(self, *tipos):
+        """
+        Combina os payloads dos eventos informados, na ordem em que ocorreram.
+        
+        Returns:
+            Dicionário com os dados (eventos posteriores sobrescrevem os anteriores)
+        """
+        dados = {}
+        for payload in self.eventos.filter(tipo__in=tipos).values_list('dados', flat=True):
+            dados.update(payload or {})
+        return dados
     
     @property
     def caminho_s3(self):
@@ -244,6 +513,227 @@ class ProcessamentoRPA(models.Model):
         return self.resultados_associados.all()
 
 
+class ProcessamentoEvento(models.Model):
+    """
+    Evento da linha do tempo de um processamento (append-only).
+    
+    Cada etapa da execução (container configurado, diretório S3, container
+    iniciado, coleta, término) é registrada com um INSERT barato, em vez de
+    regravar o JSON `resultado` a cada passo. O `resultado` é gravado uma
+    única vez, na transição final.
+    """
+    
+    TIPO_CHOICES = (
+        ('container_configurado', 'Container configurado'),
+        ('diretorio_s3', 'Diretório S3 criado'),
+        ('container_iniciado', 'Container iniciado'),
+        ('resultados_coletados', 'Resultados coletados'),
+        ('log_enviado', 'Log enviado'),
+        ('container_finalizado', 'Container finalizado'),
+    )
+    
+    processamento = models.ForeignKey(
+        ProcessamentoRPA,
+        on_delete=models.CASCADE,
+        related_name='eventos'
+    )
+    tipo = models.CharField(max_length=30, choices=TIPO_CHOICES)
+    criado_em = models.DateTimeField(default=timezone.now)
+    dados = models.JSONField(default=dict, blank=True)  # Payload pequeno (ids, caminhos, códigos)
+    
+    class Meta:
+        verbose_name = 'Evento de Processamento'
+        verbose_name_plural = 'Eventos de Processamentos'
+        ordering = ['criado_em', 'id']
+        indexes = [
+            models.Index(fields=['processamento', 'criado_em'], name='evento_proc_criado_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.processamento_id} - {self.tipo}"
+
+
+class ContainerExecucao(models.Model):
+    """
+    Metadados tipados do container de um processamento Docker.
+
+    Substitui a leitura de `resultado['container_info']`: imagem, código de
+    saída e duração ficam em colunas indexadas, permitindo filtrar e agregar
+    no banco (ex.: resumo do histórico) sem carregar o JSON de cada linha.
+    """
+
+    processamento = models.OneToOneField(
+        ProcessamentoRPA,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='container'
+    )
+    container_id = models.CharField(max_length=64, blank=True, default='')
+    container_name = models.CharField(max_length=100, blank=True, default='')
+    imagem = models.CharField(max_length=255, blank=True, default='', db_index=True)
+    comando = models.TextField(blank=True, default='')
+    perfil = models.CharField(max_length=50, blank=True, default='')
+    exit_code = models.IntegerField(null=True, blank=True)
+    oom = models.BooleanField(default=False)
+    iniciado_em = models.DateTimeField(null=True, blank=True)
+    finalizado_em = models.DateTimeField(null=True, blank=True)
+    duracao_segundos = models.FloatField(null=True, blank=True, db_index=True)
+    s3_directory = models.CharField(max_length=500, blank=True, default='')
+    logs_s3 = models.CharField(max_length=500, blank=True, default='')
+    output_dir = models.CharField(max_length=500, blank=True, default='')
+
+    class Meta:
+        verbose_name = 'Execução de Container'
+        verbose_name_plural = 'Execuções de Containers'
+
+    def __str__(self):
+        return f"{self.processamento_id} - {self.imagem}"
+
+    @classmethod
+    def atualizar(cls, processamento_id, **campos):
+        """
+        Grava apenas as colunas informadas (um UPDATE, sem ler a linha).
+
+        Returns:
+            Número de linhas atualizadas (0 se a execução ainda não foi registrada)
+        """
+        return cls.objects.filter(processamento_id=processamento_id).update(**campos)
+
+    @classmethod
+    def reivindicar_finalizacao(cls, processamento_id, container_id=None):
+        """
+        Reserva a finalização da execução (compare-and-set em `finalizado_em`).
+
+        O término pode chegar mais de uma vez (evento reproduzido na
+        reconexão, outro processo com o próprio `docker events`,
+        reconciliação na partida): só quem reserva finaliza.
+
+        Args:
+            processamento_id: Processamento do container encerrado
+            container_id: Container do evento; de outro container não reserva
+
+        Returns:
+            True se esta chamada reservou a finalização
+        """
+        cls.objects.get_or_create(processamento_id=processamento_id)  # Execuções anteriores ao modelo
+        execucao = cls.objects.filter(processamento_id=processamento_id, finalizado_em__isnull=True)
+        if container_id:
+            execucao = execucao.filter(models.Q(container_id='') | models.Q(container_id=container_id))
+        return execucao.update(finalizado_em=timezone.now()) == 1
+
+    def como_container_info(self):
+        """
+        Dicionário no formato legado de `container_info`.
+
+        Returns:
+            Dicionário apenas com os campos preenchidos
+        """
+        info = {
+            'container_id': self.container_id,
+            'container_name': self.container_name,
+            'imagem': self.imagem,
+            'comando': self.comando,
+            'perfil': self.perfil,
+            's3_directory': self.s3_directory,
+            'logs_s3': self.logs_s3,
+            'output_dir': self.output_dir,
+            'container_iniciado': self.iniciado_em.isoformat() if self.iniciado_em else None,
+            'container_finalizado': self.finalizado_em.isoformat() if self.finalizado_em else None,
+            'duracao_segundos': self.duracao_segundos,
+            'exit_code': self.exit_code,
+        }
+        return {chave: valor for chave, valor in info.items() if valor not in (None, '')}
+
+
+class ResumoDiarioUsuario(models.Model):
+    """
+    Resumo diário dos processamentos de um usuário, por tipo.
+    
+    Mantido incrementalmente na mesma transação da criação, de cada
+    transição de status e de edições via save() (admin), para que os endpoints de resumo leiam algumas
+    dezenas de linhas em vez de varrer o histórico. O dia é o da criação do
+    processamento (fuso local); `manage.py reconstruir_resumo_diario` recalcula
+    tudo a partir de ProcessamentoRPA.
+    """
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='resumos_diarios')
+    dia = models.DateField()
+    tipo = models.CharField(max_length=20, choices=ProcessamentoRPA.TIPO_CHOICES)
+    
+    # Contagem por status atual (mesmos nomes de ProcessamentoRPA.STATUS_CHOICES)
+    pendente = models.IntegerField(default=0)
+    processando = models.IntegerField(default=0)
+    concluido = models.IntegerField(default=0)
+    falha = models.IntegerField(default=0)
+    
+    # tempo_real dos concluídos (média = soma / quantidade)
+    tempo_real_soma = models.BigIntegerField(default=0)
+    tempo_real_qtd = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Resumo Diário de Usuário'
+        verbose_name_plural = 'Resumos Diários de Usuários'
+        ordering = ['-dia', 'tipo']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'dia', 'tipo'], name='resumo_diario_user_dia_tipo'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.dia} - {self.tipo}"
+    
+    @property
+    def total(self):
+        return self.pendente + self.processando + self.concluido + self.falha
+    
+    @classmethod
+    def aplicar(cls, user_id, dia, tipo, criar=True, **deltas):
+        """
+        Soma os deltas às colunas do resumo (um UPDATE com F()).
+        
+        Args:
+            user_id, dia, tipo: Chave do resumo
+            criar: Cria a linha se ainda não existir
+            **deltas: Coluna -> valor a somar
+        """
+        deltas = {campo: valor for campo, valor in deltas.items() if valor}
+        if not deltas:
+            return
+        resumos = cls.objects.filter(user_id=user_id, dia=dia, tipo=tipo)
+        incrementos = {campo: F(campo) + valor for campo, valor in deltas.items()}
+        if resumos.update(**incrementos) or not criar:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(user_id=user_id, dia=dia, tipo=tipo, **deltas)
+        except IntegrityError:
+            # Criada concorrentemente: aplica sobre a linha existente
+            resumos.update(**incrementos)
+    
+    @classmethod
+    def _chave(cls, processamento):
+        return processamento.user_id, timezone.localdate(processamento.criado_em), processamento.tipo
+    
+    @classmethod
+    def registrar(cls, processamento, status, sinal, tempo_real=None):
+        """Conta (sinal=1) ou descarta (sinal=-1) um processamento no status informado."""
+        deltas = {status: sinal}
+        if status == 'concluido' and tempo_real is not None:
+            deltas.update(tempo_real_soma=sinal * tempo_real, tempo_real_qtd=sinal)
+        cls.aplicar(*cls._chave(processamento), criar=sinal > 0, **deltas)
+    
+    @classmethod
+    def mover(cls, processamento, de, para, tempo_anterior=None, tempo_novo=None):
+        """Move um processamento de um status para outro no resumo do seu dia."""
+        deltas = {de: -1, para: 1, 'tempo_real_soma': 0, 'tempo_real_qtd': 0}
+        if de == 'concluido' and tempo_anterior is not None:
+            deltas['tempo_real_soma'] -= tempo_anterior
+            deltas['tempo_real_qtd'] -= 1
+        if para == 'concluido' and tempo_novo is not None:
+            deltas['tempo_real_soma'] += tempo_novo
+            deltas['tempo_real_qtd'] += 1
+        cls.aplicar(*cls._chave(processamento), **deltas)
+
+
 class ResultadoProcessamento(models.Model):
     """
     Modelo para armazenar informações sobre resultados de processamento.
@@ -278,6 +768,19 @@ class ResultadoProcessamento(models.Model):
     tipo_resultado = models.CharField(max_length=20, choices=TIPO_CHOICES, default='outro')
     criado_em = models.DateTimeField(auto_now_add=True)
     tamanho_bytes = models.BigIntegerField(default=0, blank=True, null=True)
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    checksum_sha256 = models.CharField(max_length=64, blank=True, default='')  # Hex do SHA-256 do arquivo
+    
+    # Mapeamento de extensões para tipo de resultado
+    EXTENSOES_TIPO = {
+        '.xlsx': 'arquivo_excel',
+        '.xls': 'arquivo_excel',
+        '.pdf': 'arquivo_pdf',
+        '.csv': 'arquivo_csv',
+        '.png': 'imagem',
+        '.jpg': 'imagem',
+        '.jpeg': 'imagem',
+    }
     
     class Meta:
         verbose_name = 'Resultado de Processamento'
@@ -287,6 +790,15 @@ class ResultadoProcessamento(models.Model):
     def __str__(self):
         return f"{self.processamento.tipo} - {self.nome_arquivo}"
     
+    @classmethod
+    def tipo_por_extensao(cls, nome_arquivo):
+        """
+        Deduz o tipo de resultado a partir da extensão do arquivo.
+        Extensões desconhecidas são classificadas como 'outro'.
+        """
+        _, ext = os.path.splitext(nome_arquivo)
+        return cls.EXTENSOES_TIPO.get(ext.lower(), 'outro')
+    
     @property
     def extensao(self):
         """
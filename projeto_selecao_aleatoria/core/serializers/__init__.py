@@ -1,18 +1,22 @@
 # Importações para manter compatibilidade com código existente
-from .base import RPASerializer, RPACreateSerializer
-from .rpa import RPAHistoricoSerializer
+from .base import CamposDinamicosMixin, RPASerializer, RPACreateSerializer
+from .rpa import RPAHistoricoSerializer, RPAStatusSerializer
 from .docker_rpa import (
-    RPADockerSerializer, RPADockerHistoricoSerializer, RPADockerCreateSerializer
+    RPADockerSerializer, RPADockerHistoricoSerializer, RPADockerCreateSerializer,
+    ProcessamentoEventoSerializer
 )
 from .download import ResultadoDownloadSerializer
 
 # Para compatibilidade com código antigo
 __all__ = [
+    'CamposDinamicosMixin',
     'RPASerializer',
     'RPACreateSerializer',
     'RPAHistoricoSerializer',
+    'RPAStatusSerializer',
     'RPADockerSerializer',
     'RPADockerHistoricoSerializer',
     'RPADockerCreateSerializer',
+    'ProcessamentoEventoSerializer',
     'ResultadoDownloadSerializer',
 ]
\ No newline at end of file
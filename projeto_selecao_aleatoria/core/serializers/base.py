@@ -1,6 +1,55 @@
 from rest_framework import serializers
 from ..models import ProcessamentoRPA
 
+class CamposDinamicosMixin:
+    """
+    Sparse fieldsets para serializers de leitura: `?fields=id,status,criado_em`
+    limita a resposta aos campos informados (nomes desconhecidos são ignorados).
+    
+    `dependencias` declara os atributos do modelo lidos por campos calculados
+    (SerializerMethodField), usados pelas views para adiar colunas não lidas.
+    """
+    
+    parametro_campos = 'fields'
+    dependencias = {}
+    
+    def campos_solicitados(self):
+        """
+        Campos pedidos em ?fields= na requisição do contexto.
+        
+        Returns:
+            Conjunto de nomes ou None se o parâmetro não foi informado
+        """
+        request = self.context.get('request')
+        if request is None:
+            return None
+        valor = request.query_params.get(self.parametro_campos)
+        if not valor:
+            return None
+        return {nome.strip() for nome in valor.split(',') if nome.strip()}
+    
+    def get_fields(self):
+        campos = super().get_fields()
+        solicitados = self.campos_solicitados()
+        if solicitados is None:
+            return campos
+        return {nome: campo for nome, campo in campos.items() if nome in solicitados}
+    
+    def campos_modelo(self):
+        """
+        Atributos do modelo lidos ao serializar com os campos atuais.
+        
+        Returns:
+            Conjunto de nomes de atributos (primeiro nível do `source`)
+        """
+        usados = set()
+        for nome, campo in self.fields.items():
+            if campo.source == '*':
+                usados.update(self.dependencias.get(nome, ()))
+            else:
+                usados.add(campo.source.split('.')[0])
+        return usados
+
 class RPASerializer(serializers.ModelSerializer):
     """Serializer base para processamentos RPA."""
     
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from ..models import ProcessamentoRPA
+from ..models import ProcessamentoRPA, ProcessamentoEvento, ContainerExecucao
+from .base import CamposDinamicosMixin
 
 class RPADockerSerializer(serializers.ModelSerializer):
     """Serializer para visualização de processamentos Docker RPA."""
@@ -18,7 +19,7 @@ class RPADockerSerializer(serializers.ModelSerializer):
         # 'tipo' já foi preenchido com default acima
         return super().create(validated_data)
 
-class RPADockerHistoricoSerializer(serializers.ModelSerializer):
+class RPADockerHistoricoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializer para visualização do histórico de processamentos Docker RPA."""
     
     container_id = serializers.SerializerMethodField()
@@ -42,21 +43,36 @@ class RPADockerHistoricoSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = fields
     
+    @staticmethod
+    def _container(obj):
+        # Views usam select_related('container'): nenhuma consulta extra por linha
+        try:
+            return obj.container
+        except ContainerExecucao.DoesNotExist:
+            return None
+    
     def get_container_id(self, obj):
-        if obj.resultado and isinstance(obj.resultado, dict) and 'container_info' in obj.resultado:
-            return obj.resultado['container_info'].get('container_id', 'N/A')
-        return 'N/A'
+        container = self._container(obj)
+        return container.container_id if container and container.container_id else 'N/A'
     
     def get_imagem(self, obj):
-        if obj.resultado and isinstance(obj.resultado, dict) and 'container_info' in obj.resultado:
-            return obj.resultado['container_info'].get('imagem', 'N/A')
-        return 'N/A'
+        container = self._container(obj)
+        return container.imagem if container and container.imagem else 'N/A'
     
     def get_tempo_execucao(self, obj):
-        if obj.resultado and isinstance(obj.resultado, dict) and 'container_info' in obj.resultado:
-            return obj.resultado['container_info'].get('duracao_segundos', 0)
+        container = self._container(obj)
+        if container and container.duracao_segundos is not None:
+            return container.duracao_segundos
         return 0
 
+class ProcessamentoEventoSerializer(serializers.ModelSerializer):
+    """Serializer para a linha do tempo de um processamento."""
+    
+    class Meta:
+        model = ProcessamentoEvento
+        fields = ['tipo', 'criado_em', 'dados']
+        read_only_fields = fields
+
 class RPADockerCreateSerializer(serializers.ModelSerializer):
     """Serializer para criação de processamentos Docker RPA."""
     
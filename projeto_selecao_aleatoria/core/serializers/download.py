@@ -1,10 +1,12 @@
 from rest_framework import serializers
-from ..models import ProcessamentoRPA, ResultadoProcessamento
+from ..models import ProcessamentoRPA
+from .base import CamposDinamicosMixin
 
-class ResultadoDownloadSerializer(serializers.ModelSerializer):
+class ResultadoDownloadSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializer para downloads de resultados."""
     
     arquivos_count = serializers.SerializerMethodField()
+    dependencias = {'arquivos_count': ('resultado',)}  # Formato antigo no JSON
     
     class Meta:
         model = ProcessamentoRPA
@@ -13,20 +15,37 @@ class ResultadoDownloadSerializer(serializers.ModelSerializer):
     
     def get_arquivos_count(self, obj):
         """Retorna o número de arquivos disponíveis para este processamento."""
-        # Verificar contagem no modelo ResultadoProcessamento
-        count_resultados = ResultadoProcessamento.objects.filter(processamento=obj).count()
+        # Contagem de ResultadoProcessamento anotada pela view (Count); sem a
+        # anotação, count() do related manager usa o prefetch quando existir
+        count_resultados = getattr(obj, 'resultados_count', None)
+        if count_resultados is None:
+            count_resultados = obj.resultados_associados.count()
         if count_resultados > 0:
             return count_resultados
         
+        return self.contar_arquivos_resultado(obj.resultado)
+    
+    @staticmethod
+    def contar_arquivos_resultado(resultado):
+        """
+        Conta os arquivos registrados no JSON `resultado` (formato antigo), sem consultas.
+        
+        Args:
+            resultado: Campo resultado do processamento
+        
+        Returns:
+            Número de arquivos encontrados
+        """
+        if not resultado or not isinstance(resultado, dict):
+            return 0
+        
         # Verificar formato baseado em container_info
-        if obj.resultado and isinstance(obj.resultado, dict):
-            if 'container_info' in obj.resultado:
-                container_info = obj.resultado['container_info']
-                if container_info.get('resultado_arquivo'):
-                    return 1
-            
-            # Verificar formato baseado em 'arquivos'
-            if 'arquivos' in obj.resultado:
-                return len(obj.resultado['arquivos'])
+        container_info = resultado.get('container_info')
+        if isinstance(container_info, dict) and container_info.get('resultado_arquivo'):
+            return 1
+        
+        # Verificar formato baseado em 'arquivos'
+        if 'arquivos' in resultado:
+            return len(resultado['arquivos'])
         
-        return 0
\ No newline at end of file
+        return 0
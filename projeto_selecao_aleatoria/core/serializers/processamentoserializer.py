@@ -1,7 +1,8 @@
 from rest_framework import serializers
 from core.models import ProcessamentoRPA
+from core.serializers.base import CamposDinamicosMixin
 
-class ProcessamentoRPASerializer(serializers.ModelSerializer):
+class ProcessamentoRPASerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     usuario = serializers.CharField(source='user.username', read_only=True)
     tempo_formatado = serializers.SerializerMethodField()
 
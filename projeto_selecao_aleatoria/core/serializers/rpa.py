@@ -1,8 +1,37 @@
 from rest_framework import serializers
 from ..models import ProcessamentoRPA
-from .base import RPASerializer
+from .base import CamposDinamicosMixin, RPASerializer
 
-class RPAHistoricoSerializer(serializers.ModelSerializer):
+class RPAStatusSerializer(serializers.ModelSerializer):
+    """
+    Serializer compacto para acompanhamento de processamentos ativos.
+
+    Aceita tanto instâncias do modelo quanto registros do RegistroVivo
+    (core.services.registro_vivo), que têm os mesmos atributos e ainda a
+    fase atual e a última linha de log.
+    """
+    
+    fase = serializers.CharField(read_only=True, default=None)
+    ultima_linha = serializers.CharField(read_only=True, default=None)
+    
+    class Meta:
+        model = ProcessamentoRPA
+        fields = [
+            'id', 
+            'tipo', 
+            'descricao',
+            'status', 
+            'progresso', 
+            'tempo_estimado',
+            'criado_em', 
+            'iniciado_em', 
+            'concluido_em',
+            'fase',
+            'ultima_linha',
+        ]
+        read_only_fields = fields
+
+class RPAHistoricoSerializer(CamposDinamicosMixin, serializers.ModelSerializer):
     """Serializer para visualização de histórico de processamentos RPA."""
     
     criado_em = serializers.DateTimeField(format='%Y-%m-%d %H:%M:%S')
@@ -31,7 +60,7 @@ class RPAHistoricoSerializer(serializers.ModelSerializer):
         
         # Normaliza o tipo para corresponder ao frontend
         tipos_validos = ['planilha', 'email', 'web', 'sistema']
-        if representation['tipo'] not in tipos_validos:
+        if 'tipo' in representation and representation['tipo'] not in tipos_validos:
             representation['tipo'] = 'sistema'
         
         return representation
\ No newline at end of file
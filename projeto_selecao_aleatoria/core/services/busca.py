@@ -0,0 +1,112 @@
+# core/services/busca.py
+"""
+Busca textual indexada em `descricao` e `mensagem_erro` dos processamentos.
+
+O índice depende do banco (criado pela migração 0015_busca_textual):
+
+- SQLite: tabela virtual FTS5 `core_processamento_busca`, mantida por
+  triggers. A tabela `core_processamento_busca_ids` associa o id do
+  processamento (UUID) a um rowid estável da FTS;
+- PostgreSQL: coluna gerada `busca_vetor` (tsvector, português) com índice GIN.
+
+Como o índice é mantido pelo próprio banco, qualquer gravação (save,
+update() das transições, bulk_create) fica sincronizada. Sem índice
+disponível (ex.: SQLite sem FTS5) a busca volta ao `icontains`.
+
+No SQLite, migrações que recriam `core_processamentorpa` (ALTER de coluna)
+descartam os triggers; nesse caso a busca também volta ao `icontains` até os
+triggers serem recriados. `test_busca` falha se o banco recém-migrado não
+tiver os triggers, então a migração que os descartar deve recriá-los.
+"""
+
+import logging
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+TABELA_FTS = "core_processamento_busca"
+TABELA_IDS = "core_processamento_busca_ids"
+
+_disponivel = {}  # alias do banco -> índice existe
+
+
+def disponivel(alias="default"):
+    """Indica se o índice de busca existe no banco (verificado uma vez por processo)."""
+    if alias not in _disponivel:
+        conexao = connections[alias]
+        if conexao.vendor == "sqlite":
+            with conexao.cursor() as cursor:
+                cursor.execute(
+                    "SELECT type, name FROM sqlite_master WHERE name LIKE %s", [f"{TABELA_FTS}%"]
+                )
+                objetos = set(cursor.fetchall())
+            tabela = ("table", TABELA_FTS) in objetos
+            triggers = all(("trigger", f"{TABELA_FTS}_{sufixo}") in objetos for sufixo in ("ai", "au", "ad"))
+            if tabela and not triggers:
+                logger.warning("Triggers da busca textual ausentes; usando icontains")
+            _disponivel[alias] = tabela and triggers
+        else:
+            _disponivel[alias] = conexao.vendor == "postgresql"
+    return _disponivel[alias]
+
+
+def consulta_fts5(termo):
+    """
+    Converte o texto digitado em uma consulta FTS5 segura.
+
+    Cada palavra vira um prefixo entre aspas ("palavra"*), combinados com AND;
+    operadores e aspas do usuário não são interpretados.
+
+    Returns:
+        Consulta FTS5 ou string vazia se não há palavras
+    """
+    return " ".join(f'"{palavra}"*' for palavra in re.findall(r"\w+", termo))
+
+
+def filtrar(queryset, termo):
+    """
+    Filtra processamentos pelo texto, anotando `relevancia` (maior = mais relevante).
+
+    Args:
+        queryset: QuerySet de ProcessamentoRPA
+        termo: Texto buscado
+
+    Returns:
+        QuerySet filtrado e anotado
+    """
+    alias = queryset.db
+    tabela = queryset.model._meta.db_table
+    vendor = connections[alias].vendor
+
+    if disponivel(alias) and vendor == "sqlite":
+        consulta = consulta_fts5(termo)
+        if consulta:
+            # Ids que casam com o MATCH (avaliado uma vez) e bm25 de cada um
+            # pelo rowid da FTS (menor = melhor, por isso o sinal invertido)
+            casados = RawSQL(
+                f"SELECT i.processamento_id FROM {TABELA_IDS} i"
+                f" JOIN {TABELA_FTS} f ON f.rowid = i.rowid WHERE {TABELA_FTS} MATCH %s",
+                (consulta,),
+            )
+            relevancia = RawSQL(
+                f"SELECT -bm25({TABELA_FTS}) FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s"
+                f" AND rowid = (SELECT rowid FROM {TABELA_IDS} WHERE processamento_id = {tabela}.id)",
+                (consulta,), output_field=FloatField(),
+            )
+            return queryset.filter(id__in=casados).annotate(relevancia=relevancia)
+
+    if disponivel(alias) and vendor == "postgresql":
+        tsquery = "websearch_to_tsquery('portuguese', %s)"
+        return queryset.filter(
+            RawSQL(f"{tabela}.busca_vetor @@ {tsquery}", (termo,), output_field=BooleanField())
+        ).annotate(relevancia=RawSQL(
+            f"ts_rank({tabela}.busca_vetor, {tsquery})", (termo,), output_field=FloatField()
+        ))
+
+    return queryset.filter(
+        Q(descricao__icontains=termo) | Q(mensagem_erro__icontains=termo)
+    ).annotate(relevancia=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,185 @@
+# core/services/coleta.py
+"""
+Coleta de resultados enquanto o container ainda está em execução.
+
+O ColetorResultados observa o diretório montado em /app/output e dispara o
+envio de cada arquivo assim que ele é considerado fechado (tamanho e data de
+modificação estáveis entre duas varreduras). Os envios rodam em um pool de
+threads limitado (RPA_UPLOAD_WORKERS), então saídas múltiplas não são
+serializadas. Quando o container termina, uma varredura final envia o que
+faltou e reenvia arquivos alterados após o envio.
+"""
+
+import hashlib
+import logging
+import mimetypes
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger("docker_rpa")
+
+# mimetypes nem sempre conhece os formatos do Office em servidores mínimos
+CONTENT_TYPES = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".csv": "text/csv",
+}
+
+
+def padrao_valido(padrao):
+    """
+    Indica se o glob de saída fica restrito ao próprio diretório de saída.
+
+    Rejeita padrões vazios, absolutos, com `..` ou com separadores de caminho
+    (Path.glob segue `..` e não aceita padrões absolutos).
+    """
+    return bool(padrao) and "/" not in padrao and "\\" not in padrao and padrao not in (".", "..")
+
+
+def metadados_arquivo(arquivo: Path, tamanho_bloco=1024 * 1024):
+    """
+    Calcula tamanho, content type e checksum SHA-256 de um arquivo.
+
+    Returns:
+        Dicionário com tamanho_bytes, content_type e checksum_sha256
+    """
+    arquivo = Path(arquivo)
+    sha256 = hashlib.sha256()
+    with open(arquivo, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            sha256.update(bloco)
+
+    content_type = CONTENT_TYPES.get(arquivo.suffix.lower())
+    if not content_type:
+        content_type = mimetypes.guess_type(arquivo.name)[0] or "application/octet-stream"
+
+    return {
+        "tamanho_bytes": arquivo.stat().st_size,
+        "content_type": content_type,
+        "checksum_sha256": sha256.hexdigest(),
+    }
+
+
+class ColetorResultados:
+    """
+    Observa um diretório e envia arquivos de resultado à medida que ficam prontos.
+
+    Exemplo:
+        coletor = ColetorResultados(output_dir, "SA_*.xlsx", enviar).iniciar()
+        ...  # container em execução
+        resultados = coletor.finalizar()
+    """
+
+    def __init__(self, diretorio, padrao, enviar, intervalo=None, max_workers=None):
+        """
+        Args:
+            diretorio: Diretório do host montado como saída do container
+            padrao: Glob dos arquivos de resultado (ex.: "SA_*.xlsx")
+            enviar: Função chamada com o Path de cada arquivo pronto; retorna um dict
+            intervalo: Segundos entre varreduras (padrão: RPA_COLETA_INTERVALO)
+            max_workers: Envios simultâneos (padrão: RPA_UPLOAD_WORKERS)
+        """
+        if not padrao_valido(padrao):
+            raise ValueError(f"Glob de saída inválido: {padrao!r}")
+        self.diretorio = Path(diretorio)
+        self.padrao = padrao
+        self.enviar = enviar
+        self.intervalo = settings.RPA_COLETA_INTERVALO if intervalo is None else intervalo
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or settings.RPA_UPLOAD_WORKERS,
+            thread_name_prefix="coleta",
+        )
+        self._pendentes = {}   # nome -> Future do envio em andamento
+
+        self._parar = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._vistos = {}      # nome -> assinatura da varredura anterior
+        self._enviados = {}    # nome -> assinatura no momento do envio
+        self._resultados = {}  # nome -> retorno de `enviar`
+
+    @staticmethod
+    def _assinatura(arquivo: Path):
+        stat = arquivo.stat()
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _candidatos(self):
+        try:
+            return sorted(f for f in self.diretorio.glob(self.padrao) if f.is_file())
+        except OSError:
+            return []
+
+    def _enviar(self, arquivo: Path, assinatura):
+        try:
+            resultado = self.enviar(arquivo)
+        except Exception as e:
+            logger.error("Erro ao enviar resultado %s: %s", arquivo.name, e)
+            # O arquivo continua na lista, como não enviado; a varredura final tenta de novo
+            with self._lock:
+                self._resultados[arquivo.name] = {
+                    "nome": arquivo.name, "caminho": str(arquivo), "enviado": False, "erro": str(e),
+                }
+            return
+        with self._lock:
+            self._enviados[arquivo.name] = assinatura
+            self._resultados[arquivo.name] = resultado
+
+    def _varrer(self, final=False):
+        """
+        Envia os arquivos prontos.
+
+        Args:
+            final: O container já terminou, então todo arquivo presente está fechado
+        """
+        for arquivo in self._candidatos():
+            try:
+                assinatura = self._assinatura(arquivo)
+            except OSError:
+                continue
+            anterior = self._vistos.get(arquivo.name)
+            self._vistos[arquivo.name] = assinatura
+
+            pendente = self._pendentes.get(arquivo.name)
+            if pendente and not pendente.done():
+                if not final:
+                    continue
+                # Nunca dois envios simultâneos do mesmo arquivo
+                pendente.result()
+
+            with self._lock:
+                if self._enviados.get(arquivo.name) == assinatura:
+                    continue
+            if final or anterior == assinatura:
+                self._pendentes[arquivo.name] = self._pool.submit(self._enviar, arquivo, assinatura)
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            self._varrer()
+
+    def iniciar(self):
+        """Inicia a observação em uma thread daemon."""
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        """Encerra a observação sem varredura final (ex.: falha ao iniciar o container)."""
+        self._parar.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def finalizar(self):
+        """
+        Encerra a observação e faz a varredura final.
+
+        Returns:
+            Lista com o retorno de `enviar` para cada arquivo, ordenada pelo nome
+        """
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+        self._varrer(final=True)
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            return [self._resultados[nome] for nome in sorted(self._resultados)]
@@ -0,0 +1,247 @@
+# core/services/eventos_docker.py
+"""
+Acompanhamento do término dos containers via `docker events`.
+
+Em vez de uma thread bloqueada em `wait()` por processamento, um único
+processo `docker events` filtrado pelo label dos processamentos informa
+quando cada container termina (`die`, com o código de saída) ou é morto por
+falta de memória (`oom`, que chega antes do `die`). O tratador registrado
+para o processamento é executado em um pool limitado (RPA_FINALIZACAO_WORKERS).
+
+A assinatura começa na subida do servidor (RPADockerProcessor.iniciar_ouvinte)
+ou, no máximo, no primeiro disparo. Se ela cair, é refeita com `--since` a partir do último evento
+visto, então nenhum término é perdido. Na primeira conexão, containers que
+terminaram enquanto o servidor estava fora do ar são reconciliados via
+`docker ps`/`docker inspect`.
+"""
+
+import json
+import logging
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+logger = logging.getLogger("docker_rpa")
+
+LABEL_PROCESSAMENTO = "rpa.processamento_id"
+ESPERA_RECONEXAO = 2
+
+
+class OuvinteEventosDocker:
+    """
+    Assinatura única dos eventos de término dos containers de processamento.
+
+    Tratadores são chamados com (exit_code, oom, container_id). Processamentos
+    sem tratador registrado (ex.: servidor reiniciado durante a execução) são
+    entregues a `ao_orfao(processamento_id, exit_code, oom, container_id)`.
+    """
+
+    def __init__(self, ao_orfao=None, max_workers=None):
+        """
+        Args:
+            ao_orfao: Função chamada para containers sem tratador registrado
+            max_workers: Finalizações simultâneas (padrão: RPA_FINALIZACAO_WORKERS)
+        """
+        self.ao_orfao = ao_orfao
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers or settings.RPA_FINALIZACAO_WORKERS,
+            thread_name_prefix="finalizacao",
+        )
+        self._lock = threading.Lock()
+        self._tratadores = {}   # processamento_id -> [tratador, container_id, eventos pendentes]
+        self._oom = set()       # processamento_ids com evento oom ainda sem die
+        self._desde = None      # timestamp (s) do último evento visto
+        self._thread = None
+        self._conectado = threading.Event()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Registro
+    # ──────────────────────────────────────────────────────────────────────
+    def acompanhar(self, processamento_id, tratador):
+        """
+        Registra o tratador de término de um processamento.
+
+        Deve ser chamado antes do `docker run`, para que o evento de término
+        não seja perdido mesmo que o container termine imediatamente.
+        """
+        with self._lock:
+            self._tratadores[str(processamento_id)] = [tratador, None, []]
+        self.iniciar()
+
+    def associar_container(self, processamento_id, container_id):
+        """
+        Informa o container do processamento.
+
+        Eventos recebidos antes disso ficam pendentes e só são tratados se
+        forem deste container; os de outros containers (ex.: o container
+        anterior de um processamento reiniciado) são descartados.
+        """
+        processamento_id = str(processamento_id)
+        with self._lock:
+            registro = self._tratadores.get(processamento_id)
+            if not registro:
+                return
+            registro[1] = container_id
+            pendentes, registro[2] = registro[2], []
+        for exit_code, oom, evento_container in pendentes:
+            if evento_container == container_id:
+                self._despachar(processamento_id, exit_code, oom, evento_container)
+
+    def esquecer(self, processamento_id):
+        """Remove o tratador (ex.: falha ao iniciar o container)."""
+        with self._lock:
+            self._tratadores.pop(str(processamento_id), None)
+            self._oom.discard(str(processamento_id))
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Assinatura
+    # ──────────────────────────────────────────────────────────────────────
+    def iniciar(self, timeout=10):
+        """Inicia a assinatura (uma vez por processo) e aguarda a conexão."""
+        with self._lock:
+            if self._thread is None:
+                # Eventos a partir de agora são reproduzidos mesmo se chegarem antes da conexão
+                self._desde = time.time()
+                self._thread = threading.Thread(target=self._executar, name="docker-events", daemon=True)
+                self._thread.start()
+        self._conectado.wait(timeout)
+
+    def _comando(self):
+        return [
+            "docker", "events",
+            "--filter", "type=container",
+            "--filter", f"label={LABEL_PROCESSAMENTO}",
+            "--filter", "event=die",
+            "--filter", "event=oom",
+            "--since", f"{self._desde:.6f}",
+            "--format", "{{json .}}",
+        ]
+
+    def _executar(self):
+        primeira = True
+        while True:
+            try:
+                proc = subprocess.Popen(
+                    self._comando(),
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    bufsize=1,
+                )
+                self._conectado.set()
+                if primeira:
+                    primeira = False
+                    self.reconciliar()
+
+                for linha in proc.stdout:
+                    self.tratar_linha(linha)
+                proc.wait()
+                logger.warning("docker events encerrado (código %s); reconectando", proc.returncode)
+            except Exception as e:
+                logger.error("Erro na assinatura de eventos do Docker: %s", e)
+                # Sem Docker disponível: não bloqueia quem aguarda a conexão
+                self._conectado.set()
+            time.sleep(ESPERA_RECONEXAO)
+
+    def reconciliar(self):
+        """Trata containers de processamento que já terminaram e ainda não foram removidos."""
+        try:
+            ids = subprocess.run(
+                ["docker", "ps", "-aq", "--filter", f"label={LABEL_PROCESSAMENTO}", "--filter", "status=exited"],
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            if not ids:
+                return
+            formato = f'{{{{.Id}}}} {{{{index .Config.Labels "{LABEL_PROCESSAMENTO}"}}}} {{{{.State.ExitCode}}}} {{{{.State.OOMKilled}}}}'
+            saida = subprocess.run(
+                ["docker", "inspect", "--format", formato, *ids],
+                capture_output=True, text=True, check=True,
+            ).stdout
+        except Exception as e:
+            logger.error("Erro ao reconciliar containers encerrados: %s", e)
+            return
+
+        for linha in saida.splitlines():
+            partes = linha.split()
+            if len(partes) == 4:
+                container_id, processamento_id, exit_code, oom = partes
+                logger.info("Reconciliando container encerrado do processamento %s", processamento_id)
+                self._despachar(processamento_id, int(exit_code), oom == "true", container_id)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Eventos
+    # ──────────────────────────────────────────────────────────────────────
+    def tratar_linha(self, linha: str):
+        """Interpreta uma linha JSON do `docker events`."""
+        try:
+            evento = json.loads(linha)
+        except ValueError:
+            return
+        self.tratar_evento(evento)
+
+    def tratar_evento(self, evento: dict):
+        ator = evento.get("Actor") or {}
+        atributos = ator.get("Attributes") or {}
+        processamento_id = atributos.get(LABEL_PROCESSAMENTO)
+        if not processamento_id:
+            return
+
+        if evento.get("timeNano"):
+            self._desde = max(self._desde or 0, int(evento["timeNano"]) / 1e9)
+
+        acao = evento.get("Action") or evento.get("status")
+        if acao == "oom":
+            with self._lock:
+                self._oom.add(processamento_id)
+        elif acao == "die":
+            try:
+                exit_code = int(atributos.get("exitCode", -1))
+            except ValueError:
+                exit_code = -1
+            self._despachar(processamento_id, exit_code, False, ator.get("ID") or evento.get("id"))
+
+    def _despachar(self, processamento_id, exit_code, oom, container_id):
+        with self._lock:
+            oom = oom or processamento_id in self._oom
+            registro = self._tratadores.get(processamento_id)
+            if registro and registro[1] is None:
+                # Container ainda não associado: decide em associar_container
+                registro[2].append((exit_code, oom, container_id))
+                return
+            if registro and container_id and registro[1] != container_id:
+                # Evento de um container anterior do mesmo processamento (ex.: reinício)
+                return
+            self._tratadores.pop(processamento_id, None)
+            self._oom.discard(processamento_id)
+
+        if registro:
+            self._pool.submit(self._chamar, registro[0], exit_code, oom, container_id)
+        elif self.ao_orfao:
+            self._pool.submit(self._chamar, self.ao_orfao, processamento_id, exit_code, oom, container_id)
+
+    @staticmethod
+    def _chamar(tratador, *args):
+        try:
+            tratador(*args)
+        except Exception:
+            logger.exception("Erro ao finalizar processamento a partir de evento do Docker")
+
+
+_ouvinte = None
+_ouvinte_lock = threading.Lock()
+
+
+def obter_ouvinte(ao_orfao=None):
+    """Ouvinte único do processo (criado no primeiro uso)."""
+    global _ouvinte
+    with _ouvinte_lock:
+        if _ouvinte is None:
+            _ouvinte = OuvinteEventosDocker(ao_orfao=ao_orfao)
+        elif ao_orfao and _ouvinte.ao_orfao is None:
+            _ouvinte.ao_orfao = ao_orfao
+        return _ouvinte
@@ -0,0 +1,13 @@
+# core/services/logs/__init__.py
+"""
+Pacote para armazenamento e leitura dos logs de cada processamento.
+"""
+
+from .arquivo import (
+    EscritorLogCompactado, LeitorLogCompactado, abrir_leitor, diretorio_local, enviar_para_s3
+)
+
+__all__ = [
+    'EscritorLogCompactado', 'LeitorLogCompactado',
+    'abrir_leitor', 'diretorio_local', 'enviar_para_s3',
+]
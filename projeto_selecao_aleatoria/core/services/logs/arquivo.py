@@ -0,0 +1,247 @@
+# core/services/logs/arquivo.py
+"""
+Arquivo de log compactado por blocos, com índice de deslocamentos.
+
+Formato:
+  stdout.log.z  -> concatenação de blocos zlib independentes (append-only)
+  stdout.idx    -> uma linha por bloco: "<byte_inicial> <tamanho> <primeira_linha> <qtd_linhas>"
+
+Como cada bloco é comprimido separadamente, ler as linhas [offset, offset+limit)
+exige descomprimir apenas os blocos que cobrem esse intervalo, tanto no disco
+local quanto no S3 (via GET com Range).
+"""
+
+import logging
+import threading
+import zlib
+from pathlib import Path
+
+from django.conf import settings
+
+from core.services.s3.utils import get_s3_client, parse_s3_path
+
+logger = logging.getLogger("docker_rpa")
+
+NOME_DADOS = "stdout.log.z"
+NOME_INDICE = "stdout.idx"
+
+
+def diretorio_local(processamento) -> Path:
+    """Diretório local dos logs de um processamento."""
+    return Path(settings.RPA_LOG_DIR) / str(processamento.user_id) / str(processamento.id)
+
+
+class EscritorLogCompactado:
+    """
+    Grava as linhas de saída de um container em blocos comprimidos.
+
+    Um bloco é fechado ao atingir `linhas_por_bloco` linhas ou `bytes_por_bloco`
+    bytes não comprimidos, ou `intervalo_gravacao` segundos depois da primeira
+    linha pendente (para que a leitura durante a execução veja a saída
+    recente); o índice é atualizado a cada bloco gravado.
+    """
+
+    def __init__(self, diretorio, linhas_por_bloco=None, bytes_por_bloco=64 * 1024, intervalo_gravacao=None):
+        """
+        Args:
+            diretorio: Diretório onde stdout.log.z e stdout.idx serão criados
+            linhas_por_bloco: Máximo de linhas por bloco (padrão: RPA_LOG_LINHAS_POR_BLOCO)
+            bytes_por_bloco: Máximo de bytes não comprimidos por bloco
+            intervalo_gravacao: Tempo máximo (s) de uma linha sem ser gravada
+                (padrão: RPA_LOG_INTERVALO_GRAVACAO; 0 desativa)
+        """
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.caminho_dados = self.diretorio / NOME_DADOS
+        self.caminho_indice = self.diretorio / NOME_INDICE
+        self.linhas_por_bloco = linhas_por_bloco or settings.RPA_LOG_LINHAS_POR_BLOCO
+        self.bytes_por_bloco = bytes_por_bloco
+        if intervalo_gravacao is None:
+            intervalo_gravacao = settings.RPA_LOG_INTERVALO_GRAVACAO
+        self.intervalo_gravacao = intervalo_gravacao
+
+        # Cada execução começa um log novo (ex.: processamento reiniciado)
+        for caminho in (self.caminho_dados, self.caminho_indice):
+            caminho.unlink(missing_ok=True)
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._bytes_buffer = 0
+        self._offset = 0
+        self._temporizador = None
+        self.total_linhas = 0
+
+    def escrever(self, linha: str):
+        """Acrescenta uma linha ao log (sem a quebra de linha final)."""
+        with self._lock:
+            dados = (linha + "\n").encode("utf-8", "replace")
+            self._buffer.append(dados)
+            self._bytes_buffer += len(dados)
+            if len(self._buffer) >= self.linhas_por_bloco or self._bytes_buffer >= self.bytes_por_bloco:
+                self._gravar_bloco()
+            elif self._temporizador is None and self.intervalo_gravacao:
+                # Bloco parcial é gravado mesmo que o container fique em silêncio
+                self._temporizador = threading.Timer(self.intervalo_gravacao, self.fechar)
+                self._temporizador.daemon = True
+                self._temporizador.start()
+
+    def _gravar_bloco(self):
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        if not self._buffer:
+            return
+        bloco = zlib.compress(b"".join(self._buffer), 6)
+        with open(self.caminho_dados, "ab") as f:
+            f.write(bloco)
+        with open(self.caminho_indice, "a", encoding="ascii") as f:
+            f.write(f"{self._offset} {len(bloco)} {self.total_linhas} {len(self._buffer)}\n")
+
+        self._offset += len(bloco)
+        self.total_linhas += len(self._buffer)
+        self._buffer = []
+        self._bytes_buffer = 0
+
+    def fechar(self):
+        """Grava o bloco pendente (chamado ao final e pelo temporizador)."""
+        with self._lock:
+            self._gravar_bloco()
+
+
+class LeitorLogCompactado:
+    """
+    Lê intervalos de linhas de um log compactado sem descomprimi-lo inteiro.
+
+    A origem é abstraída por duas funções: uma que retorna o índice completo
+    e outra que retorna os bytes [inicio, fim) do arquivo de dados.
+    """
+
+    def __init__(self, ler_indice, ler_intervalo):
+        """
+        Args:
+            ler_indice: Função sem argumentos que retorna o conteúdo do índice (str)
+            ler_intervalo: Função (inicio, fim) que retorna os bytes desse trecho
+        """
+        self._ler_indice = ler_indice
+        self._ler_intervalo = ler_intervalo
+
+    @classmethod
+    def local(cls, diretorio):
+        """Leitor para um log gravado em disco."""
+        diretorio = Path(diretorio)
+
+        def ler_intervalo(inicio, fim):
+            with open(diretorio / NOME_DADOS, "rb") as f:
+                f.seek(inicio)
+                return f.read(fim - inicio)
+
+        return cls(lambda: (diretorio / NOME_INDICE).read_text(encoding="ascii"), ler_intervalo)
+
+    @classmethod
+    def s3(cls, s3_client, bucket, prefixo):
+        """Leitor para um log enviado ao S3 (usa GET com Range)."""
+        def ler_indice():
+            resposta = s3_client.get_object(Bucket=bucket, Key=f"{prefixo}{NOME_INDICE}")
+            return resposta["Body"].read().decode("ascii")
+
+        def ler_intervalo(inicio, fim):
+            resposta = s3_client.get_object(
+                Bucket=bucket, Key=f"{prefixo}{NOME_DADOS}", Range=f"bytes={inicio}-{fim - 1}"
+            )
+            return resposta["Body"].read()
+
+        return cls(ler_indice, ler_intervalo)
+
+    def _blocos(self):
+        blocos = []
+        # Só linhas terminadas por quebra: a última pode estar sendo gravada
+        # pelo escritor (container em execução) e é ignorada até completar
+        for linha in self._ler_indice().split("\n")[:-1]:
+            if linha.strip():
+                offset, tamanho, primeira, qtd = (int(v) for v in linha.split())
+                blocos.append((offset, tamanho, primeira, qtd))
+        return blocos
+
+    def ler(self, offset=0, limit=200):
+        """
+        Retorna as linhas [offset, offset + limit).
+
+        Returns:
+            Tupla (linhas, total_linhas)
+        """
+        blocos = self._blocos()
+        total = blocos[-1][2] + blocos[-1][3] if blocos else 0
+        fim_desejado = min(offset + limit, total)
+
+        selecionados = [b for b in blocos if b[2] < fim_desejado and b[2] + b[3] > offset]
+        if not selecionados:
+            return [], total
+
+        # Blocos são contíguos: uma única leitura cobre todos os selecionados
+        inicio = selecionados[0][0]
+        fim = selecionados[-1][0] + selecionados[-1][1]
+        dados = self._ler_intervalo(inicio, fim)
+
+        linhas = []
+        for offset_bloco, tamanho, primeira, _ in selecionados:
+            trecho = dados[offset_bloco - inicio:offset_bloco - inicio + tamanho]
+            texto = zlib.decompress(trecho).decode("utf-8", "replace")
+            for i, linha in enumerate(texto.split("\n")[:-1]):
+                if offset <= primeira + i < fim_desejado:
+                    linhas.append(linha)
+        return linhas, total
+
+
+def abrir_leitor(processamento):
+    """
+    Abre o log de um processamento, preferindo a cópia local.
+
+    Enquanto o container roda (ou se o upload falhou) o log está no disco;
+    depois de enviado, é lido diretamente do S3.
+
+    Returns:
+        LeitorLogCompactado ou None se o processamento não tem log
+    """
+    local = diretorio_local(processamento)
+    if (local / NOME_INDICE).exists():
+        return LeitorLogCompactado.local(local)
+
+    from core.models import ContainerExecucao
+
+    logs_s3 = (
+        ContainerExecucao.objects.filter(processamento_id=processamento.id)
+        .values_list("logs_s3", flat=True).first()
+    )
+    if not logs_s3:
+        # Processamentos anteriores às colunas tipadas
+        resultado = processamento.resultado if isinstance(processamento.resultado, dict) else {}
+        logs_s3 = (resultado.get("container_info") or resultado).get("logs_s3")
+    destino = parse_s3_path(logs_s3)
+    if destino:
+        bucket, prefixo = destino
+        return LeitorLogCompactado.s3(get_s3_client(profile_name="appbeta-s3-user"), bucket, prefixo)
+    return None
+
+
+def enviar_para_s3(escritor, s3_client, bucket, prefixo):
+    """
+    Envia o log fechado para o S3 e remove a cópia local.
+
+    Returns:
+        Caminho s3:// do diretório de logs, ou None se o log está vazio (nada enviado)
+    """
+    arquivos = (escritor.caminho_dados, escritor.caminho_indice)
+    enviado = all(caminho.exists() for caminho in arquivos)
+    if enviado:
+        for caminho in arquivos:
+            s3_client.upload_file(
+                str(caminho), bucket, f"{prefixo}{caminho.name}",
+                ExtraArgs={"ServerSideEncryption": "AES256"},
+            )
+    for caminho in (escritor.caminho_dados, escritor.caminho_indice):
+        caminho.unlink(missing_ok=True)
+    try:
+        escritor.diretorio.rmdir()
+    except OSError:
+        pass
+    return f"s3://{bucket}/{prefixo}" if enviado else None
@@ -0,0 +1,151 @@
+# core/services/logs/seguidor.py
+"""
+Leitura da saída de vários processos (`docker logs -f`) em uma única thread.
+
+Cada fluxo é registrado em um seletor (epoll/kqueue) e lido de forma não
+bloqueante; as linhas completas são entregues ao callback do processamento.
+Assim, acompanhar muitos containers não exige uma thread por container.
+No Windows, onde pipes não são suportados por `selectors`, cada fluxo usa
+sua própria thread.
+"""
+
+import logging
+import os
+import queue
+import selectors
+import subprocess
+import threading
+
+logger = logging.getLogger("docker_rpa")
+
+
+class _Fluxo:
+    """Saída de um processo: junta os bytes recebidos em linhas."""
+
+    def __init__(self, proc, ao_receber, ao_terminar):
+        self.proc = proc
+        self.ao_receber = ao_receber
+        self.ao_terminar = ao_terminar
+        self._resto = b""
+
+    def _entregar(self, dados: bytes):
+        linha = dados.decode("utf-8", "replace").rstrip("\r")
+        try:
+            self.ao_receber(linha)
+        except Exception as e:
+            logger.error("Erro ao tratar linha de log: %s", e)
+
+    def receber(self, dados: bytes):
+        *linhas, self._resto = (self._resto + dados).split(b"\n")
+        for linha in linhas:
+            self._entregar(linha)
+
+    def encerrar(self):
+        if self._resto:
+            self._entregar(self._resto)
+            self._resto = b""
+        try:
+            self.proc.stdout.close()
+            self.proc.wait()
+        except Exception:
+            pass
+        try:
+            self.ao_terminar()
+        except Exception as e:
+            logger.error("Erro ao encerrar fluxo de log: %s", e)
+
+
+class SeguidorSaidas:
+    """
+    Multiplexa a saída de processos em uma única thread.
+
+    Exemplo:
+        seguidor.seguir(["docker", "logs", "-f", nome], ao_receber, ao_terminar)
+    """
+
+    def __init__(self):
+        self._seletor = None
+        self._novos = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._despertar_r = self._despertar_w = None
+
+    def seguir(self, args, ao_receber, ao_terminar):
+        """
+        Inicia o processo e entrega cada linha da sua saída.
+
+        Args:
+            args: Comando (lista) cuja saída será acompanhada
+            ao_receber: Função chamada com cada linha (sem quebra de linha)
+            ao_terminar: Função chamada quando a saída termina
+
+        Returns:
+            O subprocess.Popen iniciado
+        """
+        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        fluxo = _Fluxo(proc, ao_receber, ao_terminar)
+
+        if os.name == "nt":
+            threading.Thread(target=self._ler_bloqueante, args=(fluxo,), daemon=True).start()
+            return proc
+
+        os.set_blocking(proc.stdout.fileno(), False)
+        self._garantir_thread()
+        self._novos.put(fluxo)
+        os.write(self._despertar_w, b"\0")
+        return proc
+
+    @staticmethod
+    def _ler_bloqueante(fluxo):
+        for dados in iter(lambda: fluxo.proc.stdout.read1(65536), b""):
+            fluxo.receber(dados)
+        fluxo.encerrar()
+
+    def _garantir_thread(self):
+        with self._lock:
+            if self._thread is None:
+                self._seletor = selectors.DefaultSelector()
+                self._despertar_r, self._despertar_w = os.pipe()
+                os.set_blocking(self._despertar_r, False)
+                self._seletor.register(self._despertar_r, selectors.EVENT_READ, None)
+                self._thread = threading.Thread(target=self._executar, name="seguidor-logs", daemon=True)
+                self._thread.start()
+
+    def _registrar_novos(self):
+        try:
+            os.read(self._despertar_r, 4096)
+        except BlockingIOError:
+            pass
+        while True:
+            try:
+                fluxo = self._novos.get_nowait()
+            except queue.Empty:
+                return
+            self._seletor.register(fluxo.proc.stdout, selectors.EVENT_READ, fluxo)
+
+    def _executar(self):
+        while True:
+            for chave, _ in self._seletor.select():
+                fluxo = chave.data
+                if fluxo is None:
+                    self._registrar_novos()
+                    continue
+                try:
+                    dados = os.read(chave.fd, 65536)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    dados = b""
+                if dados:
+                    fluxo.receber(dados)
+                else:
+                    self._seletor.unregister(chave.fileobj)
+                    fluxo.encerrar()
+
+
+_seguidor = SeguidorSaidas()
+
+
+def seguir(args, ao_receber, ao_terminar):
+    """Acompanha a saída de um processo no seguidor compartilhado do processo."""
+    return _seguidor.seguir(args, ao_receber, ao_terminar)
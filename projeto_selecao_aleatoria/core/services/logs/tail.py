@@ -0,0 +1,122 @@
+# core/services/logs/tail.py
+"""
+Buffers em memória com as últimas linhas de log dos processamentos em execução.
+
+O processador publica cada linha lida do container; qualquer número de
+assinantes (ex.: conexões SSE) recebe as novas linhas sem consultar o banco.
+Cada linha recebe um número de sequência, usado como `id` do evento SSE para
+permitir retomar a transmissão (Last-Event-ID).
+"""
+
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+
+logger = logging.getLogger("docker_rpa")
+
+
+class BufferLogAoVivo:
+    """
+    Buffer circular com fan-out para as linhas de um processamento.
+
+    Assinantes são funções chamadas com (seq, linha) na thread do produtor;
+    ao encerrar, recebem (None, None). Devem ser rápidas e não bloquear.
+    """
+
+    def __init__(self, processamento_id, user_id, capacidade=None):
+        """
+        Args:
+            processamento_id: ID do processamento
+            user_id: Dono do processamento (usado para autorização sem banco)
+            capacidade: Linhas mantidas em memória (padrão: RPA_LOG_TAIL_LINHAS)
+        """
+        self.processamento_id = str(processamento_id)
+        self.user_id = user_id
+        self.encerrado = False
+
+        self._linhas = deque(maxlen=capacidade or settings.RPA_LOG_TAIL_LINHAS)
+        self._proximo_seq = 0
+        self._assinantes = set()
+        self._lock = threading.Lock()
+
+    def publicar(self, linha: str):
+        """Adiciona uma linha e a entrega a todos os assinantes."""
+        with self._lock:
+            seq = self._proximo_seq
+            self._proximo_seq += 1
+            self._linhas.append((seq, linha))
+            assinantes = list(self._assinantes)
+        for callback in assinantes:
+            try:
+                callback(seq, linha)
+            except Exception as e:
+                logger.warning("Assinante de log removido após erro: %s", e)
+                self.cancelar(callback)
+
+    def assinar(self, callback, desde=None):
+        """
+        Registra um assinante e retorna o histórico em memória.
+
+        O registro e a cópia do histórico são atômicos, então nenhuma linha
+        é perdida nem duplicada entre o histórico e as entregas seguintes.
+
+        Args:
+            callback: Função (seq, linha)
+            desde: Último seq já recebido pelo cliente (retoma a partir do seguinte)
+
+        Returns:
+            Lista de (seq, linha) ainda em memória
+        """
+        with self._lock:
+            historico = [(s, l) for s, l in self._linhas if desde is None or s > desde]
+            if not self.encerrado:
+                self._assinantes.add(callback)
+            return historico
+
+    def cancelar(self, callback):
+        """Remove um assinante."""
+        with self._lock:
+            self._assinantes.discard(callback)
+
+    def encerrar(self):
+        """Marca o fim do log e avisa os assinantes."""
+        with self._lock:
+            self.encerrado = True
+            assinantes = list(self._assinantes)
+            self._assinantes.clear()
+        for callback in assinantes:
+            try:
+                callback(None, None)
+            except Exception:
+                pass
+
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def criar_buffer(processamento):
+    """Cria (ou substitui) o buffer de um processamento em execução."""
+    buffer = BufferLogAoVivo(processamento.id, processamento.user_id)
+    with _buffers_lock:
+        anterior = _buffers.get(buffer.processamento_id)
+        _buffers[buffer.processamento_id] = buffer
+    if anterior:
+        anterior.encerrar()
+    return buffer
+
+
+def obter_buffer(processamento_id):
+    """Retorna o buffer de um processamento em execução neste processo, ou None."""
+    with _buffers_lock:
+        return _buffers.get(str(processamento_id))
+
+
+def encerrar_buffer(buffer):
+    """Encerra o buffer e o remove do registro."""
+    buffer.encerrar()
+    with _buffers_lock:
+        if _buffers.get(buffer.processamento_id) is buffer:
+            del _buffers[buffer.processamento_id]
@@ -0,0 +1,95 @@
+# core/services/perfis.py
+"""
+Registro de perfis de execução com cache em memória.
+
+Os perfis (PerfilExecucao) mudam raramente e são lidos a cada disparo de
+processamento. Para não adicionar consultas por job, o registro completo é
+carregado uma vez por processo e mantido em memória.
+
+O registro é recarregado do banco (duas consultas pequenas) no máximo a
+cada RPA_PERFIS_VERIFICACAO segundos, incondicionalmente: qualquer mudança,
+inclusive por `QuerySet.update()`, SQL direto ou outro processo, é percebida
+dentro desse intervalo sem depender de um cache compartilhado nem de
+`atualizado_em`. Mudanças feitas neste processo via save()/delete() (sinais
+do modelo) forçam a recarga na leitura seguinte.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import PerfilExecucao, ProcessamentoRPATemplate
+
+logger = logging.getLogger("docker_rpa")
+
+_lock = threading.Lock()
+_registro = {"carregado_em": None, "por_tipo": {}, "por_id": {}, "perfil_template": {}}
+
+
+def invalidar():
+    """Força a recarga do registro na próxima leitura deste processo."""
+    _registro["carregado_em"] = None
+
+
+def _expirado():
+    carregado_em = _registro["carregado_em"]
+    return carregado_em is None or time.monotonic() - carregado_em >= settings.RPA_PERFIS_VERIFICACAO
+
+
+def _carregar():
+    perfis = list(PerfilExecucao.objects.filter(ativo=True))
+    templates = ProcessamentoRPATemplate.objects.filter(
+        perfil__isnull=False
+    ).values_list("id", "perfil_id")
+
+    _registro.update(
+        por_tipo={p.tipo: p for p in perfis if p.tipo},
+        por_id={p.id: p for p in perfis},
+        perfil_template=dict(templates),
+        carregado_em=time.monotonic(),
+    )
+    logger.debug("Registro de perfis carregado (%s perfis)", len(perfis))
+
+
+def _snapshot():
+    if _expirado():
+        with _lock:
+            if _expirado():
+                _carregar()
+    return _registro
+
+
+def perfil_padrao():
+    """Perfil usado quando nenhum perfil está cadastrado para o processamento."""
+    return PerfilExecucao(nome="padrao", output_glob=settings.RPA_OUTPUT_GLOB)
+
+
+def resolver(processamento):
+    """
+    Resolve o perfil de execução de um processamento.
+
+    Ordem de precedência: perfil do template, perfil do tipo, perfil padrão.
+
+    Args:
+        processamento: Instância do modelo ProcessamentoRPA
+
+    Returns:
+        Instância de PerfilExecucao (não deve ser alterada pelo chamador)
+    """
+    registro = _snapshot()
+
+    perfil_id = registro["perfil_template"].get(processamento.template_id)
+    perfil = registro["por_id"].get(perfil_id) if perfil_id else None
+    if perfil is None:
+        perfil = registro["por_tipo"].get(processamento.tipo)
+    return perfil or perfil_padrao()
+
+
+@receiver([post_save, post_delete], sender=PerfilExecucao)
+@receiver([post_save, post_delete], sender=ProcessamentoRPATemplate)
+def _invalidar_registro(sender, **kwargs):
+    invalidar()
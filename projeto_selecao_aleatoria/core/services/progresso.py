@@ -0,0 +1,114 @@
+# core/services/progresso.py
+"""
+Gravação agrupada e limitada do progresso dos processamentos.
+
+Os marcadores de progresso chegam a cada linha de log; gravar um UPDATE por
+linha disputa o lock de escrita do SQLite com o restante da aplicação. O
+EscritorProgresso mantém o último valor de cada processamento em memória e:
+
+- descarta valores repetidos ou menores que o último aceito (nunca regride);
+- grava no máximo uma vez a cada RPA_PROGRESSO_FLUSH_MS por processamento;
+- grava os valores pendentes de todos os processamentos em uma transação.
+
+Estados terminais (concluir/falhar) gravam o progresso junto com o status e
+descartam o valor pendente, então nenhuma gravação atrasada chega depois.
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger("docker_rpa")
+
+
+class EscritorProgresso:
+    """
+    Acumula atualizações de progresso e as grava periodicamente em lote.
+
+    Uma única thread daemon faz as gravações enquanto houver valores
+    pendentes; ela reaproveita a mesma conexão com o banco.
+    """
+
+    def __init__(self, intervalo_ms=None):
+        """
+        Args:
+            intervalo_ms: Intervalo mínimo entre gravações (padrão: RPA_PROGRESSO_FLUSH_MS)
+        """
+        intervalo_ms = settings.RPA_PROGRESSO_FLUSH_MS if intervalo_ms is None else intervalo_ms
+        self.intervalo = intervalo_ms / 1000
+        self._condicao = threading.Condition()
+        self._pendentes = {}  # processamento_id -> progresso ainda não gravado
+        self._aceitos = {}    # processamento_id -> maior progresso aceito
+        self._thread = None
+
+    def registrar(self, processamento_id, progresso):
+        """
+        Registra um novo valor de progresso.
+
+        Returns:
+            True se o valor foi aceito (maior que o último registrado)
+        """
+        with self._condicao:
+            if progresso <= self._aceitos.get(processamento_id, -1):
+                return False
+            self._aceitos[processamento_id] = progresso
+            self._pendentes[processamento_id] = progresso
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name="progresso", daemon=True)
+                self._thread.start()
+            self._condicao.notify()
+            return True
+
+    def encerrar(self, processamento_id):
+        """Esquece o processamento (estado terminal ou reinício) sem gravar o pendente."""
+        with self._condicao:
+            self._pendentes.pop(processamento_id, None)
+            self._aceitos.pop(processamento_id, None)
+
+    def flush(self):
+        """Grava imediatamente todos os valores pendentes em uma única transação."""
+        with self._condicao:
+            pendentes, self._pendentes = self._pendentes, {}
+        if pendentes:
+            self._gravar(pendentes)
+        return len(pendentes)
+
+    @staticmethod
+    def _gravar(pendentes):
+        from core.models import ProcessamentoRPA
+
+        try:
+            with transaction.atomic():
+                for processamento_id, progresso in pendentes.items():
+                    # Filtros garantem que um valor atrasado não sobrescreve estado terminal nem regride
+                    ProcessamentoRPA.objects.filter(
+                        id=processamento_id, status="processando", progresso__lt=progresso
+                    ).update(progresso=progresso)
+        except Exception as e:
+            logger.error("Erro ao gravar progresso de %s processamentos: %s", len(pendentes), e)
+
+    def _executar(self):
+        while True:
+            with self._condicao:
+                while not self._pendentes:
+                    self._condicao.wait()
+            # Janela de agrupamento: valores intermediários do mesmo job são substituídos
+            time.sleep(self.intervalo)
+            close_old_connections()
+            self.flush()
+
+
+_escritor = None
+_escritor_lock = threading.Lock()
+
+
+def obter_escritor():
+    """Escritor de progresso único do processo (criado no primeiro uso)."""
+    global _escritor
+    with _escritor_lock:
+        if _escritor is None:
+            _escritor = EscritorProgresso()
+        return _escritor
@@ -0,0 +1,70 @@
+# core/services/pubsub.py
+"""
+Pub/sub em memória para notificações de mudança de estado dos processamentos.
+
+Tópicos usados:
+  usuario:{user_id}             -> mudanças de qualquer processamento do usuário
+  processamento:{processamento} -> mudanças de um processamento específico
+
+Os callbacks são executados na thread de quem publica e devem apenas
+repassar a mensagem (ex.: `loop.call_soon_threadsafe` para consumidores
+asyncio ou `threading.Event.set` para consumidores síncronos). Não há broker
+externo: apenas assinantes do mesmo processo recebem as mensagens.
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger("docker_rpa")
+
+
+def topico_usuario(user_id):
+    return f"usuario:{user_id}"
+
+
+def topico_processamento(processamento_id):
+    return f"processamento:{processamento_id}"
+
+
+class Barramento:
+    """Registro de assinantes por tópico."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._assinantes = {}  # tópico -> set(callback)
+
+    def assinar(self, topico, callback):
+        """
+        Registra um callback para o tópico.
+
+        Returns:
+            Função sem argumentos que cancela a assinatura
+        """
+        with self._lock:
+            self._assinantes.setdefault(topico, set()).add(callback)
+
+        def cancelar():
+            with self._lock:
+                assinantes = self._assinantes.get(topico)
+                if assinantes:
+                    assinantes.discard(callback)
+                    if not assinantes:
+                        del self._assinantes[topico]
+
+        return cancelar
+
+    def publicar(self, topico, mensagem):
+        """Entrega a mensagem a todos os assinantes do tópico."""
+        with self._lock:
+            assinantes = list(self._assinantes.get(topico, ()))
+        for callback in assinantes:
+            try:
+                callback(mensagem)
+            except Exception as e:
+                logger.warning("Erro em assinante de %s: %s", topico, e)
+
+    def tem_assinantes(self, topico):
+        return bool(self._assinantes.get(topico))
+
+
+barramento = Barramento()
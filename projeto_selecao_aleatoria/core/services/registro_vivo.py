@@ -0,0 +1,282 @@
+# core/services/registro_vivo.py
+"""
+Registro em memória do estado dos processamentos ativos.
+
+As consultas de acompanhamento (`/api/rpa/`, `/api/rpa/{id}/` e `/api/docker-rpa/ativos/`)
+são feitas em polling pelo frontend. Em vez de uma consulta ao banco por
+requisição, o estado dos processamentos pendentes/em execução fica em
+registros compactos (`__slots__`), atualizados:
+
+- pelos sinais do modelo, quando o processamento é salvo neste processo;
+- pelo processador, a cada marcador de progresso e linha de log;
+- por hidratação a partir do banco, para processamentos de outros processos.
+
+Todo registro vale por RPA_REGISTRO_TTL segundos, exceto os de
+processamentos acompanhados por uma execução viva neste processo
+(`acompanhar`/`liberar`): qualquer outro pode ter sido encerrado em outro
+processo (finalização de órfão, reinício, edição no admin).
+
+A persistência do progresso é feita em segundo plano pelo EscritorProgresso
+(core.services.progresso); estados terminais saem do registro.
+
+Mudanças de status, progresso e fase feitas neste processo são publicadas no
+barramento (core.services.pubsub) como deltas {"id": ..., campo: valor}.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.services.pubsub import barramento, topico_processamento, topico_usuario
+
+STATUS_ATIVOS = ("pendente", "processando")
+
+# Campos lidos do modelo (também usados em .only() pelas views)
+CAMPOS_MODELO = (
+    "id", "user_id", "tipo", "descricao", "status", "progresso", "tempo_estimado",
+    "criado_em", "iniciado_em", "concluido_em",
+)
+
+# Campos cuja alteração via save(update_fields=...) muda o estado vivo
+_CAMPOS_RELEVANTES = frozenset(CAMPOS_MODELO) | {"user"}
+
+# Campos enviados aos assinantes (ultima_linha muda a cada linha de log e fica de fora)
+CAMPOS_PUBLICOS = tuple(c for c in CAMPOS_MODELO if c != "user_id") + ("fase",)
+CAMPOS_NOTIFICADOS = ("status", "progresso", "fase")
+
+
+def notificar(user_id, processamento_id, delta):
+    """Publica um delta de estado nos tópicos do usuário e do processamento."""
+    mensagem = {"id": str(processamento_id), **delta}
+    barramento.publicar(topico_usuario(user_id), mensagem)
+    barramento.publicar(topico_processamento(processamento_id), mensagem)
+
+
+class EstadoVivo:
+    """Estado de um processamento ativo (mesmos nomes de atributo do modelo)."""
+
+    __slots__ = CAMPOS_MODELO + ("fase", "ultima_linha", "local", "carregado_em")
+
+    def __init__(self, processamento, local):
+        for campo in CAMPOS_MODELO:
+            setattr(self, campo, getattr(processamento, campo))
+        self.fase = None
+        self.ultima_linha = None
+        self.local = local
+        self.carregado_em = time.monotonic()
+
+    def como_dict(self):
+        """Campos públicos do estado (sem a última linha de log)."""
+        return {campo: getattr(self, campo) for campo in CAMPOS_PUBLICOS}
+
+    def valido(self, ttl, acompanhado=False):
+        """Registros de execuções vivas neste processo são atuais; os demais expiram após o TTL."""
+        return acompanhado or time.monotonic() - self.carregado_em < ttl
+
+
+class RegistroVivo:
+    """Índice em memória dos processamentos ativos, por id e por usuário."""
+
+    def __init__(self, ttl=None):
+        """
+        Args:
+            ttl: Validade (s) dos registros hidratados do banco (padrão: RPA_REGISTRO_TTL)
+        """
+        self.ttl = settings.RPA_REGISTRO_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._estados = {}       # str(id) -> EstadoVivo
+        self._hidratado_em = {}  # user_id -> time.monotonic() da última hidratação
+        self._acompanhados = set()  # str(id) com execução viva neste processo
+
+    def acompanhar(self, processamento_id):
+        """Marca o processamento como executado por este processo (registro sem TTL)."""
+        with self._lock:
+            self._acompanhados.add(str(processamento_id))
+
+    def liberar(self, processamento_id):
+        """Encerra o acompanhamento: o registro volta a expirar pelo TTL."""
+        with self._lock:
+            self._acompanhados.discard(str(processamento_id))
+
+    def registrar(self, processamento, local=True):
+        """Inclui ou atualiza um processamento; estados terminais são removidos."""
+        chave = str(processamento.id)
+        if processamento.status not in STATUS_ATIVOS:
+            self.remover(chave)
+            if local:
+                notificar(processamento.user_id, chave, {
+                    "status": processamento.status,
+                    "progresso": processamento.progresso,
+                    "concluido_em": processamento.concluido_em,
+                })
+            return None
+
+        novo = EstadoVivo(processamento, local)
+        with self._lock:
+            anterior = self._estados.get(chave)
+            if anterior and anterior.status == novo.status:
+                # Instâncias antigas não fazem o progresso regredir
+                novo.progresso = max(novo.progresso, anterior.progresso)
+                novo.fase, novo.ultima_linha = anterior.fase, anterior.ultima_linha
+                novo.local = novo.local or anterior.local
+            self._estados[chave] = novo
+
+        if local:
+            atual = novo.como_dict()
+            if anterior is not None:
+                antes = anterior.como_dict()
+                atual = {c: v for c, v in atual.items() if antes[c] != v}
+            if atual:
+                notificar(novo.user_id, chave, atual)
+        return novo
+
+    def atualizar(self, processamento_id, **campos):
+        """Atualiza atributos de um processamento já registrado (ex.: progresso, fase)."""
+        delta = {}
+        with self._lock:
+            estado = self._estados.get(str(processamento_id))
+            if estado is None:
+                return
+            for campo, valor in campos.items():
+                if campo in CAMPOS_NOTIFICADOS and getattr(estado, campo) != valor:
+                    delta[campo] = valor
+                setattr(estado, campo, valor)
+        if delta:
+            notificar(estado.user_id, processamento_id, delta)
+
+    def remover(self, processamento_id):
+        with self._lock:
+            self._estados.pop(str(processamento_id), None)
+
+    def obter(self, processamento_id, user_id):
+        """
+        Estado atual de um processamento ativo do usuário.
+
+        Returns:
+            EstadoVivo ou None (não registrado, expirado ou de outro usuário)
+        """
+        chave = str(processamento_id)
+        estado = self._estados.get(chave)
+        if estado is None or estado.user_id != user_id:
+            return None
+        if not estado.valido(self.ttl, chave in self._acompanhados):
+            return None
+        return estado
+
+    def ativos(self, user_id, tipo=None):
+        """
+        Processamentos ativos do usuário, mais recentes primeiro.
+
+        Returns:
+            Lista de EstadoVivo, ou None se o usuário precisa ser hidratado do banco
+        """
+        hidratado_em = self._hidratado_em.get(user_id)
+        if hidratado_em is None or time.monotonic() - hidratado_em >= self.ttl:
+            return None
+        return self._do_usuario(user_id, tipo)
+
+    def _do_usuario(self, user_id, tipo):
+        with self._lock:
+            estados = [
+                e for e in self._estados.values()
+                if e.user_id == user_id and (tipo is None or e.tipo == tipo)
+            ]
+        return sorted(estados, key=lambda e: e.criado_em, reverse=True)
+
+    def hidratar_usuario(self, user_id, processamentos):
+        """
+        Substitui os registros do usuário pelos ativos lidos do banco, exceto
+        os acompanhados por uma execução viva neste processo.
+
+        Args:
+            user_id: Usuário consultado
+            processamentos: Todos os processamentos ativos do usuário (qualquer tipo)
+        """
+        agora = time.monotonic()
+        with self._lock:
+            anteriores = {
+                c: self._estados.pop(c) for c, e in list(self._estados.items())
+                if e.user_id == user_id and c not in self._acompanhados
+            }
+            for processamento in processamentos:
+                chave = str(processamento.id)
+                if chave in self._estados:
+                    continue
+                novo = EstadoVivo(processamento, local=False)
+                anterior = anteriores.get(chave)
+                if anterior and anterior.status == novo.status:
+                    # O progresso persistido em segundo plano pode estar atrás do registro
+                    novo.progresso = max(novo.progresso, anterior.progresso)
+                    novo.fase, novo.ultima_linha = anterior.fase, anterior.ultima_linha
+                self._estados[chave] = novo
+            self._hidratado_em[user_id] = agora
+
+    def ativos_do_usuario(self, user_id, tipo=None):
+        """
+        Processamentos ativos do usuário, hidratando do banco quando necessário
+        (uma consulta por usuário a cada TTL, para todos os tipos).
+        """
+        estados = self.ativos(user_id, tipo)
+        if estados is None:
+            from core.models import ProcessamentoRPA
+
+            self.hidratar_usuario(
+                user_id,
+                ProcessamentoRPA.objects.filter(
+                    user_id=user_id, status__in=STATUS_ATIVOS
+                ).only(*CAMPOS_MODELO),
+            )
+            estados = self._do_usuario(user_id, tipo)
+        return estados
+
+    def estado_do_processamento(self, processamento_id, user_id):
+        """
+        Estado de um processamento do usuário.
+
+        Returns:
+            EstadoVivo (ativos), instância do modelo (encerrados) ou None se não existe
+        """
+        estado = self.obter(processamento_id, user_id)
+        if estado is not None:
+            return estado
+
+        from core.models import ProcessamentoRPA
+
+        try:
+            processamento = ProcessamentoRPA.objects.only(*CAMPOS_MODELO).get(
+                id=processamento_id, user_id=user_id
+            )
+        except (ProcessamentoRPA.DoesNotExist, ValidationError, ValueError):
+            return None
+        if processamento.status in STATUS_ATIVOS:
+            return self.registrar(processamento, local=False)
+        return processamento
+
+
+_registro = None
+_registro_lock = threading.Lock()
+
+
+def obter_registro():
+    """Registro único do processo (criado no primeiro uso)."""
+    global _registro
+    with _registro_lock:
+        if _registro is None:
+            _registro = RegistroVivo()
+        return _registro
+
+
+@receiver(post_save, sender="core.ProcessamentoRPA")
+def _processamento_salvo(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not _CAMPOS_RELEVANTES.intersection(update_fields):
+        return
+    obter_registro().registrar(instance, local=True)
+
+
+@receiver(post_delete, sender="core.ProcessamentoRPA")
+def _processamento_removido(sender, instance, **kwargs):
+    obter_registro().remover(instance.id)
@@ -0,0 +1,90 @@
+# core/services/resumo_diario.py
+"""
+Manutenção e leitura do resumo diário por usuário (ResumoDiarioUsuario).
+
+Criação e transições de status atualizam o resumo dentro do próprio modelo
+(ProcessamentoRPA.save/_transicionar); aqui ficam a remoção (sinal
+post_delete), a reconstrução completa e as consultas usadas pelos
+endpoints de resumo.
+"""
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+STATUS = ("pendente", "processando", "concluido", "falha")
+
+
+def reconstruir(user_ids=None):
+    """
+    Recalcula o resumo a partir de ProcessamentoRPA.
+
+    Args:
+        user_ids: Limita a reconstrução a estes usuários (padrão: todos)
+
+    Returns:
+        Número de linhas de resumo gravadas
+    """
+    from core.models import ProcessamentoRPA, ResumoDiarioUsuario
+
+    processamentos = ProcessamentoRPA.objects.order_by()
+    resumos = ResumoDiarioUsuario.objects.all()
+    if user_ids is not None:
+        processamentos = processamentos.filter(user_id__in=user_ids)
+        resumos = resumos.filter(user_id__in=user_ids)
+
+    concluidos_com_tempo = Q(status="concluido", tempo_real__isnull=False)
+    linhas = (
+        processamentos
+        .annotate(dia=TruncDate("criado_em"))  # fuso local (TIME_ZONE)
+        .values("user_id", "dia", "tipo")
+        .annotate(
+            **{status: Count("id", filter=Q(status=status)) for status in STATUS},
+            tempo_real_soma=Sum("tempo_real", filter=concluidos_com_tempo, default=0),
+            tempo_real_qtd=Count("id", filter=concluidos_com_tempo),
+        )
+    )
+    with transaction.atomic():
+        resumos.delete()
+        criados = ResumoDiarioUsuario.objects.bulk_create(
+            (ResumoDiarioUsuario(**linha) for linha in linhas.iterator()), batch_size=1000
+        )
+    return len(criados)
+
+
+def totais_por_tipo(user_id, dia_inicio=None, tipos=None):
+    """
+    Soma o resumo do usuário por tipo (uma consulta).
+
+    Args:
+        user_id: Usuário consultado
+        dia_inicio: Considera apenas dias a partir deste (inclusive)
+        tipos: Limita aos tipos informados
+
+    Returns:
+        Lista de dicionários {tipo, pendente, ..., tempo_real_soma, tempo_real_qtd}
+    """
+    from core.models import ResumoDiarioUsuario
+
+    resumos = ResumoDiarioUsuario.objects.filter(user_id=user_id)
+    if dia_inicio is not None:
+        resumos = resumos.filter(dia__gte=dia_inicio)
+    if tipos is not None:
+        resumos = resumos.filter(tipo__in=tipos)
+    return list(
+        resumos.order_by().values("tipo").annotate(
+            **{status: Sum(status) for status in STATUS},
+            tempo_real_soma=Sum("tempo_real_soma"),
+            tempo_real_qtd=Sum("tempo_real_qtd"),
+        )
+    )
+
+
+@receiver(post_delete, sender="core.ProcessamentoRPA")
+def _processamento_removido(sender, instance, **kwargs):
+    from core.models import ResumoDiarioUsuario
+
+    # Sem criar linha: a remoção em cascata do usuário já apagou o resumo
+    ResumoDiarioUsuario.registrar(instance, instance.status, -1, instance.tempo_real)
@@ -0,0 +1,234 @@
+# core/services/workspace.py
+"""
+Áreas de trabalho temporárias dos processamentos Docker.
+
+Cada processamento recebe dois diretórios no host:
+  {RPA_SCRATCH_ROOT}/temp_output/{user}/processamento_{id}/  -> montado em /app/output
+  {RPA_SCRATCH_ROOT}/temp_dados/{user}/processamento_{id}/   -> montado em /app/dados
+
+O diretório de dados pode ser substituído por um tmpfs do container
+(RPA_SCRATCH_TMPFS). Após um upload bem-sucedido a área é removida; em caso
+de falha ela é mantida por RPA_SCRATCH_TTL_FALHA_HORAS para depuração e
+depois recolhida pelo comando `limpar_temporarios`.
+"""
+
+import logging
+import shutil
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger("docker_rpa")
+
+# Arquivo que marca até quando uma área com falha deve ser mantida (epoch em segundos)
+MARCADOR_EXPIRACAO = ".expira_em"
+
+DIR_OUTPUT = "temp_output"
+DIR_DADOS = "temp_dados"
+
+
+def raiz_scratch() -> Path:
+    """Retorna a raiz configurada para as áreas de trabalho temporárias."""
+    return Path(settings.RPA_SCRATCH_ROOT)
+
+
+def ler_expiracao(diretorio: Path):
+    """
+    Lê o marcador de expiração de uma área de trabalho.
+
+    Returns:
+        Epoch (float) até quando o diretório deve ser mantido, ou None
+    """
+    marcador = Path(diretorio) / MARCADOR_EXPIRACAO
+    try:
+        return float(marcador.read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def tamanho_diretorio(diretorio: Path) -> int:
+    """Soma o tamanho em bytes de todos os arquivos sob um diretório."""
+    total = 0
+    for arquivo in Path(diretorio).rglob("*"):
+        try:
+            if arquivo.is_file():
+                total += arquivo.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+class AreaTrabalho:
+    """
+    Área de trabalho (scratch) de um processamento Docker.
+
+    Encapsula a criação dos diretórios montados no container, os argumentos
+    de volume do `docker run` e a política de remoção/retenção.
+    """
+
+    def __init__(self, processamento, raiz=None, usar_tmpfs=None):
+        """
+        Args:
+            processamento: Instância do modelo ProcessamentoRPA
+            raiz: Raiz das áreas temporárias (padrão: RPA_SCRATCH_ROOT)
+            usar_tmpfs: Monta /app/dados como tmpfs (padrão: RPA_SCRATCH_TMPFS)
+        """
+        raiz = Path(raiz) if raiz else raiz_scratch()
+        sufixo = Path(str(processamento.user_id)) / f"processamento_{processamento.id}"
+
+        self.output_dir = raiz / DIR_OUTPUT / sufixo
+        self.dados_dir = raiz / DIR_DADOS / sufixo
+        self.usar_tmpfs = settings.RPA_SCRATCH_TMPFS if usar_tmpfs is None else usar_tmpfs
+
+    @property
+    def diretorios(self):
+        """Diretórios do host pertencentes a esta área."""
+        if self.usar_tmpfs:
+            return [self.output_dir]
+        return [self.output_dir, self.dados_dir]
+
+    def criar(self):
+        """Cria os diretórios do host (idempotente)."""
+        for diretorio in self.diretorios:
+            diretorio.mkdir(parents=True, exist_ok=True)
+        return self
+
+    def argumentos_docker(self, to_docker_path):
+        """
+        Monta os argumentos de volume do `docker run` para esta área.
+
+        Args:
+            to_docker_path: Função que converte caminhos do host para o formato do Docker
+
+        Returns:
+            Lista de argumentos (-v / --tmpfs)
+        """
+        args = ["-v", f"{to_docker_path(str(self.output_dir.resolve()))}:/app/output:rw"]
+        if self.usar_tmpfs:
+            args += ["--tmpfs", f"/app/dados:rw,size={settings.RPA_SCRATCH_TMPFS_TAMANHO}"]
+        else:
+            args += ["-v", f"{to_docker_path(str(self.dados_dir.resolve()))}:/app/dados:rw"]
+        return args
+
+    def remover(self):
+        """Remove a área de trabalho (após upload bem-sucedido)."""
+        for diretorio in (self.output_dir, self.dados_dir):
+            shutil.rmtree(diretorio, ignore_errors=True)
+        logger.info("Área de trabalho removida: %s", self.output_dir)
+
+    def reter(self, ttl_horas=None):
+        """
+        Mantém a área de trabalho para depuração até o fim do TTL.
+
+        Args:
+            ttl_horas: Horas de retenção (padrão: RPA_SCRATCH_TTL_FALHA_HORAS)
+        """
+        ttl_horas = settings.RPA_SCRATCH_TTL_FALHA_HORAS if ttl_horas is None else ttl_horas
+        expira_em = time.time() + ttl_horas * 3600
+        for diretorio in self.diretorios:
+            if diretorio.exists():
+                (diretorio / MARCADOR_EXPIRACAO).write_text(str(int(expira_em)))
+        logger.info("Área de trabalho mantida por %sh: %s", ttl_horas, self.output_dir)
+
+
+def _areas_existentes(raiz: Path):
+    """
+    Agrupa os diretórios temp_output/ e temp_dados/ por processamento.
+
+    Returns:
+        Dicionário {(user, id_processamento): [diretórios]}
+    """
+    areas = {}
+    for nome_base in (DIR_OUTPUT, DIR_DADOS):
+        base = raiz / nome_base
+        if not base.is_dir():
+            continue
+        for dir_usuario in base.iterdir():
+            if not dir_usuario.is_dir():
+                continue
+            for diretorio in dir_usuario.glob("processamento_*"):
+                if diretorio.is_dir():
+                    chave = (dir_usuario.name, diretorio.name[len("processamento_"):])
+                    areas.setdefault(chave, []).append(diretorio)
+    return areas
+
+
+def varrer_areas(raiz=None, idade_max_horas=None, limite_bytes=None, ids_ativos=(), simular=False):
+    """
+    Recolhe áreas de trabalho antigas, respeitando um orçamento de espaço.
+
+    Regras, nesta ordem:
+      1. Áreas de processamentos ativos nunca são removidas
+      2. Áreas com marcador de expiração vencido são removidas
+      3. Áreas sem marcador mais antigas que `idade_max_horas` são removidas (órfãs)
+      4. Se o total restante exceder `limite_bytes`, remove as mais antigas até caber
+
+    Args:
+        raiz: Raiz das áreas temporárias (padrão: RPA_SCRATCH_ROOT)
+        idade_max_horas: Idade máxima de áreas órfãs (padrão: RPA_SCRATCH_IDADE_MAX_HORAS)
+        limite_bytes: Orçamento total de espaço (padrão: RPA_SCRATCH_LIMITE_MB)
+        ids_ativos: IDs (str) de processamentos pendentes ou em execução
+        simular: Apenas calcula, sem remover nada
+
+    Returns:
+        Dicionário com contagens e bytes liberados
+    """
+    raiz = Path(raiz) if raiz else raiz_scratch()
+    if idade_max_horas is None:
+        idade_max_horas = settings.RPA_SCRATCH_IDADE_MAX_HORAS
+    if limite_bytes is None:
+        limite_bytes = settings.RPA_SCRATCH_LIMITE_MB * 1024 * 1024
+
+    agora = time.time()
+    ids_ativos = {str(i) for i in ids_ativos}
+    removidas, liberados, restantes = 0, 0, []
+
+    def _remover(diretorios, tamanho):
+        nonlocal removidas, liberados
+        if not simular:
+            for diretorio in diretorios:
+                shutil.rmtree(diretorio, ignore_errors=True)
+        removidas += 1
+        liberados += tamanho
+
+    for (_, id_proc), diretorios in _areas_existentes(raiz).items():
+        if id_proc in ids_ativos:
+            continue
+
+        tamanho = sum(tamanho_diretorio(d) for d in diretorios)
+        modificado_em = max(d.stat().st_mtime for d in diretorios)
+        expiracoes = [e for e in (ler_expiracao(d) for d in diretorios) if e is not None]
+
+        if expiracoes:
+            vencida = max(expiracoes) <= agora
+        else:
+            vencida = (agora - modificado_em) > idade_max_horas * 3600
+
+        if vencida:
+            _remover(diretorios, tamanho)
+        else:
+            restantes.append((modificado_em, tamanho, diretorios))
+
+    # Orçamento de espaço: remove as mais antigas primeiro
+    total = sum(tamanho for _, tamanho, _ in restantes)
+    for _, tamanho, diretorios in sorted(restantes, key=lambda a: a[0]):
+        if total <= limite_bytes:
+            break
+        _remover(diretorios, tamanho)
+        total -= tamanho
+
+    # Remove diretórios de usuário que ficaram vazios
+    if not simular:
+        for nome_base in (DIR_OUTPUT, DIR_DADOS):
+            base = raiz / nome_base
+            if base.is_dir():
+                for dir_usuario in base.iterdir():
+                    if dir_usuario.is_dir() and not any(dir_usuario.iterdir()):
+                        dir_usuario.rmdir()
+
+    return {
+        "removidas": removidas,
+        "bytes_liberados": liberados,
+        "bytes_restantes": total,
+    }
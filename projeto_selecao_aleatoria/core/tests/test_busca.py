@@ -0,0 +1,95 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+from core.services import busca
+
+URL = "/api/historico-rpa-filtro/"
+
+
+class BuscaTextualTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+
+    def _criar(self, descricao, **campos):
+        return ProcessamentoRPA.objects.create(user=self.user, tipo="planilha", descricao=descricao, **campos)
+
+    def _ids(self, params, url=URL):
+        resposta = self.cliente.get(url, params)
+        self.assertEqual(resposta.status_code, 200)
+        return [item["id"] for item in resposta.data["results"]]
+
+    def test_acentos_e_prefixo(self):
+        alvo = self._criar("Relatório mensal de conciliação")
+        self._criar("Outra coisa")
+
+        self.assertEqual(self._ids({"busca": "relatorio concil"}), [str(alvo.id)])
+        self.assertEqual(self._ids({"busca": "RELAT"}), [str(alvo.id)])
+        self.assertEqual(self._ids({"busca": "mensal inexistente"}), [])
+
+    def test_sincroniza_transicoes_e_remocao(self):
+        """mensagem_erro gravada pela transição (update) entra no índice; remoção sai"""
+        processamento = self._criar("Seleção")
+        processamento.iniciar_processamento()
+        processamento.falhar("Timeout na conexão com o S3")
+
+        self.assertEqual(self._ids({"busca": "timeout conexao"}), [str(processamento.id)])
+        processamento.delete()
+        self.assertEqual(self._ids({"busca": "timeout"}), [])
+
+    def test_ranking_e_paginacao(self):
+        """Sem ordering, resultados mais relevantes primeiro; o cursor percorre todos"""
+        fraco = self._criar("Planilha de estoque com muitas outras palavras na descrição longa")
+        forte = self._criar("Estoque", mensagem_erro="estoque estoque")
+        for i in range(6):
+            self._criar(f"Estoque lote {i} com outras palavras adicionais")
+
+        primeira = self.cliente.get(URL, {"busca": "estoque", "page_size": 3}).data
+        self.assertEqual(primeira["results"][0]["id"], str(forte.id))
+
+        ids = [item["id"] for item in primeira["results"]]
+        proxima = primeira["next"]
+        while proxima:
+            pagina = self.cliente.get(proxima).data
+            ids += [item["id"] for item in pagina["results"]]
+            proxima = pagina["next"]
+        self.assertEqual(len(ids), 8)
+        self.assertEqual(len(set(ids)), 8)
+        self.assertIn(str(fraco.id), ids)
+
+    def test_estatisticas_e_admin(self):
+        self._criar("Conciliação bancária", status="falha")
+        self._criar("Conciliação de cartões", status="concluido")
+        self._criar("Estoque")
+
+        estatisticas = self.cliente.get(f"{URL}estatisticas/", {"busca": "conciliacao"}).data
+        self.assertEqual(estatisticas["total_processamentos"], 2)
+        self.assertEqual(estatisticas["taxa_sucesso"], 50.0)
+
+        self.cliente.force_authenticate(User.objects.create_superuser("admin", password="senha"))
+        ids = self._ids({"busca": "cartoes"}, url=f"/api/usuarios/{self.user.id}/processamentos/")
+        self.assertEqual(len(ids), 1)
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 é específico do SQLite")
+    def test_triggers_no_banco_migrado(self):
+        """Falha se alguma migração recriou a tabela e descartou os triggers da FTS"""
+        busca._disponivel.clear()
+        self.assertTrue(busca.disponivel())
+
+        # Linha nova encontrada pela FTS (o icontains não ignora acentos)
+        alvo = self._criar("Conciliação")
+        encontrados = busca.filtrar(ProcessamentoRPA.objects.all(), "conciliacao")
+        self.assertEqual([p.id for p in encontrados], [alvo.id])
+        self.assertGreater(encontrados[0].relevancia, 0)
+        self.assertIn(busca.TABELA_FTS, str(encontrados.query))
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 é específico do SQLite")
+    def test_usa_indice_fts(self):
+        self.assertTrue(busca.disponivel())
+        self.assertEqual(busca.consulta_fts5('erro "x" OR y*'), '"erro"* "x"* "OR"* "y"*')
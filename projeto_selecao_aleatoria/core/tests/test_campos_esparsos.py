@@ -0,0 +1,58 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+
+PESADOS = ('"dados_entrada"', '"resultado"', '"mensagem_erro"')
+
+
+class CamposEsparsosTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+        for i in range(3):
+            ProcessamentoRPA.objects.create(
+                user=self.user, tipo="docker_rpa", status="falha", mensagem_erro="erro " * 50,
+                dados_entrada={"linhas": list(range(100))}, resultado={"arquivos": [{"nome": f"SA_{i}.xlsx"}]},
+            )
+
+    def _listar(self, url, **params):
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.cliente.get(url, params)
+        self.assertEqual(resposta.status_code, 200, resposta.content)
+        sql = next(c["sql"] for c in consultas if 'FROM "core_processamentorpa"' in c["sql"])
+        return resposta, sql
+
+    def test_fields_limita_resposta_e_colunas(self):
+        """?fields= devolve só os campos pedidos e não lê as colunas pesadas"""
+        for url in ("/api/historico-rpa/", "/api/historico-rpa-filtro/", "/api/docker-historico/"):
+            resposta, sql = self._listar(url, fields="id,status,criado_em")
+            for item in resposta.data["results"]:
+                self.assertEqual(set(item), {"id", "status", "criado_em"})
+            self.assertFalse(any(coluna in sql for coluna in PESADOS), url)
+
+    def test_sem_fields_mantem_resposta(self):
+        """Sem ?fields= a resposta continua completa; só dados_entrada (não serializado) é adiado"""
+        resposta, sql = self._listar("/api/historico-rpa-filtro/")
+        self.assertEqual(resposta.data["results"][0]["mensagem_erro"], "erro " * 50)
+        self.assertIn('"resultado"', sql)
+        self.assertNotIn('"dados_entrada"', sql)
+
+    def test_campo_calculado_carrega_dependencia(self):
+        """arquivos_count lê o JSON resultado: a coluna é carregada quando o campo é pedido"""
+        resposta, sql = self._listar("/api/resultados/", fields="id,arquivos_count")
+        self.assertEqual([item["arquivos_count"] for item in resposta.data], [1, 1, 1])
+        self.assertIn('"resultado"', sql)
+
+        _, sql = self._listar("/api/resultados/", fields="id,status")
+        self.assertNotIn('"resultado"', sql)
+
+    def test_detalhe_nao_e_afetado(self):
+        processamento = ProcessamentoRPA.objects.first()
+        resposta = self.cliente.get(f"/api/docker-historico/{processamento.id}/", {"fields": "id,resultado"})
+        self.assertEqual(set(resposta.data), {"id", "resultado"})
+        self.assertEqual(resposta.data["resultado"], processamento.resultado)
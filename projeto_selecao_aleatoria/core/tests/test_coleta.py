@@ -0,0 +1,113 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.services.coleta import ColetorResultados, metadados_arquivo
+from core.views.processors.docker_processor import ExecucaoDocker
+
+
+class ColetorResultadosTest(SimpleTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.enviados = []
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _enviar(self, arq):
+        self.enviados.append(arq.name)
+        return {"nome": arq.name}
+
+    def test_envia_arquivo_estavel_durante_execucao(self):
+        """Arquivo com tamanho estável entre varreduras é enviado antes do fim"""
+        coletor = ColetorResultados(self.dir, "SA_*.xlsx", self._enviar, intervalo=0)
+        (self.dir / "SA_1.xlsx").write_bytes(b"abc")
+        (self.dir / "outro.txt").write_bytes(b"abc")
+
+        coletor._varrer()
+        self.assertEqual(self.enviados, [])
+        coletor._varrer()
+        self.assertEqual(self.enviados, ["SA_1.xlsx"])
+
+    def test_varredura_final_envia_pendentes_e_reenvia_alterados(self):
+        """Ao final, envia o que faltou e reenvia arquivos modificados após o envio"""
+        coletor = ColetorResultados(self.dir, "SA_*.xlsx", self._enviar, intervalo=0)
+        arq = self.dir / "SA_1.xlsx"
+        arq.write_bytes(b"abc")
+        coletor._varrer()
+        coletor._varrer()
+        arq.write_bytes(b"abcdef")
+        (self.dir / "SA_2.xlsx").write_bytes(b"x")
+
+        resultados = coletor.finalizar()
+
+        self.assertEqual(self.enviados, ["SA_1.xlsx", "SA_1.xlsx", "SA_2.xlsx"])
+        self.assertEqual([r["nome"] for r in resultados], ["SA_1.xlsx", "SA_2.xlsx"])
+
+    def test_envios_paralelos_de_varios_arquivos(self):
+        """Todos os arquivos do glob são enviados, não apenas o primeiro"""
+        for i in range(5):
+            (self.dir / f"SA_{i}.xlsx").write_bytes(b"x" * i)
+        coletor = ColetorResultados(self.dir, "SA_*.xlsx", self._enviar, intervalo=0, max_workers=3)
+
+        resultados = coletor.finalizar()
+
+        self.assertEqual(len(resultados), 5)
+        self.assertEqual(sorted(self.enviados), [f"SA_{i}.xlsx" for i in range(5)])
+
+    def test_falha_no_envio_fica_registrada_e_e_repetida(self):
+        """Erro no envio não tira o arquivo da lista: vira não enviado e a varredura final tenta de novo"""
+        falhas = {"SA_1.xlsx": 1, "SA_2.xlsx": 99}
+
+        def enviar(arq):
+            if falhas[arq.name]:
+                falhas[arq.name] -= 1
+                raise OSError("arquivo removido")
+            return {"nome": arq.name, "enviado": True}
+
+        (self.dir / "SA_1.xlsx").write_bytes(b"abc")
+        (self.dir / "SA_2.xlsx").write_bytes(b"abc")
+        coletor = ColetorResultados(self.dir, "SA_*.xlsx", enviar, intervalo=0, max_workers=1)
+        coletor._varrer()
+        coletor._varrer()
+
+        resultados = coletor.finalizar()
+
+        self.assertEqual([(r["nome"], r["enviado"]) for r in resultados], [("SA_1.xlsx", True), ("SA_2.xlsx", False)])
+        self.assertEqual(resultados[1]["erro"], "arquivo removido")
+
+    def test_enviar_resultado_sem_metadados(self):
+        """Arquivo que some antes dos metadados é registrado como não enviado, sem upload"""
+        execucao = mock.Mock(spec=ExecucaoDocker, s3_dir_key="p/", bucket_name="bucket")
+        resultado = ExecucaoDocker.enviar_resultado(execucao, self.dir / "SA_sumiu.xlsx")
+
+        self.assertEqual((resultado["nome"], resultado["enviado"]), ("SA_sumiu.xlsx", False))
+        self.assertIn("erro", resultado)
+        execucao.obter_s3.return_value.upload_file.assert_not_called()
+
+    def test_rejeita_glob_fora_do_diretorio(self):
+        """Padrões com .., separadores ou absolutos não chegam ao Path.glob"""
+        fora = self.dir / "fora.txt"
+        fora.write_bytes(b"segredo")
+        (self.dir / "saida").mkdir()
+        for padrao in ("../*.txt", "../../etc/*", "/etc/*", "sub/SA_*.xlsx", "..\\*.txt", "..", ""):
+            with self.assertRaises(ValueError, msg=padrao):
+                ColetorResultados(self.dir / "saida", padrao, self._enviar)
+
+    def test_metadados_arquivo(self):
+        """Calcula tamanho, content type e SHA-256"""
+        arq = self.dir / "SA_1.xlsx"
+        arq.write_bytes(b"abc")
+        meta = metadados_arquivo(arq)
+        self.assertEqual(meta["tamanho_bytes"], 3)
+        self.assertEqual(
+            meta["content_type"],
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
+        self.assertEqual(
+            meta["checksum_sha256"],
+            "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad",
+        )
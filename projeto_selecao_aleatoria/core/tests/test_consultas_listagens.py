@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import ContainerExecucao, ProcessamentoRPA, ResultadoProcessamento
+from core.serializers import ResultadoDownloadSerializer
+from core.services import registro_vivo
+from core.services.registro_vivo import RegistroVivo
+
+
+class ConsultasConstantesTest(TestCase):
+    """O número de consultas das listagens não depende da quantidade de linhas."""
+
+    def setUp(self):
+        # /api/rpa/ lê o registro vivo: sem TTL, toda requisição hidrata do banco
+        patcher = mock.patch.object(registro_vivo, "_registro", RegistroVivo(ttl=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user("admin", password="senha", is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+        self._criar(4)
+
+    def _criar(self, quantidade):
+        for i in range(quantidade):
+            tipo = "docker_rpa" if i % 2 else "planilha"
+            status = "pendente" if i % 4 == 3 else "concluido"
+            p = ProcessamentoRPA.objects.create(
+                user=self.user, tipo=tipo, status=status,
+                resultado={"arquivos": [{"nome": "a.xlsx"}, {"nome": "b.xlsx"}]} if i % 3 == 0 else None,
+            )
+            if tipo == "docker_rpa":
+                ContainerExecucao.objects.create(processamento=p, imagem="rpa:1", duracao_segundos=i)
+            if i % 3 == 1:
+                for nome in ("SA_1.xlsx", "SA_2.csv"):
+                    ResultadoProcessamento.objects.create(processamento=p, nome_arquivo=nome)
+
+    def _consultas(self, url, **params):
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.cliente.get(url, params)
+        self.assertEqual(resposta.status_code, 200, resposta.content)
+        return len(consultas), resposta
+
+    def _assert_constante(self, url):
+        poucas, primeira = self._consultas(url, page_size=2)
+        self._criar(12)
+        muitas, segunda = self._consultas(url, page_size=50)
+        self.assertEqual(poucas, muitas, f"{url}: {poucas} consultas com poucas linhas, {muitas} com muitas")
+        return primeira, segunda
+
+    def test_resultados(self):
+        _, resposta = self._assert_constante("/api/resultados/")
+        contagens = {item["id"]: item["arquivos_count"] for item in resposta.data}
+        for p in ProcessamentoRPA.objects.all():
+            esperado = p.resultados_associados.count() or (2 if p.resultado else 0)
+            self.assertEqual(contagens[str(p.id)], esperado)
+
+    def test_historico_filtro(self):
+        self._assert_constante("/api/historico-rpa-filtro/")
+
+    def test_historico_docker(self):
+        self._assert_constante("/api/docker-historico/")
+
+    def test_processamentos(self):
+        self._assert_constante("/api/processamentos/")
+
+    def test_ativos(self):
+        self._assert_constante("/api/rpa/")
+        self._assert_constante("/api/docker-rpa/")
+
+    def test_admin_por_usuario(self):
+        self._assert_constante(f"/api/usuarios/{self.user.id}/processamentos/")
+        self._assert_constante(f"/api/usuarios/{self.user.id}/processamentos/?tipo=docker_rpa")
+        self._assert_constante(f"/api/usuarios/{self.user.id}/docker-processamentos/")
+
+
+class ConsultasDetalheResultadosTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("admin", password="senha", is_staff=True)
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+        self.processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="planilha")
+        for i in range(5):
+            ResultadoProcessamento.objects.create(processamento=self.processamento, nome_arquivo=f"SA_{i}.xlsx")
+
+    def test_arquivos(self):
+        """Processamento e seus resultados em duas consultas, sem exists() separado"""
+        with self.assertNumQueries(2):
+            resposta = self.cliente.get(f"/api/resultados/{self.processamento.id}/arquivos/")
+        self.assertEqual(len(resposta.data["arquivos"]), 5)
+
+    def test_admin_resultados_e_detalhe(self):
+        base = f"/api/usuarios/{self.user.id}/processamentos/{self.processamento.id}/"
+        with self.assertNumQueries(3):  # usuário + processamento + prefetch
+            resposta = self.cliente.get(base + "resultados/")
+        self.assertEqual(len(resposta.data), 5)
+
+        with self.assertNumQueries(2):  # usuário + processamento com contagem anotada
+            resposta = self.cliente.get(base)
+        self.assertEqual(resposta.data["resultados_count"], 5)
+
+    def test_contagem_json_sem_consultas(self):
+        """Formato antigo é contado no próprio JSON"""
+        contar = ResultadoDownloadSerializer.contar_arquivos_resultado
+        self.assertEqual(contar({"container_info": {"resultado_arquivo": "SA.xlsx"}}), 1)
+        self.assertEqual(contar({"arquivos": [{}, {}, {}]}), 3)
+        self.assertEqual(contar(None), 0)
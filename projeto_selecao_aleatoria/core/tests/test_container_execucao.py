@@ -0,0 +1,68 @@
+import importlib
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ContainerExecucao, ProcessamentoRPA
+
+migracao = importlib.import_module("core.migrations.0012_containerexecucao")
+
+
+class ContainerExecucaoTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+
+    def _processamento(self, resultado, status="falha"):
+        return ProcessamentoRPA.objects.create(
+            user=self.user, tipo="docker_rpa", status=status, resultado=resultado
+        )
+
+    def test_backfill_le_os_dois_formatos(self):
+        """A migração copia container_info aninhado (falha) e no topo (sucesso)"""
+        falha = self._processamento({"container_info": {
+            "imagem": "rpa:1", "container_id": "abc", "exit_code": 2,
+            "container_iniciado": "2025-01-01T10:00:00", "duracao_segundos": 12.5,
+        }})
+        sucesso = self._processamento(
+            {"mensagem": "ok", "imagem": "rpa:2", "duracao_segundos": 30, "logs_s3": "s3://b/logs/"},
+            status="concluido",
+        )
+        sem_info = self._processamento({"mensagem": "sem container"})
+
+        migracao.preencher_containers(apps, None)
+
+        container = ContainerExecucao.objects.get(processamento=falha)
+        self.assertEqual((container.imagem, container.container_id, container.exit_code), ("rpa:1", "abc", 2))
+        self.assertEqual(container.duracao_segundos, 12.5)
+        self.assertIsNotNone(container.iniciado_em.tzinfo)
+        self.assertEqual(ContainerExecucao.objects.get(processamento=sucesso).logs_s3, "s3://b/logs/")
+        self.assertFalse(ContainerExecucao.objects.filter(processamento=sem_info).exists())
+
+    def test_historico_le_colunas_sem_consultas_extras(self):
+        """O histórico lê imagem/duração das colunas, com um JOIN em vez de uma consulta por linha"""
+        for i in range(3):
+            processamento = self._processamento({}, status="concluido")
+            ContainerExecucao.objects.create(
+                processamento=processamento, imagem=f"rpa:{i}", container_id=f"c{i}", duracao_segundos=i
+            )
+        self._processamento(None, status="pendente")
+        cliente = APIClient()
+        cliente.force_authenticate(self.user)
+
+        with self.assertNumQueries(1):  # página por cursor, sem COUNT
+            resposta = cliente.get("/api/docker-historico/")
+
+        itens = resposta.data["results"]
+        self.assertEqual(itens[0]["imagem"], "N/A")
+        self.assertEqual(itens[0]["tempo_execucao"], 0)
+        self.assertEqual({i["imagem"] for i in itens[1:]}, {"rpa:0", "rpa:1", "rpa:2"})
+
+    def test_atualizar_grava_apenas_colunas_informadas(self):
+        processamento = self._processamento(None, status="processando")
+        ContainerExecucao.objects.create(processamento=processamento, imagem="rpa:1")
+
+        self.assertEqual(ContainerExecucao.atualizar(processamento.id, container_id="abc"), 1)
+        info = ContainerExecucao.objects.get(processamento=processamento).como_container_info()
+        self.assertEqual(info, {"imagem": "rpa:1", "container_id": "abc"})
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+
+URL = "/api/historico-rpa-filtro/estatisticas/"
+
+
+class EstatisticasHistoricoTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+
+    def _criar(self, **campos):
+        return ProcessamentoRPA.objects.create(user=self.user, **campos)
+
+    def test_uma_consulta(self):
+        """Todo o payload sai de um único aggregate, independente do número de choices"""
+        self._criar(tipo="planilha", status="concluido", tempo_real=10)
+        with self.assertNumQueries(1):
+            resposta = self.cliente.get(URL)
+        self.assertEqual(resposta.status_code, 200)
+
+    def test_payload(self):
+        self._criar(tipo="planilha", status="concluido", tempo_real=10)
+        self._criar(tipo="planilha", status="concluido", tempo_real=15)
+        self._criar(tipo="planilha", status="concluido")  # sem tempo_real
+        self._criar(tipo="docker_rpa", status="falha", tempo_real=99)  # não entra na média
+        self._criar(tipo="docker_rpa", status="pendente")
+        ProcessamentoRPA.objects.create(
+            user=User.objects.create_user("outro", password="senha"), tipo="email", status="concluido"
+        )
+
+        resposta = self.cliente.get(URL)
+
+        self.assertEqual(resposta.data, {
+            "total_processamentos": 5,
+            "por_status": {"pendente": 1, "processando": 0, "concluido": 3, "falha": 1},
+            "por_tipo": {"planilha": 3, "docker_rpa": 2},
+            "tempo_medio": 12.5,
+            "taxa_sucesso": 60.0,
+        })
+        self.assertEqual(list(resposta.data["por_tipo"]), [
+            t for t, _ in ProcessamentoRPA.TIPO_CHOICES if t in ("planilha", "docker_rpa")
+        ])
+
+    def test_filtros_e_vazio(self):
+        """Filtros da listagem valem para as estatísticas; sem resultados, payload vazio"""
+        self._criar(tipo="planilha", status="falha")
+
+        self.assertEqual(self.cliente.get(URL, {"status": "concluido"}).data, {
+            "total_processamentos": 0,
+            "por_status": {},
+            "por_tipo": {},
+            "tempo_medio": None,
+            "taxa_sucesso": 0,
+        })
+        self.assertEqual(self.cliente.get(URL, {"com_erro": "true"}).data["taxa_sucesso"], 0.0)
@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+
+
+class EventosProcessamentoTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+
+    def test_evento_e_um_insert(self):
+        """Registrar um evento não regrava o processamento"""
+        with self.assertNumQueries(1) as contexto:
+            self.processamento.registrar_evento("container_iniciado", container_id="abc")
+        self.assertTrue(contexto.captured_queries[0]["sql"].startswith("INSERT"))
+
+    def test_dados_eventos_respeita_ordem(self):
+        """Eventos posteriores sobrescrevem os dados dos anteriores"""
+        self.processamento.registrar_evento("container_configurado", container_name="rpa", imagem="img")
+        self.processamento.registrar_evento("container_iniciado", container_id="abc", container_name="rpa-1")
+        self.processamento.registrar_evento("log_enviado", log_s3="s3://x")
+
+        dados = self.processamento.dados_eventos("container_configurado", "container_iniciado")
+        self.assertEqual(dados, {"container_name": "rpa-1", "imagem": "img", "container_id": "abc"})
+
+    def test_falhar_grava_resultado_na_transicao(self):
+        """Os metadados finais são gravados junto com o status de falha"""
+        self.processamento.iniciar_processamento()
+        self.assertTrue(self.processamento.falhar("erro", resultado={"container_info": {"exit_code": 1}}))
+
+        self.processamento.refresh_from_db()
+        self.assertEqual(self.processamento.status, "falha")
+        self.assertEqual(self.processamento.resultado, {"container_info": {"exit_code": 1}})
+
+    def test_linha_do_tempo_via_api(self):
+        """GET /eventos/ lista os eventos em ordem e só para o dono"""
+        self.processamento.registrar_evento("container_iniciado", container_id="abc")
+        self.processamento.registrar_evento("container_finalizado", exit_code=0)
+        cliente = APIClient()
+
+        cliente.force_authenticate(self.user)
+        resposta = cliente.get(f"/api/docker-rpa/{self.processamento.id}/eventos/")
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual([e["tipo"] for e in resposta.data], ["container_iniciado", "container_finalizado"])
+        self.assertEqual(resposta.data[1]["dados"], {"exit_code": 0})
+
+        cliente.force_authenticate(User.objects.create_user("outro", password="senha"))
+        resposta = cliente.get(f"/api/docker-rpa/{self.processamento.id}/eventos/")
+        self.assertEqual(resposta.status_code, 404)
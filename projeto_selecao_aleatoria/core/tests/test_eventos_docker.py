@@ -0,0 +1,109 @@
+import json
+import sys
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from core.services import eventos_docker
+from core.services.eventos_docker import LABEL_PROCESSAMENTO, OuvinteEventosDocker
+from core.services.logs.seguidor import SeguidorSaidas
+from core.views.processors.docker_processor import RPADockerProcessor
+
+
+def _evento(acao, processamento_id, container_id="c1", exit_code=None):
+    atributos = {LABEL_PROCESSAMENTO: processamento_id}
+    if exit_code is not None:
+        atributos["exitCode"] = str(exit_code)
+    return json.dumps({
+        "Type": "container", "Action": acao, "timeNano": 1,
+        "Actor": {"ID": container_id, "Attributes": atributos},
+    })
+
+
+@mock.patch.object(OuvinteEventosDocker, "iniciar")
+class OuvinteEventosDockerTest(SimpleTestCase):
+    def setUp(self):
+        self.chamadas = []
+        self.orfaos = []
+        self.ouvinte = OuvinteEventosDocker(
+            ao_orfao=lambda *args: self.orfaos.append(args), max_workers=1
+        )
+
+    def _aguardar(self):
+        self.ouvinte._pool.shutdown(wait=True)
+
+    def test_die_apos_oom_chama_tratador_uma_vez(self, _):
+        """Evento oom marca a falha por memória; die finaliza com o código de saída"""
+        self.ouvinte.acompanhar("p1", lambda *args: self.chamadas.append(args))
+        self.ouvinte.associar_container("p1", "c1")
+
+        self.ouvinte.tratar_linha(_evento("oom", "p1"))
+        self.ouvinte.tratar_linha(_evento("die", "p1", exit_code=137))
+        self.ouvinte.tratar_linha(_evento("die", "p1", exit_code=137))  # reprodução via --since
+        self._aguardar()
+
+        self.assertEqual(self.chamadas, [(137, True, "c1")])
+        self.assertEqual(self.orfaos, [("p1", 137, False, "c1")])
+
+    def test_evento_antes_da_associacao_fica_pendente(self, _):
+        """Die do container anterior é descartado; o do container atual é tratado"""
+        self.ouvinte.acompanhar("p1", lambda *args: self.chamadas.append(args))
+
+        self.ouvinte.tratar_linha(_evento("die", "p1", container_id="antigo", exit_code=1))
+        self.ouvinte.tratar_linha(_evento("die", "p1", container_id="novo", exit_code=0))
+        self.ouvinte.associar_container("p1", "novo")
+        self._aguardar()
+
+        self.assertEqual(self.chamadas, [(0, False, "novo")])
+
+    def test_ignora_eventos_sem_label(self, _):
+        self.ouvinte.tratar_linha(json.dumps({"Action": "die", "Actor": {"Attributes": {}}}))
+        self.ouvinte.tratar_linha("não é json")
+        self._aguardar()
+        self.assertEqual(self.orfaos, [])
+
+
+class InicializacaoOuvinteTest(SimpleTestCase):
+    @mock.patch.object(eventos_docker, "_ouvinte", None)
+    @mock.patch.object(RPADockerProcessor, "finalizar_orfao")
+    @mock.patch("core.services.eventos_docker.subprocess")
+    def test_reconcilia_orfaos_sem_novo_disparo(self, subprocess, finalizar_orfao):
+        """Na subida, containers encerrados durante o reinício são finalizados como órfãos"""
+        # `docker events` conectado e sem eventos (bloqueia até o fim do processo de testes)
+        subprocess.Popen.return_value.stdout = iter(threading.Event().wait, True)
+        subprocess.run.side_effect = [
+            mock.Mock(stdout="c1\n"),
+            mock.Mock(stdout="c1 p1 1 false\n"),
+        ]
+
+        RPADockerProcessor.iniciar_ouvinte()
+        ouvinte = eventos_docker.obter_ouvinte()
+        self.assertTrue(ouvinte._conectado.wait(5))
+        for _ in range(50):
+            if finalizar_orfao.called:
+                break
+            threading.Event().wait(0.1)
+
+        finalizar_orfao.assert_called_once_with("p1", 1, False, "c1")
+        comando = subprocess.run.call_args_list[0].args[0]
+        self.assertEqual(comando[:3], ["docker", "ps", "-aq"])
+
+
+class SeguidorSaidasTest(SimpleTestCase):
+    def test_varios_processos_em_uma_thread(self):
+        """Linhas de vários processos são entregues completas, inclusive a última sem quebra"""
+        seguidor = SeguidorSaidas()
+        recebidas = {0: [], 1: []}
+        terminados = [threading.Event(), threading.Event()]
+
+        for i in (0, 1):
+            codigo = f"import sys; print('a{i}'); print('b{i}', flush=True); sys.stdout.write('c{i}')"
+            seguidor.seguir(
+                [sys.executable, "-c", codigo], recebidas[i].append, terminados[i].set
+            )
+
+        for evento in terminados:
+            self.assertTrue(evento.wait(10))
+        self.assertEqual(recebidas[0], ["a0", "b0", "c0"])
+        self.assertEqual(recebidas[1], ["a1", "b1", "c1"])
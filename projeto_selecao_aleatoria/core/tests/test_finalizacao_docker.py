@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.models import ContainerExecucao, ProcessamentoRPA
+from core.views.processors.docker_processor import ExecucaoDocker, RPADockerProcessor
+
+
+class FinalizacaoUnicaTest(TestCase):
+    """O término do container é tratado uma única vez, mesmo com eventos repetidos."""
+
+    def setUp(self):
+        user = User.objects.create_user("usuario", password="senha")
+        self.processamento = ProcessamentoRPA.objects.create(user=user, tipo="docker_rpa")
+        self.processamento.iniciar_processamento()
+        ContainerExecucao.objects.create(processamento=self.processamento, container_id="c1")
+
+        # Execução do dono sem recursos reais (log, coletor, tail)
+        self.dono = mock.Mock(
+            spec=ExecucaoDocker, processamento=self.processamento, coletor=None, buffer_log="buffer"
+        )
+
+    @mock.patch("core.views.processors.docker_processor.encerrar_buffer")
+    @mock.patch.object(ExecucaoDocker, "recuperar")
+    def test_die_reproduzido_durante_finalizacao_do_dono(self, recuperar, _):
+        """Die reproduzido (--since/outro processo) enquanto o dono finaliza não faz nada"""
+        def encerrar_do_dono(exit_code, oom, container_id):
+            # Dono ainda finalizando (aguardando logs/uploads): chega o evento repetido
+            RPADockerProcessor.finalizar_orfao(str(self.processamento.id), exit_code, oom, container_id)
+
+        self.dono.encerrar.side_effect = encerrar_do_dono
+        ExecucaoDocker.finalizar(self.dono, 0, False, "c1")
+
+        self.dono.encerrar.assert_called_once_with(0, False, "c1")
+        recuperar.assert_not_called()
+
+    @mock.patch("core.views.processors.docker_processor.encerrar_buffer")
+    @mock.patch.object(ExecucaoDocker, "recuperar")
+    def test_dono_nao_finaliza_o_que_o_orfao_reservou(self, recuperar, encerrar_buffer):
+        """Reconciliação finalizou como órfão: o tratador do dono apenas libera o buffer"""
+        RPADockerProcessor.finalizar_orfao(str(self.processamento.id), 1, False, "c1")
+        recuperar.return_value.encerrar.assert_called_once_with(1, False, "c1")
+
+        ExecucaoDocker.finalizar(self.dono, 1, False, "c1")
+        self.dono.encerrar.assert_not_called()
+        encerrar_buffer.assert_called_once_with(self.dono.buffer_log)
+
+    def test_reserva_de_outro_container_e_reinicio(self):
+        self.assertFalse(ContainerExecucao.reivindicar_finalizacao(self.processamento.id, "antigo"))
+        self.assertTrue(ContainerExecucao.reivindicar_finalizacao(self.processamento.id, "c1"))
+        self.assertFalse(ContainerExecucao.reivindicar_finalizacao(self.processamento.id, "c1"))
+
+        # Reinício limpa finalizado_em (update_or_create em _processar): nova reserva possível
+        ContainerExecucao.atualizar(self.processamento.id, container_id="c2", finalizado_em=None)
+        self.assertTrue(ContainerExecucao.reivindicar_finalizacao(self.processamento.id, "c2"))
@@ -0,0 +1,163 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+from core.services.logs import (
+    EscritorLogCompactado, LeitorLogCompactado, abrir_leitor, diretorio_local, enviar_para_s3
+)
+
+
+class LogCompactadoTest(SimpleTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _gravar(self, n, linhas_por_bloco=10):
+        escritor = EscritorLogCompactado(self.dir, linhas_por_bloco=linhas_por_bloco)
+        for i in range(n):
+            escritor.escrever(f"linha {i} ✓")
+        escritor.fechar()
+        return escritor
+
+    def test_leitura_por_intervalo(self):
+        """Lê um intervalo que atravessa blocos"""
+        self._gravar(95)
+        linhas, total = LeitorLogCompactado.local(self.dir).ler(offset=8, limit=15)
+        self.assertEqual(total, 95)
+        self.assertEqual(linhas, [f"linha {i} ✓" for i in range(8, 23)])
+
+    def test_le_apenas_blocos_necessarios(self):
+        """Só os bytes dos blocos que cobrem o intervalo são lidos"""
+        self._gravar(1000)
+        leitor = LeitorLogCompactado.local(self.dir)
+        lidos = []
+        original = leitor._ler_intervalo
+        leitor._ler_intervalo = lambda i, f: lidos.append(f - i) or original(i, f)
+
+        linhas, _ = leitor.ler(offset=500, limit=5)
+
+        self.assertEqual(linhas[0], "linha 500 ✓")
+        self.assertLess(lidos[0], (self.dir / "stdout.log.z").stat().st_size / 50)
+
+    def test_linha_de_indice_incompleta_e_ignorada(self):
+        """Leitor concorrente ao escritor: linha final do índice ainda sem quebra não quebra a leitura"""
+        self._gravar(25)
+        with open(self.dir / "stdout.idx", "a", encoding="ascii") as f:
+            f.write("123 4")  # Bloco seguinte ainda sendo registrado
+        linhas, total = LeitorLogCompactado.local(self.dir).ler(offset=18, limit=10)
+        self.assertEqual(total, 25)
+        self.assertEqual(linhas, [f"linha {i} ✓" for i in range(18, 25)])
+
+    def test_bloco_parcial_gravado_apos_intervalo(self):
+        """Poucas linhas de um container em execução ficam legíveis sem fechar o log"""
+        escritor = EscritorLogCompactado(self.dir, intervalo_gravacao=0.05)
+        for i in range(3):
+            escritor.escrever(f"linha {i}")
+        self.assertFalse((self.dir / "stdout.idx").exists())
+
+        for _ in range(100):
+            if escritor.total_linhas:
+                break
+            time.sleep(0.02)
+        escritor.escrever("linha 3")  # Nova linha reinicia o temporizador
+        self.assertEqual(LeitorLogCompactado.local(self.dir).ler(), (["linha 0", "linha 1", "linha 2"], 3))
+
+        escritor.fechar()
+        self.assertEqual(LeitorLogCompactado.local(self.dir).ler()[1], 4)
+
+    def test_log_vazio_nao_e_enviado(self):
+        escritor = EscritorLogCompactado(self.dir)
+        escritor.fechar()
+        s3_client = mock.Mock()
+
+        self.assertIsNone(enviar_para_s3(escritor, s3_client, "bucket", "logs/"))
+        s3_client.upload_file.assert_not_called()
+
+    def test_intervalo_apos_o_fim(self):
+        self._gravar(5)
+        self.assertEqual(LeitorLogCompactado.local(self.dir).ler(offset=10), ([], 5))
+
+
+class LogsEndpointTest(TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_endpoint_logs(self):
+        """GET /api/docker-rpa/{id}/logs/ serve o trecho pedido, inclusive após concluir"""
+        with override_settings(RPA_LOG_DIR=self._tmp.name):
+            processamento = ProcessamentoRPA.objects.create(
+                user=self.user, tipo="docker_rpa", status="concluido"
+            )
+            escritor = EscritorLogCompactado(diretorio_local(processamento), linhas_por_bloco=3)
+            for i in range(7):
+                escritor.escrever(f"l{i}")
+            escritor.fechar()
+
+            resposta = self.client.get(f"/api/docker-rpa/{processamento.id}/logs/?offset=2&limit=3")
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data["linhas"], ["l2", "l3", "l4"])
+        self.assertEqual(resposta.data["total_linhas"], 7)
+        self.assertEqual(resposta.data["proximo_offset"], 5)
+
+    def test_endpoint_durante_execucao(self):
+        """Processamento em execução com menos linhas que um bloco já tem log"""
+        with override_settings(RPA_LOG_DIR=self._tmp.name, RPA_LOG_INTERVALO_GRAVACAO=0.05):
+            processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+            processamento.iniciar_processamento()
+            escritor = EscritorLogCompactado(diretorio_local(processamento))
+            escritor.escrever("Iniciando")
+            escritor.escrever("Sorteio 10%")
+            for _ in range(100):
+                if escritor.total_linhas:
+                    break
+                time.sleep(0.02)
+            resposta = self.client.get(f"/api/docker-rpa/{processamento.id}/logs/")
+            escritor.fechar()
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data["linhas"], ["Iniciando", "Sorteio 10%"])
+
+    def test_endpoint_log_vazio_apos_upload(self):
+        """Log vazio não grava logs_s3: o endpoint responde 404 em vez de procurar no S3"""
+        with override_settings(RPA_LOG_DIR=self._tmp.name):
+            processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa", status="concluido")
+            escritor = EscritorLogCompactado(diretorio_local(processamento))
+            escritor.fechar()
+            self.assertIsNone(enviar_para_s3(escritor, mock.Mock(), "bucket", "logs/"))
+            self.assertIsNone(abrir_leitor(processamento))
+            resposta = self.client.get(f"/api/docker-rpa/{processamento.id}/logs/")
+        self.assertEqual(resposta.status_code, 404)
+
+    def test_endpoint_sem_log(self):
+        with override_settings(RPA_LOG_DIR=self._tmp.name):
+            processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+            resposta = self.client.get(f"/api/docker-rpa/{processamento.id}/logs/")
+        self.assertEqual(resposta.status_code, 404)
+
+    def test_erro_de_leitura_nao_expoe_detalhes(self):
+        """Falha ao ler o log responde 502 com mensagem fixa (detalhes só no log do servidor)"""
+        with override_settings(RPA_LOG_DIR=self._tmp.name):
+            processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+            diretorio = diretorio_local(processamento)
+            diretorio.mkdir(parents=True)
+            (diretorio / "stdout.idx").write_text("corrompido x\n", encoding="ascii")
+            resposta = self.client.get(f"/api/docker-rpa/{processamento.id}/logs/")
+
+        self.assertEqual(resposta.status_code, 502)
+        self.assertEqual(resposta.data["detail"], "Erro ao ler o log deste processamento.")
@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+
+URL = "/api/historico-rpa-filtro/"
+
+
+class PaginacaoCursorTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+        agora = timezone.now()
+        # Empates em criado_em e tempo_real nulo em parte das linhas
+        for i in range(23):
+            p = ProcessamentoRPA.objects.create(
+                user=self.user, tipo="planilha", status="concluido",
+                tempo_real=None if i % 3 == 0 else i % 5,
+            )
+            ProcessamentoRPA.objects.filter(id=p.id).update(criado_em=agora - timedelta(minutes=i // 4))
+
+    def _percorrer(self, url, params):
+        ids, paginas = [], []
+        resposta = self.cliente.get(url, params)
+        while True:
+            self.assertEqual(resposta.status_code, 200)
+            paginas.append(resposta.data)
+            ids += [item["id"] for item in resposta.data["results"]]
+            if not resposta.data["next"]:
+                return ids, paginas
+            resposta = self.cliente.get(resposta.data["next"])
+
+    def test_percorre_sem_repetir_nem_pular(self):
+        """Avançar pelo cursor devolve cada linha uma vez, na ordem (criado_em, id) decrescente"""
+        ids, paginas = self._percorrer(URL, {"page_size": 5})
+
+        esperado = list(
+            ProcessamentoRPA.objects.order_by("-criado_em", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, [str(i) for i in esperado])
+        self.assertEqual(len(paginas), 5)
+        self.assertNotIn("count", paginas[0])
+
+    def test_ordenacao_por_campo_nulo(self):
+        """Ordenação da view (tempo_real, com nulos) é respeitada pelo cursor"""
+        ids, _ = self._percorrer(URL, {"page_size": 4, "ordering": "tempo_real"})
+
+        processamentos = {str(p.id): p for p in ProcessamentoRPA.objects.all()}
+        chaves = [
+            (processamentos[i].tempo_real is None, processamentos[i].tempo_real or 0, str(i)) for i in ids
+        ]
+        self.assertEqual(len(set(ids)), 23)
+        self.assertEqual(chaves, sorted(chaves))
+
+    def test_pagina_anterior(self):
+        primeira = self.cliente.get(URL, {"page_size": 5}).data
+        segunda = self.cliente.get(primeira["next"]).data
+        terceira = self.cliente.get(segunda["next"]).data
+
+        volta = self.cliente.get(terceira["previous"]).data
+        self.assertEqual(volta["results"], segunda["results"])
+        inicio = self.cliente.get(volta["previous"]).data
+        self.assertEqual(inicio["results"], primeira["results"])
+        self.assertIsNone(inicio["previous"])
+
+    def test_consulta_unica_e_cursor_invalido(self):
+        primeira = self.cliente.get(URL, {"page_size": 5}).data
+        with self.assertNumQueries(1):
+            self.cliente.get(primeira["next"])
+        self.assertEqual(self.cliente.get(URL, {"cursor": "invalido"}).status_code, 404)
+
+    def test_modo_compativel(self):
+        """?paginacao=pagina mantém page/count; a listagem administrativa volta a ser uma lista"""
+        resposta = self.cliente.get(URL, {"paginacao": "pagina", "page": 3, "page_size": 10}).data
+        self.assertEqual(resposta["count"], 23)
+        self.assertEqual(len(resposta["results"]), 3)
+
+        admin = User.objects.create_superuser("admin", password="senha")
+        self.cliente.force_authenticate(admin)
+        url_admin = f"/api/usuarios/{self.user.id}/processamentos/"
+        self.assertEqual(len(self.cliente.get(url_admin, {"paginacao": "pagina"}).data), 23)
+        self.assertEqual(len(self.cliente.get(url_admin).data["results"]), 10)
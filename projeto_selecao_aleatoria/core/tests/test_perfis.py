@@ -0,0 +1,89 @@
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from core.models import PerfilExecucao, ProcessamentoRPATemplate
+from core.services import perfis
+
+
+class PerfisExecucaoTest(TestCase):
+    def setUp(self):
+        perfis.invalidar()
+
+    def _proc(self, tipo="docker_rpa", template_id=None):
+        return SimpleNamespace(tipo=tipo, template_id=template_id)
+
+    def test_sem_perfil_usa_padrao(self):
+        """Sem perfis cadastrados, mantém imagem e comando históricos"""
+        perfil = perfis.resolver(self._proc())
+        self.assertEqual(perfil.imagem, "selecao_aleatoria:v3.1")
+        self.assertEqual(perfil.comando, "python -u main.py")
+        self.assertEqual(perfil.marcador_para_linha("Upload concluído!"), (90, "upload"))
+
+    def test_template_tem_precedencia_sobre_tipo(self):
+        """Perfil do template vence o perfil do tipo"""
+        PerfilExecucao.objects.create(nome="por-tipo", tipo="docker_rpa", imagem="img:tipo")
+        especial = PerfilExecucao.objects.create(nome="especial", imagem="img:especial")
+        template = ProcessamentoRPATemplate.objects.create(tipo="planilha", perfil=especial)
+
+        self.assertEqual(perfis.resolver(self._proc()).imagem, "img:tipo")
+        self.assertEqual(perfis.resolver(self._proc(template_id=template.id)).imagem, "img:especial")
+
+    def test_cache_evita_consultas_e_recarrega_apos_save(self):
+        """Após carregar, resolver não consulta o banco até um perfil mudar"""
+        perfil = PerfilExecucao.objects.create(nome="etl", tipo="docker_rpa", imagem="img:1")
+        perfis.resolver(self._proc())
+
+        with self.assertNumQueries(0):
+            self.assertEqual(perfis.resolver(self._proc()).imagem, "img:1")
+
+        perfil.imagem = "img:2"
+        perfil.save()
+        self.assertEqual(perfis.resolver(self._proc()).imagem, "img:2")
+
+    def _depois_do_intervalo(self):
+        return mock.patch("core.services.perfis.time.monotonic", return_value=time.monotonic() + 3600)
+
+    def test_mudanca_em_outro_processo_percebida_apos_intervalo(self):
+        """Sem sinal neste processo, o registro é recarregado após o intervalo"""
+        perfil = PerfilExecucao.objects.create(nome="etl", tipo="docker_rpa", imagem="img:1")
+        perfis.resolver(self._proc())
+
+        # Alteração feita por outro processo: nenhum sinal chega aqui
+        PerfilExecucao.objects.filter(id=perfil.id).update(imagem="img:2")
+        self.assertEqual(perfis.resolver(self._proc()).imagem, "img:1")  # Dentro do intervalo
+
+        with self._depois_do_intervalo():
+            self.assertEqual(perfis.resolver(self._proc()).imagem, "img:2")
+
+    def test_update_sem_atualizado_em(self):
+        """update() não toca auto_now: desativar um perfil em massa ainda é percebido"""
+        perfil = PerfilExecucao.objects.create(nome="etl", tipo="docker_rpa", imagem="img:1")
+        especial = PerfilExecucao.objects.create(nome="especial", imagem="img:especial")
+        template = ProcessamentoRPATemplate.objects.create(tipo="planilha", perfil=especial)
+        perfis.resolver(self._proc())
+        atualizado_em = perfil.atualizado_em
+
+        PerfilExecucao.objects.filter(id=perfil.id).update(ativo=False)
+        ProcessamentoRPATemplate.objects.filter(id=template.id).update(perfil=None)
+        self.assertEqual(PerfilExecucao.objects.get(id=perfil.id).atualizado_em, atualizado_em)
+
+        with self._depois_do_intervalo():
+            self.assertEqual(perfis.resolver(self._proc()).imagem, "selecao_aleatoria:v3.1")
+            self.assertEqual(perfis.resolver(self._proc(template_id=template.id)).imagem, "selecao_aleatoria:v3.1")
+
+    def test_argumentos_limites(self):
+        perfil = PerfilExecucao(limites={"cpus": "1.5", "memoria": "1g"})
+        self.assertEqual(perfil.argumentos_limites(), ["--cpus", "1.5", "--memory", "1g"])
+
+    def test_output_glob_restrito_ao_diretorio_de_saida(self):
+        perfil = PerfilExecucao(nome="etl", output_glob="../../*.txt")
+        with self.assertRaises(ValidationError) as erro:
+            perfil.full_clean()
+        self.assertIn("output_glob", erro.exception.message_dict)
+
+        perfil.output_glob = "Resultado_*.csv"
+        perfil.full_clean()
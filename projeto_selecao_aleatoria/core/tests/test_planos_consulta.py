@@ -0,0 +1,117 @@
+"""
+Planos de execução das consultas dos endpoints de listagem.
+
+Cada endpoint é chamado sobre uma massa com vários usuários; as consultas
+executadas são capturadas e passadas por `EXPLAIN QUERY PLAN`. O teste
+falha se alguma varrer por completo uma das tabelas grandes.
+"""
+
+import re
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ContainerExecucao, ProcessamentoEvento, ProcessamentoRPA
+
+USUARIOS = 20
+POR_USUARIO = 150
+TABELAS_GRANDES = (
+    ProcessamentoRPA._meta.db_table,
+    ContainerExecucao._meta.db_table,
+    ProcessamentoEvento._meta.db_table,
+)
+VARREDURA = re.compile(rf"^SCAN (TABLE )?({'|'.join(TABELAS_GRANDES)})\b")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN é específico do SQLite")
+class PlanosConsultaTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        tipos = ["docker_rpa", "planilha", "email"]
+        status = ["concluido", "concluido", "falha", "pendente", "processando"]
+        usuarios = [User.objects.create_user(f"usuario{i}") for i in range(USUARIOS)]
+        processamentos, containers = [], []
+        for usuario in usuarios:
+            for i in range(POR_USUARIO):
+                processamento = ProcessamentoRPA(
+                    user=usuario, tipo=tipos[i % 3], status=status[i % 5], descricao=f"job {i}"
+                )
+                processamentos.append(processamento)
+                if processamento.tipo == "docker_rpa":
+                    containers.append(ContainerExecucao(
+                        processamento=processamento, imagem=f"rpa:{i % 4}", duracao_segundos=i
+                    ))
+        ProcessamentoRPA.objects.bulk_create(processamentos)
+        ContainerExecucao.objects.bulk_create(containers)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.user = usuarios[0]
+        cls.admin = User.objects.create_superuser("admin", password="senha")
+
+    def setUp(self):
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+
+    def _consultas(self, url, params=None):
+        """Executa o endpoint e devolve as consultas (sql, params) feitas nele."""
+        capturadas = []
+
+        def capturar(execute, sql, params, many, context):
+            capturadas.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capturar):
+            resposta = self.cliente.get(url, params or {})
+        self.assertEqual(resposta.status_code, 200, url)
+        return resposta, [(sql, p) for sql, p in capturadas if sql.lstrip().upper().startswith("SELECT")]
+
+    @staticmethod
+    def _plano(sql, parametros):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)
+            return [linha[-1] for linha in cursor.fetchall()]
+
+    def assertSemVarredura(self, url, params=None):
+        resposta, consultas = self._consultas(url, params)
+        self.assertTrue(consultas, url)
+        for sql, parametros in consultas:
+            plano = self._plano(sql, parametros)
+            varreduras = [passo for passo in plano if VARREDURA.match(passo)]
+            self.assertFalse(varreduras, f"{url} {params or ''}\n{sql}\n" + "\n".join(plano))
+        return resposta
+
+    def test_detecta_varredura(self):
+        """Sanidade: uma consulta sem índice aplicável é reconhecida como varredura"""
+        sql, parametros = ProcessamentoRPA.objects.filter(descricao="job 1").query.sql_with_params()
+        self.assertTrue(any(VARREDURA.match(passo) for passo in self._plano(sql, parametros)))
+
+    def test_historico_filtro(self):
+        url = "/api/historico-rpa-filtro/"
+        primeira = self.assertSemVarredura(url)
+        self.assertSemVarredura(primeira.data["next"])
+        self.assertSemVarredura(url, {"status": "falha"})
+        self.assertSemVarredura(url, {"tipo": "planilha"})
+        self.assertSemVarredura(url, {"busca": "job"})
+        self.assertSemVarredura(url, {"paginacao": "pagina", "page": 3})
+        self.assertSemVarredura(f"{url}estatisticas/")
+        self.assertSemVarredura(f"{url}estatisticas/", {"status": "concluido"})
+        self.assertSemVarredura(f"{url}resumo_diario/")
+
+    def test_historico_docker(self):
+        url = "/api/docker-historico/"
+        primeira = self.assertSemVarredura(url)
+        self.assertSemVarredura(primeira.data["next"])
+        self.assertSemVarredura(url, {"status": "concluido"})
+        self.assertSemVarredura(f"{url}resumo/")
+
+    def test_ativos(self):
+        self.assertSemVarredura("/api/docker-rpa/ativos/")
+
+    def test_admin_por_usuario(self):
+        self.cliente.force_authenticate(self.admin)
+        self.assertSemVarredura(f"/api/usuarios/{self.user.id}/processamentos/")
+        self.assertSemVarredura(f"/api/usuarios/{self.user.id}/processamentos/", {"status": "falha"})
+        self.assertSemVarredura(f"/api/usuarios/{self.user.id}/docker-processamentos/")
@@ -0,0 +1,98 @@
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from config.rpa_scripts.script2 import rpa_processamento_massa as massa
+from config.rpa_scripts.script2.rpa_processamento_massa import (
+    ArquivoCheckpoint, DockerRPAProcessor, faixas_pendentes,
+)
+
+
+class ArquivoCheckpointTest(SimpleTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.caminho = os.path.join(self._tmp.name, "checkpoint.jsonl")
+        self.checkpoint = ArquivoCheckpoint(self.caminho)
+
+    def test_retoma_itens_concluidos(self):
+        """Itens gravados em uma execução anterior são recarregados"""
+        for item_id in (3, 1, 2):
+            self.checkpoint.registrar(item_id, {"id": item_id, "sucesso": True})
+        self.assertEqual(ArquivoCheckpoint(self.caminho).carregar(), {
+            1: {"id": 1, "sucesso": True}, 2: {"id": 2, "sucesso": True}, 3: {"id": 3, "sucesso": True},
+        })
+
+    def test_ultima_linha_truncada_e_ignorada_e_nao_mesclada(self):
+        """Linha incompleta da execução interrompida é descartada; o próximo registro começa em nova linha"""
+        self.checkpoint.registrar(1, {"ok": 1})
+        with open(self.caminho, "a", encoding="utf-8") as f:
+            f.write('{"id": 2, "resul')  # Interrompido no meio da gravação
+        self.assertEqual(self.checkpoint.carregar(), {1: {"ok": 1}})
+
+        self.checkpoint.registrar(3, {"ok": 3})
+        with open(self.caminho, encoding="utf-8") as f:
+            linhas = f.read().splitlines()
+        self.assertEqual(linhas[1], '{"id": 2, "resul')
+        self.assertEqual(self.checkpoint.carregar(), {1: {"ok": 1}, 3: {"ok": 3}})
+
+    def test_linhas_que_nao_sao_objetos(self):
+        with open(self.caminho, "w", encoding="utf-8") as f:
+            f.write('5\n[1, 2]\nnull\n{"id": "x", "resultado": 1}\n{"id": 4, "resultado": 4}\n')
+        self.assertEqual(self.checkpoint.carregar(), {4: 4})
+
+    def test_arquivo_inexistente(self):
+        self.assertEqual(self.checkpoint.carregar(), {})
+
+
+class FaixasPendentesTest(SimpleTestCase):
+    def _itens(self, faixas):
+        return [i for inicio, quantidade in faixas for i in range(inicio, inicio + quantidade)]
+
+    def test_sem_concluidos(self):
+        self.assertEqual(faixas_pendentes(12, {}, 5), [(1, 5), (6, 5), (11, 2)])
+
+    def test_retomada_com_faixas_concluidas(self):
+        """Faixas já concluídas são puladas; lacunas viram faixas próprias"""
+        concluidos = set(range(1, 6)) | {8, 9}
+        self.assertEqual(faixas_pendentes(12, concluidos, 5), [(6, 2), (10, 3)])
+        self.assertEqual(faixas_pendentes(5, set(range(1, 6)), 5), [])
+
+    def test_concluidos_sobrepostos_e_fora_de_ordem(self):
+        """Ids repetidos, fora de ordem ou além do total não alteram a divisão"""
+        concluidos = {}
+        for item_id in (9, 2, 3, 2, 15, 9, 4, 0):  # Lotes reexecutados gravam o mesmo item de novo
+            concluidos[item_id] = {}
+        faixas = faixas_pendentes(10, concluidos, 3)
+
+        self.assertEqual(faixas, [(1, 1), (5, 3), (8, 1), (10, 1)])
+        self.assertEqual(self._itens(faixas), [1, 5, 6, 7, 8, 10])
+        self.assertTrue(all(quantidade <= 3 for _, quantidade in faixas))
+
+
+class ProcessarLoteTest(SimpleTestCase):
+    def _popen(self, saida):
+        processo = mock.Mock(stdout=io.StringIO(saida), stderr=io.StringIO(""))
+        processo.poll.return_value = 0
+        processo.wait.return_value = 0
+        return processo
+
+    def test_linha_malformada_nao_aborta_o_lote(self):
+        """Resultado que não é objeto JSON é descartado; os demais itens do lote seguem"""
+        saida = "\n".join([
+            'resultado:{"id": 1, "sucesso": true}',
+            "resultado:[1, 2]",
+            "resultado:null",
+            'resultado:{"id": "abc"}',
+            "resultado:{quebrado",
+            'resultado:{"id": 2, "sucesso": true}',
+        ]) + "\n"
+        processador = DockerRPAProcessor("imagem")
+        with mock.patch.object(massa.subprocess, "Popen", return_value=self._popen(saida)), \
+                mock.patch("builtins.print"):
+            resultados = processador.processar_lote(1, 2)
+
+        self.assertEqual([r["id"] for r in resultados], [1, 2])
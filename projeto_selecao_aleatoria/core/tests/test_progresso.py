@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TestCase
+
+from core.models import ProcessamentoRPA
+from core.services.progresso import EscritorProgresso
+
+
+class EscritorProgressoTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        # Intervalo longo: as gravações do teste são feitas explicitamente com flush()
+        self.escritor = EscritorProgresso(intervalo_ms=60000)
+        patcher = mock.patch("core.models.obter_escritor", return_value=self.escritor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _processamento(self, status="processando", progresso=0):
+        return ProcessamentoRPA.objects.create(
+            user=self.user, tipo="docker_rpa", status=status, progresso=progresso
+        )
+
+    def test_descarta_repetidos_e_regressoes_sem_consultas(self):
+        """Marcadores repetidos ou menores não geram escrita nem voltam o progresso"""
+        processamento = self._processamento()
+        with self.assertNumQueries(0):
+            for valor in (10, 10, 30, 20, 30):
+                processamento.atualizar_progresso(valor)
+        self.assertEqual(processamento.progresso, 30)
+
+        self.escritor.flush()
+        processamento.refresh_from_db()
+        self.assertEqual(processamento.progresso, 30)
+
+    def test_flush_grava_varios_jobs_em_uma_transacao(self):
+        """Valores pendentes de vários processamentos vão para o banco juntos"""
+        a, b = self._processamento(), self._processamento()
+        concluido = self._processamento(status="concluido", progresso=100)
+        a.atualizar_progresso(40)
+        b.atualizar_progresso(70)
+        self.escritor.registrar(concluido.id, 50)
+
+        with mock.patch("core.services.progresso.transaction.atomic", wraps=transaction.atomic) as atomic:
+            self.assertEqual(self.escritor.flush(), 3)
+        atomic.assert_called_once()
+
+        self.assertEqual(
+            dict(ProcessamentoRPA.objects.values_list("id", "progresso")),
+            {a.id: 40, b.id: 70, concluido.id: 100},
+        )
+
+    def test_estado_terminal_descarta_pendente(self):
+        """Após falhar, um valor pendente não é gravado depois do status final"""
+        processamento = self._processamento()
+        processamento.atualizar_progresso(60)
+        processamento.falhar("erro")
+
+        self.assertEqual(self.escritor.flush(), 0)
+        processamento.refresh_from_db()
+        self.assertEqual((processamento.status, processamento.progresso), ("falha", 60))
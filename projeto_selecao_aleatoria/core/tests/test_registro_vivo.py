@@ -0,0 +1,166 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+from core.services import registro_vivo
+from core.services.progresso import EscritorProgresso
+from core.services.registro_vivo import RegistroVivo
+
+
+class RegistroVivoApiTest(TestCase):
+    def setUp(self):
+        # Registro e escritor isolados por teste (ids de usuário podem se repetir)
+        patcher = mock.patch.object(registro_vivo, "_registro", RegistroVivo(ttl=60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("core.models.obter_escritor", return_value=EscritorProgresso(intervalo_ms=60000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _docker(self, **kwargs):
+        return ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa", **kwargs)
+
+    def test_retrieve_de_ativo_nao_consulta_banco(self):
+        """Processamento iniciado neste processo é lido do registro, com progresso atual"""
+        processamento = self._docker()
+        processamento.iniciar_processamento()
+        processamento.atualizar_progresso(40)
+        registro_vivo.obter_registro().atualizar(processamento.id, fase="Sorteio")
+
+        with self.assertNumQueries(0):
+            resposta = self.client.get(f"/api/rpa/{processamento.id}/")
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data["status"], "processando")
+        self.assertEqual(resposta.data["progresso"], 40)
+        self.assertEqual(resposta.data["fase"], "Sorteio")
+
+    def test_retrieve_encerrado_e_de_outro_usuario(self):
+        """Encerrados vêm do banco; processamentos de outros usuários não são expostos"""
+        processamento = self._docker()
+        processamento.iniciar_processamento()
+        processamento.concluir({})
+        resposta = self.client.get(f"/api/rpa/{processamento.id}/")
+        self.assertEqual((resposta.status_code, resposta.data["status"]), (200, "concluido"))
+        self.assertIsNone(resposta.data["fase"])
+
+        outro = User.objects.create_user("outro", password="senha")
+        alheio = ProcessamentoRPA.objects.create(user=outro, tipo="docker_rpa")
+        self.assertEqual(self.client.get(f"/api/rpa/{alheio.id}/").status_code, 404)
+        self.assertEqual(self.client.get("/api/rpa/nao-e-uuid/").status_code, 404)
+
+    def test_local_encerrado_em_outro_processo_expira_pelo_ttl(self):
+        """Registro criado neste processo não fica 'processando' para sempre"""
+        processamento = self._docker()
+        processamento.iniciar_processamento()
+        url = f"/api/rpa/{processamento.id}/"
+        # Finalizado por outro processo (ex.: como órfão): nenhum sinal chega aqui
+        ProcessamentoRPA.objects.filter(id=processamento.id).update(status="concluido", progresso=100)
+        self.assertEqual(self.client.get(url).data["status"], "processando")
+
+        depois_do_ttl = time.monotonic() + 120
+        with mock.patch("core.services.registro_vivo.time.monotonic", return_value=depois_do_ttl):
+            self.assertEqual(self.client.get(url).data["status"], "concluido")
+            resposta = self.client.get(url + "aguardar/?status=processando&timeout=0")
+            self.assertTrue(resposta.data["alterado"])
+            self.assertEqual(self.client.get("/api/rpa/").data["count"], 0)
+
+    def test_execucao_viva_mantem_registro_sem_ttl(self):
+        """Processamento acompanhado por uma execução deste processo não expira nem é hidratado"""
+        processamento = self._docker()
+        processamento.iniciar_processamento()
+        registro = registro_vivo.obter_registro()
+        registro.acompanhar(processamento.id)
+        registro.atualizar(processamento.id, progresso=70)
+
+        depois_do_ttl = time.monotonic() + 120
+        with mock.patch("core.services.registro_vivo.time.monotonic", return_value=depois_do_ttl):
+            with self.assertNumQueries(0):
+                resposta = self.client.get(f"/api/rpa/{processamento.id}/")
+            self.assertEqual(resposta.data["progresso"], 70)
+            registro.hidratar_usuario(self.user.id, [])
+            self.assertIsNotNone(registro.obter(processamento.id, self.user.id))
+
+        registro.liberar(processamento.id)
+        with mock.patch("core.services.registro_vivo.time.monotonic", return_value=depois_do_ttl):
+            self.assertIsNone(registro.obter(processamento.id, self.user.id))
+
+    def test_ativos_hidrata_uma_vez_por_ttl(self):
+        """A lista de ativos consulta o banco uma vez e depois é servida da memória"""
+        antigo = self._docker()
+        self._docker(status="concluido")
+        ProcessamentoRPA.objects.create(user=self.user, tipo="planilha")
+        # Simula processamentos criados por outro processo (fora do registro)
+        registro_vivo.obter_registro()._estados.clear()
+
+        with self.assertNumQueries(1):
+            primeira = self.client.get("/api/docker-rpa/ativos/")
+        novo = self._docker()
+        with self.assertNumQueries(0):
+            segunda = self.client.get("/api/docker-rpa/ativos/")
+
+        self.assertEqual([p["id"] for p in primeira.data], [str(antigo.id)])
+        self.assertEqual([p["id"] for p in segunda.data], [str(novo.id), str(antigo.id)])
+
+    def test_aguardar_responde_na_mudanca(self):
+        """Long-poll bloqueia até a notificação de mudança e devolve o novo estado"""
+        processamento = self._docker()
+        processamento.iniciar_processamento()
+        url = f"/api/rpa/{processamento.id}/aguardar/?progresso=0&status=processando&timeout=5"
+
+        atualizacao = threading.Timer(
+            0.2, lambda: registro_vivo.obter_registro().atualizar(processamento.id, progresso=30)
+        )
+        atualizacao.start()
+        inicio = time.monotonic()
+        resposta = self.client.get(url)
+        atualizacao.join()
+
+        self.assertLess(time.monotonic() - inicio, 4)
+        self.assertEqual((resposta.data["progresso"], resposta.data["alterado"]), (30, True))
+
+    def test_aguardar_retorna_imediatamente_ou_no_timeout(self):
+        processamento = self._docker()
+        processamento.iniciar_processamento()
+        base = f"/api/rpa/{processamento.id}/aguardar/"
+
+        with self.assertNumQueries(0):
+            resposta = self.client.get(base + "?progresso=10&status=processando")
+        self.assertTrue(resposta.data["alterado"])
+
+        resposta = self.client.get(base + "?progresso=0&status=processando&timeout=0.1")
+        self.assertFalse(resposta.data["alterado"])
+        self.assertEqual(self.client.get(base + "?timeout=x").status_code, 400)
+
+    def test_status_em_lote_uma_consulta(self):
+        """Vários ids são resolvidos com uma única consulta, na ordem pedida"""
+        processamentos = [self._docker() for _ in range(5)]
+        processamentos[0].iniciar_processamento()
+        processamentos[0].concluir({})
+        processamentos[1].iniciar_processamento()
+        alheio = ProcessamentoRPA.objects.create(
+            user=User.objects.create_user("outro", password="senha"), tipo="docker_rpa"
+        )
+        # Somente o processamento iniciado continua no registro local
+        registro_vivo.obter_registro()._estados = {
+            str(processamentos[1].id): registro_vivo.obter_registro()._estados[str(processamentos[1].id)]
+        }
+        ids = [str(p.id) for p in reversed(processamentos)] + [str(alheio.id), "invalido"]
+
+        with self.assertNumQueries(1):
+            resposta = self.client.post("/api/rpa/status/", {"ids": ids}, format="json")
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual([p["id"] for p in resposta.data["processamentos"]], ids[:5])
+        self.assertEqual(resposta.data["processamentos"][-1]["status"], "concluido")
+        self.assertEqual(resposta.data["nao_encontrados"], [str(alheio.id), "invalido"])
+        self.assertEqual(self.client.post("/api/rpa/status/", {"ids": "x"}, format="json").status_code, 400)
@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.models import ProcessamentoRPA, ResultadoProcessamento
+
+
+class ConcluirResultadosTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+
+    def test_concluir_cria_um_resultado_por_arquivo(self):
+        """Cada arquivo coletado vira um ResultadoProcessamento com metadados"""
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+        processamento.iniciar_processamento()
+
+        with self.assertNumQueries(3):  # UPDATE do processamento + UPDATE do resumo diário + um único INSERT
+            processamento.concluir({
+                "arquivos": [
+                    {"nome": "SA_1.xlsx", "caminho": "s3://b/SA_1.xlsx", "tamanho_bytes": 10,
+                     "content_type": "application/x", "checksum_sha256": "a" * 64},
+                    {"nome": "SA_2.csv", "caminho": "s3://b/SA_2.csv", "tamanho_bytes": 20},
+                ],
+            })
+
+        resultados = {r.nome_arquivo: r for r in processamento.resultados}
+        self.assertEqual(set(resultados), {"SA_1.xlsx", "SA_2.csv"})
+        self.assertEqual(resultados["SA_1.xlsx"].tamanho_bytes, 10)
+        self.assertEqual(resultados["SA_1.xlsx"].checksum_sha256, "a" * 64)
+        self.assertEqual(resultados["SA_1.xlsx"].tipo_resultado, "arquivo_excel")
+        self.assertEqual(resultados["SA_2.csv"].tipo_resultado, "arquivo_csv")
+
+    def test_concluir_formato_antigo(self):
+        """resultado_arquivo único continua gerando um registro"""
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+        processamento.iniciar_processamento()
+        processamento.concluir({"resultado_arquivo": "SA_1.xlsx", "caminho_arquivo": "s3://b/k"})
+        self.assertEqual(ResultadoProcessamento.objects.filter(processamento=processamento).count(), 1)
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA, ResumoDiarioUsuario
+from core.services.resumo_diario import reconstruir
+
+
+class ResumoDiarioTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+
+    def _resumo(self, tipo="docker_rpa"):
+        return ResumoDiarioUsuario.objects.get(user=self.user, dia=timezone.localdate(), tipo=tipo)
+
+    def _snapshot(self):
+        return sorted(
+            ResumoDiarioUsuario.objects.values_list(
+                "user_id", "dia", "tipo", "pendente", "processando", "concluido", "falha",
+                "tempo_real_soma", "tempo_real_qtd",
+            )
+        )
+
+    def test_transicoes_movem_contagens(self):
+        """Criação, início, conclusão e reinício mantêm o resumo igual ao recalculado"""
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+        ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+        self.assertEqual((self._resumo().pendente, self._resumo().processando), (2, 0))
+
+        processamento.iniciar_processamento()
+        processamento.iniciado_em -= timedelta(seconds=30)
+        ProcessamentoRPA.objects.filter(id=processamento.id).update(iniciado_em=processamento.iniciado_em)
+        processamento.concluir({"ok": True})
+        resumo = self._resumo()
+        self.assertEqual((resumo.pendente, resumo.concluido, resumo.tempo_real_soma, resumo.tempo_real_qtd), (1, 1, 30, 1))
+
+        processamento.reiniciar()
+        resumo = self._resumo()
+        self.assertEqual((resumo.pendente, resumo.concluido, resumo.tempo_real_qtd), (2, 0, 0))
+
+        incremental = self._snapshot()
+        reconstruir()
+        self.assertEqual(self._snapshot(), incremental)
+
+    def test_transicao_perdida_nao_altera_resumo(self):
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="planilha")
+        atrasada = ProcessamentoRPA.objects.get(id=processamento.id)
+        processamento.iniciar_processamento()
+        processamento.falhar("erro")
+
+        self.assertFalse(atrasada.falhar("de novo"))
+        resumo = self._resumo("planilha")
+        self.assertEqual((resumo.pendente, resumo.processando, resumo.falha), (0, 0, 1))
+
+    def test_remocao_e_comando_de_reconstrucao(self):
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="web", status="falha")
+        ProcessamentoRPA.objects.create(user=self.user, tipo="web", status="falha")
+        processamento.delete()
+        self.assertEqual(self._resumo("web").falha, 1)
+
+        ResumoDiarioUsuario.objects.all().delete()
+        call_command("reconstruir_resumo_diario", stdout=open("/dev/null", "w"))
+        self.assertEqual(self._resumo("web").falha, 1)
+
+    def test_endpoints_leem_o_resumo(self):
+        """estatisticas (sem filtros ou por período/tipo) e resumo_diario consultam apenas o resumo"""
+        ProcessamentoRPA.objects.create(user=self.user, tipo="planilha", status="concluido", tempo_real=10)
+        ProcessamentoRPA.objects.create(user=self.user, tipo="planilha", status="falha")
+        ProcessamentoRPA.objects.create(user=self.user, tipo="email", status="pendente")
+
+        with self.assertNumQueries(1):
+            estatisticas = self.cliente.get("/api/historico-rpa-filtro/estatisticas/", {"periodo": "semana"}).data
+        self.assertEqual(estatisticas, {
+            "total_processamentos": 3,
+            "por_status": {"pendente": 1, "processando": 0, "concluido": 1, "falha": 1},
+            "por_tipo": {"planilha": 2, "email": 1},
+            "tempo_medio": 10.0,
+            "taxa_sucesso": 33.33,
+        })
+        self.assertEqual(
+            self.cliente.get("/api/historico-rpa-filtro/estatisticas/", {"tipo_list": "email"}).data["por_tipo"],
+            {"email": 1},
+        )
+
+        with self.assertNumQueries(1):
+            diario = self.cliente.get("/api/historico-rpa-filtro/resumo_diario/").data
+        self.assertEqual(diario, [{
+            "dia": timezone.localdate(), "total": 3, "concluidos": 1, "falhas": 1, "pendentes": 1, "processando": 0,
+        }])
+
+    def test_edicao_por_save_move_contagens(self):
+        """save() direto (admin) que muda status/tipo mantém o resumo e as estatísticas coerentes"""
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa")
+        processamento.status = "falha"
+        processamento.save()
+
+        url = "/api/historico-rpa-filtro/estatisticas/"
+        self.assertEqual(self.cliente.get(url).data["por_status"]["falha"], 1)
+        self.assertEqual(self.cliente.get(url).data, self.cliente.get(url, {"status": "falha"}).data)
+
+        processamento.tipo = "web"
+        processamento.save()
+        self.assertEqual(self._resumo("docker_rpa").total, 0)
+        self.assertEqual((self._resumo("web").falha, self._resumo("web").pendente), (1, 0))
+
+        # Transição posterior parte do bucket correto, sem contagens negativas
+        processamento.reiniciar()
+        incremental = self._snapshot()
+        reconstruir()
+        self.assertEqual(self._snapshot(), [linha for linha in incremental if any(linha[3:])])
+
+    def test_edicao_pelo_admin(self):
+        admin = User.objects.create_superuser("admin", password="senha")
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="planilha")
+        self.client.force_login(admin)
+        resposta = self.client.post(f"/admin/core/processamentorpa/{processamento.id}/change/", {
+            "user": self.user.id, "tipo": "email", "status": "concluido", "descricao": "",
+            "dados_entrada": "{}", "resultado": "null", "progresso": 100, "tempo_estimado": 60,
+            "container-TOTAL_FORMS": 0, "container-INITIAL_FORMS": 0,
+            "eventos-TOTAL_FORMS": 0, "eventos-INITIAL_FORMS": 0,
+        })
+        self.assertEqual(resposta.status_code, 302, resposta.content[:2000])
+        self.assertEqual(self._resumo("planilha").total, 0)
+        self.assertEqual(self._resumo("email").concluido, 1)
@@ -0,0 +1,53 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ContainerExecucao, ProcessamentoRPA
+
+URL = "/api/docker-historico/resumo/"
+
+
+class ResumoDockerTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+
+    def _criar(self, status, imagem=None, duracao=None):
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa", status=status)
+        if imagem is not None:
+            ContainerExecucao.objects.create(
+                processamento=processamento, imagem=imagem, duracao_segundos=duracao
+            )
+        return processamento
+
+    def test_agrega_no_banco(self):
+        """Contagens, média e top 5 de imagens em duas consultas"""
+        self._criar("concluido", "rpa:1", 10)
+        self._criar("concluido", "rpa:1", 20)
+        self._criar("falha", "rpa:2", 500)  # falhas não entram na média
+        self._criar("concluido", "rpa:2")   # sem duração
+        self._criar("pendente")             # sem container
+        for i in range(3, 9):
+            self._criar("falha", f"rpa:{i}")
+        ProcessamentoRPA.objects.create(user=self.user, tipo="planilha", status="concluido")
+
+        with self.assertNumQueries(2):
+            resposta = self.cliente.get(URL)
+
+        self.assertEqual(resposta.data, {
+            "total_executados": 11,
+            "concluidos": 3,
+            "falhas": 7,
+            "tempo_medio_segundos": 15.0,
+            "imagens_populares": {"rpa:1": 2, "rpa:2": 2, "rpa:3": 1, "rpa:4": 1, "rpa:5": 1},
+        })
+
+    def test_sem_execucoes(self):
+        self.assertEqual(self.cliente.get(URL).data, {
+            "total_executados": 0,
+            "concluidos": 0,
+            "falhas": 0,
+            "tempo_medio_segundos": 0,
+            "imagens_populares": {},
+        })
@@ -0,0 +1,67 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+from core.services import registro_vivo
+from core.services.registro_vivo import RegistroVivo
+
+URL = "/api/rpa/"
+
+
+class ListaAtivosTest(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(registro_vivo, "_registro", RegistroVivo(ttl=60))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.cliente = APIClient()
+        self.cliente.force_authenticate(self.user)
+        self.processamentos = [
+            ProcessamentoRPA.objects.create(user=self.user, tipo="docker_rpa", dados_entrada={"x": i})
+            for i in range(25)
+        ]
+        ProcessamentoRPA.objects.create(user=self.user, tipo="planilha", status="concluido")
+
+    def test_paginada_e_compacta(self):
+        """Só ativos, 20 por página, com os campos de status"""
+        resposta = self.cliente.get(URL)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data["count"], 25)
+        self.assertEqual(len(resposta.data["results"]), 20)
+        self.assertIsNotNone(resposta.data["next"])
+        item = resposta.data["results"][0]
+        self.assertIn("progresso", item)
+        self.assertNotIn("dados_entrada", item)
+
+        resposta = self.cliente.get(URL, {"page": 2})
+        self.assertEqual(len(resposta.data["results"]), 5)
+
+    def test_etag_responde_304_sem_consultas(self):
+        """If-None-Match igual: 304 sem corpo; mudança de progresso gera outro ETag"""
+        resposta = self.cliente.get(URL)
+        etag = resposta["ETag"]
+
+        with self.assertNumQueries(0):
+            resposta = self.cliente.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resposta.status_code, 304)
+        self.assertEqual(resposta.content, b"")
+        self.assertEqual(resposta["ETag"], etag)
+
+        self.processamentos[-1].iniciar_processamento()  # mais recente: primeira página
+        resposta = self.cliente.get(URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertNotEqual(resposta["ETag"], etag)
+
+    def test_etag_por_pagina(self):
+        primeira = self.cliente.get(URL)["ETag"]
+        segunda = self.cliente.get(URL, {"page": 2})["ETag"]
+        self.assertNotEqual(primeira, segunda)
+
+    def test_log_apenas_contagens(self):
+        with self.assertLogs("core.views.rpa", level="INFO") as logs:
+            self.cliente.get(URL)
+        self.assertEqual(logs.output, ["INFO:core.views.rpa:Processamentos ativos retornados: 20 de 25"])
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import uuid
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.asgi.sse import tail_logs
+from core.services.logs.tail import BufferLogAoVivo, criar_buffer, encerrar_buffer
+
+
+def _token(user_id):
+    return str(AccessToken.for_user(User(id=user_id)))
+
+
+class BufferLogAoVivoTest(SimpleTestCase):
+    def test_fan_out_e_historico(self):
+        """Assinantes recebem histórico em memória e as linhas seguintes"""
+        buffer = BufferLogAoVivo("p", 1, capacidade=3)
+        for i in range(5):
+            buffer.publicar(f"l{i}")
+
+        recebidas = []
+        historico = buffer.assinar(lambda seq, linha: recebidas.append((seq, linha)))
+        buffer.publicar("l5")
+        buffer.encerrar()
+
+        self.assertEqual(historico, [(2, "l2"), (3, "l3"), (4, "l4")])
+        self.assertEqual(recebidas, [(5, "l5"), (None, None)])
+
+    def test_retoma_apos_ultimo_evento(self):
+        buffer = BufferLogAoVivo("p", 1, capacidade=10)
+        for i in range(4):
+            buffer.publicar(f"l{i}")
+        self.assertEqual(buffer.assinar(lambda *a: None, desde=1), [(2, "l2"), (3, "l3")])
+
+
+class TailSSETest(SimpleTestCase):
+    def _executar(self, processamento_id, user_id, ao_conectar=None):
+        enviados = []
+        scope = {
+            "type": "http",
+            "path": f"/api/docker-rpa/{processamento_id}/logs/stream/",
+            "headers": [],
+            "query_string": f"token={_token(user_id)}".encode(),
+        }
+
+        async def receive():
+            await asyncio.sleep(3600)
+
+        async def send(mensagem):
+            enviados.append(mensagem)
+            if mensagem["type"] == "http.response.start" and ao_conectar:
+                ao_conectar()
+
+        asyncio.run(asyncio.wait_for(tail_logs(scope, receive, send, str(processamento_id)), 5))
+        corpo = b"".join(m.get("body", b"") for m in enviados if m["type"] == "http.response.body")
+        return enviados[0]["status"], corpo.decode()
+
+    def test_transmite_historico_e_novas_linhas(self):
+        processamento = SimpleNamespace(id=uuid.uuid4(), user_id=7)
+        buffer = criar_buffer(processamento)
+        buffer.publicar("primeira")
+
+        def produzir():
+            buffer.publicar("segunda")
+            encerrar_buffer(buffer)
+
+        status, corpo = self._executar(
+            processamento.id, 7, ao_conectar=lambda: threading.Timer(0.05, produzir).start()
+        )
+
+        self.assertEqual(status, 200)
+        self.assertIn("id: 0\ndata: primeira\n\n", corpo)
+        self.assertIn("id: 1\ndata: segunda\n\n", corpo)
+        self.assertIn("event: fim", corpo)
+
+    def test_outro_usuario_nao_acessa(self):
+        processamento = SimpleNamespace(id=uuid.uuid4(), user_id=7)
+        buffer = criar_buffer(processamento)
+        try:
+            status, _ = self._executar(processamento.id, 8)
+        finally:
+            encerrar_buffer(buffer)
+        self.assertEqual(status, 404)
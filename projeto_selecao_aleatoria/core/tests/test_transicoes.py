@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import ProcessamentoRPA
+
+
+class TransicoesTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("usuario", password="senha")
+        self.processamento = ProcessamentoRPA.objects.create(
+            user=self.user, tipo="docker_rpa", dados_entrada={"grande": "x" * 1000}
+        )
+
+    def test_nao_inicia_duas_vezes(self):
+        """Duas instâncias do mesmo processamento: só a primeira inicia"""
+        copia = ProcessamentoRPA.objects.get(id=self.processamento.id)
+        self.assertTrue(self.processamento.iniciar_processamento())
+        self.assertFalse(copia.iniciar_processamento())
+        self.assertEqual(copia.status, "pendente")
+
+    def test_grava_apenas_colunas_alteradas(self):
+        """A transição não reescreve dados_entrada nem resultado"""
+        with self.assertNumQueries(2) as contexto:  # UPDATE do processamento + UPDATE do resumo diário
+            self.processamento.iniciar_processamento()
+        sql = contexto.captured_queries[0]["sql"]
+        self.assertIn('"status"', sql)
+        self.assertNotIn("dados_entrada", sql)
+        self.assertNotIn('"resultado"', sql)
+
+    def test_corrida_perdida_nao_sobrescreve_estado_terminal(self):
+        """Falha tardia não sobrescreve um processamento já concluído"""
+        self.processamento.iniciar_processamento()
+        atrasada = ProcessamentoRPA.objects.get(id=self.processamento.id)
+        self.assertTrue(self.processamento.concluir({"ok": True}))
+
+        self.assertFalse(atrasada.falhar("timeout"))
+        self.processamento.refresh_from_db()
+        self.assertEqual(self.processamento.status, "concluido")
+        self.assertIsNone(self.processamento.mensagem_erro)
+
+    def test_reiniciar_via_api_uma_vez(self):
+        """Reiniciar simultâneo: apenas um pedido volta o processamento para pendente"""
+        processamento = ProcessamentoRPA.objects.create(user=self.user, tipo="planilha", status="falha")
+        cliente = APIClient()
+        cliente.force_authenticate(self.user)
+
+        with mock.patch("core.views.rpa.RPAProcessor.processar_async") as disparar:
+            primeira = cliente.post(f"/api/rpa/{processamento.id}/reiniciar/")
+            segunda = cliente.post(f"/api/rpa/{processamento.id}/reiniciar/")
+
+        self.assertEqual((primeira.status_code, segunda.status_code), (200, 400))
+        disparar.assert_called_once()
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.asgi.roteador import criar_aplicacao
+from core.services.pubsub import Barramento
+from core.services.registro_vivo import RegistroVivo
+
+
+def _token(user_id):
+    return str(AccessToken.for_user(User(id=user_id)))
+
+
+class BarramentoTest(SimpleTestCase):
+    def test_assinar_publicar_cancelar(self):
+        barramento = Barramento()
+        recebidas = []
+        cancelar = barramento.assinar("usuario:1", recebidas.append)
+        barramento.publicar("usuario:1", {"id": "a"})
+        barramento.publicar("usuario:2", {"id": "b"})
+        cancelar()
+        barramento.publicar("usuario:1", {"id": "c"})
+        self.assertEqual(recebidas, [{"id": "a"}])
+        self.assertFalse(barramento.tem_assinantes("usuario:1"))
+
+
+class WebSocketStatusTest(SimpleTestCase):
+    def _conectar(self, user_id, token_user_id, acoes, registro=None):
+        """
+        Executa uma conexão WebSocket; `acoes` roda após o snapshot e retorna ao desconectar.
+
+        Com `registro`, o snapshot é lido dele; sem, o snapshot é vazio.
+        """
+        app = criar_aplicacao(django_app=None)
+        entrada = asyncio.Queue()
+        enviados = []
+        tarefas = []
+
+        async def receive():
+            return await entrada.get()
+
+        async def send(mensagem):
+            enviados.append(mensagem)
+            if mensagem.get("text") and json.loads(mensagem["text"])["tipo"] == "snapshot":
+                tarefas.append(asyncio.ensure_future(roteiro()))
+
+        async def roteiro():
+            await asyncio.get_running_loop().run_in_executor(None, acoes)
+            await asyncio.sleep(0.2)
+            await entrada.put({"type": "websocket.disconnect"})
+
+        async def executar():
+            await entrada.put({"type": "websocket.connect"})
+            scope = {
+                "type": "websocket", "path": "/ws/processamentos/",
+                "headers": [], "query_string": f"token={_token(token_user_id)}".encode(),
+            }
+            await asyncio.wait_for(app(scope, receive, send), 5)
+
+        if registro is None:
+            substituto = mock.patch("core.asgi.websocket._snapshot", return_value=[])
+        else:
+            substituto = mock.patch("core.services.registro_vivo._registro", registro)
+        with substituto:
+            asyncio.run(executar())
+        return enviados
+
+    def _processamento(self, user_id):
+        return SimpleNamespace(
+            id=uuid.uuid4(), user_id=user_id, tipo="docker_rpa", descricao="", status="processando",
+            progresso=0, tempo_estimado=60, criado_em=None, iniciado_em=None, concluido_em=None,
+        )
+
+    def test_snapshot_com_token_do_simplejwt(self):
+        """A claim do token (texto) encontra os processamentos do usuário (ID inteiro)"""
+        registro = RegistroVivo(ttl=60)
+        processamento = self._processamento(7)
+        registro.hidratar_usuario(7, [processamento])
+        registro.hidratar_usuario(8, [self._processamento(8)])
+
+        enviados = self._conectar(7, 7, lambda: None, registro=registro)
+        snapshot = json.loads(enviados[1]["text"])
+        self.assertEqual([p["id"] for p in snapshot["processamentos"]], [str(processamento.id)])
+
+    def test_envia_deltas_do_usuario(self):
+        """Mudanças registradas neste processo chegam como deltas ao dono do processamento"""
+        registro = RegistroVivo(ttl=60)
+        processamento = self._processamento(7)
+
+        def acoes():
+            registro.registrar(processamento)
+            registro.atualizar(processamento.id, progresso=50, fase="Sorteio", ultima_linha="x")
+            registro.atualizar(processamento.id, ultima_linha="y")  # não notifica
+
+        enviados = self._conectar(7, 7, acoes)
+        textos = [json.loads(m["text"]) for m in enviados if m["type"] == "websocket.send"]
+
+        self.assertEqual(enviados[0]["type"], "websocket.accept")
+        self.assertEqual(textos[0], {"tipo": "snapshot", "processamentos": []})
+        deltas = [t["processamento"] for t in textos[1:]]
+        combinado = {}
+        for delta in deltas:
+            combinado.update(delta)
+        self.assertEqual(combinado["id"], str(processamento.id))
+        self.assertEqual((combinado["status"], combinado["progresso"], combinado["fase"]), ("processando", 50, "Sorteio"))
+        self.assertNotIn("ultima_linha", combinado)
+
+    def test_token_invalido_fecha_conexao(self):
+        app = criar_aplicacao(django_app=None)
+        enviados = []
+
+        async def receive():
+            return {"type": "websocket.connect"}
+
+        async def send(mensagem):
+            enviados.append(mensagem)
+
+        scope = {"type": "websocket", "path": "/ws/processamentos/", "headers": [], "query_string": b"token=x"}
+        asyncio.run(app(scope, receive, send))
+        self.assertEqual(enviados, [{"type": "websocket.close", "code": 4401}])
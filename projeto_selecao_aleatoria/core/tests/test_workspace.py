@@ -0,0 +1,84 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, override_settings
+
+from core.services.workspace import AreaTrabalho, MARCADOR_EXPIRACAO, varrer_areas
+
+
+class AreaTrabalhoTest(SimpleTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.raiz = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _area(self, user_id, proc_id, tamanho=0, idade_horas=0, usar_tmpfs=False):
+        proc = SimpleNamespace(user_id=user_id, id=proc_id)
+        area = AreaTrabalho(proc, raiz=self.raiz, usar_tmpfs=usar_tmpfs).criar()
+        if tamanho:
+            (area.output_dir / "SA_x.xlsx").write_bytes(b"x" * tamanho)
+        if idade_horas:
+            antigo = time.time() - idade_horas * 3600
+            for d in area.diretorios:
+                os.utime(d, (antigo, antigo))
+        return area
+
+    def test_remover_apaga_diretorios(self):
+        """Área removida após upload não deixa diretórios para trás"""
+        area = self._area(1, "a")
+        area.remover()
+        self.assertFalse(area.output_dir.exists())
+        self.assertFalse(area.dados_dir.exists())
+
+    def test_tmpfs_nao_cria_dados_no_host(self):
+        """Com tmpfs o diretório de dados não é criado no host"""
+        area = self._area(1, "a", usar_tmpfs=True)
+        self.assertFalse(area.dados_dir.exists())
+        args = area.argumentos_docker(str)
+        self.assertIn("--tmpfs", args)
+
+    @override_settings(RPA_SCRATCH_TTL_FALHA_HORAS=1)
+    def test_reter_grava_marcador(self):
+        """Falha mantém a área com marcador de expiração"""
+        area = self._area(1, "a")
+        area.reter()
+        self.assertTrue((area.output_dir / MARCADOR_EXPIRACAO).exists())
+
+    def test_varredura_respeita_ativos_ttl_e_idade(self):
+        """Remove expiradas e órfãs antigas, preserva ativas e retidas no prazo"""
+        ativa = self._area(1, "ativa", idade_horas=500)
+        orfa = self._area(1, "orfa", idade_horas=500)
+        recente = self._area(2, "recente")
+        retida = self._area(2, "retida", idade_horas=500)
+        retida.reter(ttl_horas=10)
+        expirada = self._area(2, "expirada")
+        expirada.reter(ttl_horas=-1)
+
+        resultado = varrer_areas(
+            raiz=self.raiz, idade_max_horas=24, limite_bytes=10**9, ids_ativos=["ativa"]
+        )
+
+        self.assertEqual(resultado["removidas"], 2)
+        self.assertTrue(ativa.output_dir.exists())
+        self.assertTrue(recente.output_dir.exists())
+        self.assertTrue(retida.output_dir.exists())
+        self.assertFalse(orfa.output_dir.exists())
+        self.assertFalse(expirada.output_dir.exists())
+
+    def test_varredura_aplica_orcamento_removendo_mais_antigas(self):
+        """Acima do orçamento, remove as áreas mais antigas primeiro"""
+        antiga = self._area(1, "antiga", tamanho=1000, idade_horas=3)
+        nova = self._area(1, "nova", tamanho=1000, idade_horas=1)
+
+        resultado = varrer_areas(
+            raiz=self.raiz, idade_max_horas=24, limite_bytes=1500
+        )
+
+        self.assertEqual(resultado["removidas"], 1)
+        self.assertFalse(antiga.output_dir.exists())
+        self.assertTrue(nova.output_dir.exists())
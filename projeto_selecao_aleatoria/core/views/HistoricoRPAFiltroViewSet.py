@@ -3,12 +3,21 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters import rest_framework as django_filters
-from django.db.models import Q
+from django.db.models import Avg, Count, F, Q, Sum
 from datetime import datetime, timedelta
 
-from ..models import ProcessamentoRPA
+from ..models import ProcessamentoRPA, ResumoDiarioUsuario
+from ..services import busca, resumo_diario
 from ..serializers import RPAHistoricoSerializer
-from .base import HistoricoPagination
+from .base import (
+    AdiarCamposPesadosMixin, HistoricoCursorPagination, HistoricoPagination, OrdenacaoRelevancia
+)
+
+# Dias cobertos por cada período predefinido (a partir de hoje, inclusive)
+DIAS_PERIODO = {'hoje': 0, 'semana': 7, 'mes': 30, '3meses': 90}
+
+# Parâmetros que as estatísticas conseguem atender pelo resumo diário
+PARAMETROS_RESUMO = {'periodo', 'tipo', 'tipo_list', 'ordering', 'page', 'page_size'}
 
 
 class ProcessamentoRPAFilter(django_filters.FilterSet):
@@ -60,14 +69,8 @@ class ProcessamentoRPAFilter(django_filters.FilterSet):
         
         if value == 'hoje':
             return queryset.filter(criado_em__date=hoje)
-        elif value == 'semana':
-            data_inicio = hoje - timedelta(days=7)
-            return queryset.filter(criado_em__date__gte=data_inicio)
-        elif value == 'mes':
-            data_inicio = hoje - timedelta(days=30)
-            return queryset.filter(criado_em__date__gte=data_inicio)
-        elif value == '3meses':
-            data_inicio = hoje - timedelta(days=90)
+        elif value in DIAS_PERIODO:
+            data_inicio = hoje - timedelta(days=DIAS_PERIODO[value])
             return queryset.filter(criado_em__date__gte=data_inicio)
         
         return queryset
@@ -87,12 +90,9 @@ class ProcessamentoRPAFilter(django_filters.FilterSet):
         return queryset
 
     def filter_busca(self, queryset, name, value):
-        """Buscar texto na descrição ou mensagem de erro"""
+        """Buscar texto na descrição ou mensagem de erro (índice textual, anota `relevancia`)"""
         if value:
-            return queryset.filter(
-                Q(descricao__icontains=value) | 
-                Q(mensagem_erro__icontains=value)
-            )
+            return busca.filtrar(queryset, value)
         return queryset
 
     def filter_com_erro(self, queryset, name, value):
@@ -120,7 +120,7 @@ class ProcessamentoRPAFilter(django_filters.FilterSet):
         return queryset
 
 
-class HistoricoRPAFiltroViewSet(viewsets.ReadOnlyModelViewSet):
+class HistoricoRPAFiltroViewSet(AdiarCamposPesadosMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para listar e filtrar histórico de processamentos RPA do usuário
     
@@ -131,18 +131,21 @@ class HistoricoRPAFiltroViewSet(viewsets.ReadOnlyModelViewSet):
     - periodo: hoje, semana, mes, 3meses
     - status_list: Múltiplos status (ex: pendente,processando)
     - tipo_list: Múltiplos tipos (ex: planilha,email)
-    - busca: Busca por texto na descrição
+    - busca: Busca por texto na descrição/mensagem de erro (sem ordering, por relevância)
     - com_erro: true/false para processamentos com falha
     - concluidos: true/false para processamentos concluídos
     - em_andamento: true/false para processamentos ativos
     - progresso__gte/lte: Filtrar por percentual de progresso
     - tempo_real__gte/lte: Filtrar por tempo de execução
+    
+    Paginação por cursor (?cursor=…&page_size=…); ?paginacao=pagina mantém page/count.
+    ?fields=id,status,criado_em limita os campos da resposta.
     """
     
     permission_classes = [IsAuthenticated]
     serializer_class = RPAHistoricoSerializer
-    pagination_class = HistoricoPagination
-    filter_backends = [django_filters.DjangoFilterBackend, filters.OrderingFilter]
+    pagination_class = HistoricoCursorPagination
+    filter_backends = [django_filters.DjangoFilterBackend, OrdenacaoRelevancia]
     filterset_class = ProcessamentoRPAFilter
     ordering_fields = ['criado_em', 'iniciado_em', 'concluido_em', 'progresso', 'tempo_real']
     ordering = ['-criado_em']  # Ordenação padrão
@@ -168,12 +171,16 @@ class HistoricoRPAFiltroViewSet(viewsets.ReadOnlyModelViewSet):
         """
         Endpoint adicional para estatísticas do histórico do usuário
         GET /api/historico-rpa-filtro/estatisticas/
-        """
-        queryset = self.filter_queryset(self.get_queryset())
         
-        # Aplicar os mesmos filtros da view principal
-        total = queryset.count()
+        Sem filtros (ou apenas periodo/tipo/tipo_list) lê o resumo diário;
+        demais filtros agregam diretamente os processamentos.
+        """
+        contagens = self._contagens_do_resumo(request)
+        if contagens is None:
+            contagens = self._contagens_agregadas()
+        por_status, por_tipo, tempo_medio = contagens
         
+        total = sum(por_status.values())
         estatisticas = {
             'total_processamentos': total,
             'por_status': {},
@@ -185,56 +192,89 @@ class HistoricoRPAFiltroViewSet(viewsets.ReadOnlyModelViewSet):
         if total > 0:
             # Contagem por status
             for status, _ in ProcessamentoRPA.STATUS_CHOICES:
-                count = queryset.filter(status=status).count()
-                estatisticas['por_status'][status] = count
+                estatisticas['por_status'][status] = por_status.get(status, 0)
             
             # Contagem por tipo
             for tipo, _ in ProcessamentoRPA.TIPO_CHOICES:
-                count = queryset.filter(tipo=tipo).count()
-                if count > 0:
-                    estatisticas['por_tipo'][tipo] = count
+                if por_tipo.get(tipo, 0) > 0:
+                    estatisticas['por_tipo'][tipo] = por_tipo[tipo]
             
             # Tempo médio (apenas processamentos concluídos com tempo_real)
-            processamentos_com_tempo = queryset.filter(
-                status='concluido',
-                tempo_real__isnull=False
-            )
-            if processamentos_com_tempo.exists():
-                from django.db.models import Avg
-                tempo_medio = processamentos_com_tempo.aggregate(
-                    tempo_medio=Avg('tempo_real')
-                )['tempo_medio']
-                estatisticas['tempo_medio'] = round(tempo_medio, 2) if tempo_medio else None
+            estatisticas['tempo_medio'] = round(tempo_medio, 2) if tempo_medio else None
             
             # Taxa de sucesso
-            concluidos = queryset.filter(status='concluido').count()
+            concluidos = por_status.get('concluido', 0)
             estatisticas['taxa_sucesso'] = round((concluidos / total) * 100, 2)
         
         return Response(estatisticas)
 
+    def _contagens_agregadas(self):
+        """Contagens por status/tipo e tempo médio em um único aggregate sobre os processamentos filtrados."""
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        agregados = {'tempo_medio': Avg('tempo_real', filter=Q(status='concluido'))}  # Avg ignora nulos
+        for status, _ in ProcessamentoRPA.STATUS_CHOICES:
+            agregados[f'status_{status}'] = Count('id', filter=Q(status=status))
+        for tipo, _ in ProcessamentoRPA.TIPO_CHOICES:
+            agregados[f'tipo_{tipo}'] = Count('id', filter=Q(tipo=tipo))
+        valores = queryset.aggregate(**agregados)
+        
+        por_status = {status: valores[f'status_{status}'] for status, _ in ProcessamentoRPA.STATUS_CHOICES}
+        por_tipo = {tipo: valores[f'tipo_{tipo}'] for tipo, _ in ProcessamentoRPA.TIPO_CHOICES}
+        return por_status, por_tipo, valores['tempo_medio']
+
+    def _contagens_do_resumo(self, request):
+        """
+        Contagens a partir de ResumoDiarioUsuario (uma consulta, algumas dezenas de linhas).
+        
+        Returns:
+            Mesma tupla de _contagens_agregadas, ou None se algum filtro não pode ser atendido pelo resumo
+        """
+        if not set(request.query_params) <= PARAMETROS_RESUMO:
+            return None
+        filtro = self.filterset_class(
+            request.query_params, queryset=ProcessamentoRPA.objects.none(), request=request
+        )
+        if not filtro.is_valid():
+            # Parâmetro inválido: o caminho normal devolve o erro de validação
+            return None
+        dados = filtro.form.cleaned_data
+        
+        dia_inicio = None
+        if dados.get('periodo'):
+            dia_inicio = datetime.now().date() - timedelta(days=DIAS_PERIODO[dados['periodo']])
+        tipos = None
+        if dados.get('tipo_list'):
+            tipos = {t.strip() for t in dados['tipo_list'].split(',')}
+        if dados.get('tipo'):
+            tipos = {dados['tipo']} & tipos if tipos is not None else {dados['tipo']}
+        
+        por_status, por_tipo, soma, quantidade = {}, {}, 0, 0
+        for linha in resumo_diario.totais_por_tipo(request.user.id, dia_inicio, tipos):
+            for status, _ in ProcessamentoRPA.STATUS_CHOICES:
+                por_status[status] = por_status.get(status, 0) + linha[status]
+            por_tipo[linha['tipo']] = sum(linha[status] for status, _ in ProcessamentoRPA.STATUS_CHOICES)
+            soma += linha['tempo_real_soma']
+            quantidade += linha['tempo_real_qtd']
+        return por_status, por_tipo, (soma / quantidade if quantidade else None)
+
     @action(detail=False, methods=['get'])
     def resumo_diario(self, request):
         """
         Endpoint para resumo diário dos últimos 30 dias
         GET /api/historico-rpa-filtro/resumo_diario/
         """
-        from django.db.models import Count
-        from django.utils import timezone
-        
-        # Últimos 30 dias
-        data_limite = timezone.now() - timedelta(days=30)
-        
-        queryset = self.get_queryset().filter(criado_em__gte=data_limite)
+        # Últimos 30 dias (dia de criação no fuso local), lidos do resumo diário
+        data_limite = datetime.now().date() - timedelta(days=30)
         
-        # Agrupar por data de criação
-        resumo = queryset.extra(
-            select={'dia': 'DATE(criado_em)'}
+        resumo = ResumoDiarioUsuario.objects.filter(
+            user=request.user, dia__gte=data_limite
         ).values('dia').annotate(
-            total=Count('id'),
-            concluidos=Count('id', filter=Q(status='concluido')),
-            falhas=Count('id', filter=Q(status='falha')),
-            pendentes=Count('id', filter=Q(status='pendente')),
-            processando=Count('id', filter=Q(status='processando'))
+            total=Sum(F('pendente') + F('processando') + F('concluido') + F('falha')),
+            concluidos=Sum('concluido'),
+            falhas=Sum('falha'),
+            pendentes=Sum('pendente'),
+            processando=Sum('processando')
         ).order_by('-dia')
         
         return Response(list(resumo))
@@ -1,5 +1,5 @@
 # Importações para manter compatibilidade
-from .base import HistoricoPagination
+from .base import AdiarCamposPesadosMixin, AtivosPagination, HistoricoPagination, HistoricoCursorPagination
 from .rpa import RPAViewSet
 from .docker_rpa import RPADockerViewSet, DockerHistoricoViewSet
 from .historico import HistoricoRPAViewSet
@@ -10,7 +10,7 @@ from .processors.docker_processor import RPADockerProcessor
 
 # Para compatibilidade com código antigo
 __all__ = [
-    'RPAProcessor', 'RPAViewSet', 'HistoricoPagination', 'HistoricoRPAViewSet',
+    'AdiarCamposPesadosMixin', 'AtivosPagination', 'RPAProcessor', 'RPAViewSet', 'HistoricoPagination', 'HistoricoCursorPagination', 'HistoricoRPAViewSet',
     'RPADockerProcessor', 'RPADockerViewSet', 'DockerHistoricoViewSet',
     'UserProcessamentoViewSet', 'UserDockerProcessamentoViewSet', 
     'ResultadoDownloadViewSet'
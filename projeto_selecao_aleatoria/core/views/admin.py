@@ -9,12 +9,18 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 from ..models import ProcessamentoRPA, ResultadoProcessamento
 from ..serializers import RPAHistoricoSerializer, RPADockerHistoricoSerializer
-from .base import HistoricoPagination
+from ..services import busca
+from .base import AdiarCamposPesadosMixin, HistoricoCursorPagination, OrdenacaoRelevancia
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
-class UserProcessamentoViewSet(viewsets.ReadOnlyModelViewSet):
+class UserHistoricoCursorPagination(HistoricoCursorPagination):
+    """Cursor para as listagens administrativas; ?paginacao=pagina mantém a lista completa."""
+    paginacao_compativel = None
+
+
+class UserProcessamentoViewSet(AdiarCamposPesadosMixin, viewsets.ReadOnlyModelViewSet):
     """
     API para gerenciar e visualizar processamentos por usuário específico.
     
@@ -22,7 +28,8 @@ class UserProcessamentoViewSet(viewsets.ReadOnlyModelViewSet):
     de qualquer usuário no sistema.
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = UserHistoricoCursorPagination
+    filter_backends = [filters.SearchFilter, OrdenacaoRelevancia]
     search_fields = ['tipo', 'status', 'id', 'descricao']
     ordering_fields = ['criado_em', 'concluido_em', 'status', 'tipo']
     ordering = ['-criado_em']
@@ -39,15 +46,28 @@ class UserProcessamentoViewSet(viewsets.ReadOnlyModelViewSet):
         if status:
             queryset = queryset.filter(status=status)
             
+        # Busca textual indexada (mesma do histórico)
+        texto = self.request.query_params.get('busca')
+        if texto:
+            queryset = busca.filtrar(queryset, texto)
+            
         tipo = self.request.query_params.get('tipo')
         if tipo:
             queryset = queryset.filter(tipo=tipo)
+            if tipo == 'docker_rpa':
+                queryset = queryset.select_related('container')
             
         data_inicio = self.request.query_params.get('data_inicio')
         data_fim = self.request.query_params.get('data_fim')
         if data_inicio and data_fim:
             queryset = queryset.filter(criado_em__range=[data_inicio, data_fim])
         
+        # Resultados associados sem consultas extras no detalhe
+        if self.action == 'retrieve':
+            queryset = queryset.annotate(resultados_count=Count('resultados_associados'))
+        elif self.action == 'resultados':
+            queryset = queryset.prefetch_related('resultados_associados')
+        
         return queryset
     
     def get_serializer_class(self):
@@ -67,8 +87,8 @@ class UserProcessamentoViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(instance)
         data = serializer.data
         
-        # Adiciona contagem de resultados
-        resultados_count = ResultadoProcessamento.objects.filter(processamento=instance).count()
+        # Adiciona contagem de resultados (anotada em get_queryset)
+        resultados_count = instance.resultados_count
         data['resultados_count'] = resultados_count
         
         # Adiciona link para o endpoint de resultados
@@ -143,10 +163,10 @@ class UserProcessamentoViewSet(viewsets.ReadOnlyModelViewSet):
         """
         processamento = self.get_object()
         
-        # Buscar resultados associados do novo modelo
-        resultados = ResultadoProcessamento.objects.filter(processamento=processamento)
+        # Buscar resultados associados do novo modelo (prefetch de get_queryset)
+        resultados = list(processamento.resultados_associados.all())
         
-        if resultados.exists():
+        if resultados:
             # Formatar dados dos resultados
             data = []
             for r in resultados:
@@ -191,7 +211,7 @@ class UserDockerProcessamentoViewSet(UserProcessamentoViewSet):
     def get_queryset(self):
         """Sobrescreve para filtrar apenas processamentos Docker"""
         queryset = super().get_queryset()
-        return queryset.filter(tipo='docker_rpa')
+        return queryset.filter(tipo='docker_rpa').select_related('container')
     
     def get_serializer_class(self):
         """Sempre usa o serializer Docker para este ViewSet"""
@@ -1,6 +1,18 @@
+import base64
+import json
 import logging
-from rest_framework.pagination import PageNumberPagination
+from collections import OrderedDict
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 logger = logging.getLogger(__name__)
 
@@ -9,5 +21,245 @@ class HistoricoPagination(PageNumberPagination):
     page_size = 10  # Número de itens por página
     page_size_query_param = 'page_size'
     max_page_size = 100
-    
-# Outras classes base como mixins podem ser adicionadas aqui
\ No newline at end of file
+
+
+class AtivosPagination(PageNumberPagination):
+    """Paginação da lista de processamentos ativos (acompanhamento em polling)."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class AdiarCamposPesadosMixin:
+    """
+    Nas listagens, não carrega do banco as colunas JSON/texto grandes que o
+    serializer não vai ler (ex.: com ?fields=id,status,criado_em).
+
+    O serializer deve expor `campos_modelo()` (CamposDinamicosMixin); sem ele
+    a consulta não é alterada.
+    """
+    campos_pesados = ('dados_entrada', 'resultado', 'mensagem_erro')
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list':
+            return queryset
+        campos_modelo = getattr(self.get_serializer(), 'campos_modelo', None)
+        if campos_modelo is None:
+            return queryset
+        usados = campos_modelo()
+        adiados = [campo for campo in self.campos_pesados if campo not in usados]
+        return queryset.defer(*adiados) if adiados else queryset
+
+
+class OrdenacaoRelevancia(OrderingFilter):
+    """
+    OrderingFilter que, sem ?ordering explícito, ordena buscas textuais
+    (?busca=…) por relevância antes da ordenação padrão da view.
+    """
+    parametro_busca = 'busca'
+
+    def get_default_ordering(self, view):
+        ordenacao = list(super().get_default_ordering(view) or ())
+        request = getattr(view, 'request', None)
+        if request is not None and request.query_params.get(self.parametro_busca):
+            return ['-relevancia', *ordenacao]
+        return ordenacao or None
+
+
+class HistoricoCursorPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) para históricos de processamento.
+
+    Em vez de `COUNT(*)` + `OFFSET`, cada página filtra a partir da última
+    linha da página anterior: `WHERE (criado_em, id) < (?, ?)`. O custo não
+    cresce com a profundidade da página nem com o tamanho do histórico.
+
+    A ordenação é a da view (OrderingFilter ou `ordering`), sempre
+    desempatada por `id`; valores nulos ficam por último nos dois sentidos.
+    Clientes antigos podem usar `?paginacao=pagina` (page/page_size com
+    `count`), atendido por `paginacao_compativel`.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering = ('-criado_em',)
+
+    # Modo de compatibilidade (?paginacao=pagina); None = lista sem paginação
+    modo_query_param = 'paginacao'
+    paginacao_compativel = HistoricoPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.compativel = None
+        if request.query_params.get(self.modo_query_param) == 'pagina':
+            if self.paginacao_compativel is None:
+                return None
+            self.compativel = self.paginacao_compativel()
+            return self.compativel.paginate_queryset(queryset, request, view)
+
+        self.page_size = self._tamanho_pagina(request)
+        self.campos = self._ordenacao(request, queryset, view)
+        modelo = queryset.model
+        ordem = [
+            F(nome).desc(nulls_last=True) if desc else F(nome).asc(nulls_last=True)
+            for nome, desc in self.campos
+        ]
+
+        cursor = self._decodificar(request, modelo)
+        reverso = bool(cursor and cursor['r'])
+        if reverso:
+            # Página anterior: percorre no sentido inverso a partir da primeira linha
+            ordem = [
+                F(nome).asc(nulls_first=True) if desc else F(nome).desc(nulls_first=True)
+                for nome, desc in self.campos
+            ]
+        queryset = queryset.order_by(*ordem)
+        if cursor:
+            queryset = queryset.filter(self._depois_de(cursor['v'], reverso))
+
+        itens = list(queryset[:self.page_size + 1])
+        mais = len(itens) > self.page_size
+        itens = itens[:self.page_size]
+        if reverso:
+            itens.reverse()
+
+        self.proxima = (mais or reverso) and bool(itens)
+        self.anterior = bool(cursor) and (not reverso or mais) and bool(itens)
+        self.itens = itens
+        return itens
+
+    def get_paginated_response(self, data):
+        if self.compativel is not None:
+            return self.compativel.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.proxima:
+            return None
+        return self._link(self.itens[-1], reverso=False)
+
+    def get_previous_link(self):
+        if not self.anterior:
+            return None
+        return self._link(self.itens[0], reverso=True)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Auxiliares
+    # ──────────────────────────────────────────────────────────────────────
+    def _tamanho_pagina(self, request):
+        try:
+            tamanho = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(tamanho, self.max_page_size) if tamanho > 0 else self.page_size
+
+    def _ordenacao(self, request, queryset, view):
+        """
+        Campos de ordenação da view, com `id` como desempate.
+
+        Returns:
+            Lista de tuplas (campo, descendente)
+        """
+        ordenacao = None
+        backends = getattr(view, 'filter_backends', ()) if view is not None else ()
+        ordenacao_filtro = next((b for b in backends if issubclass(b, OrderingFilter)), None)
+        if ordenacao_filtro is not None:
+            ordenacao = ordenacao_filtro().get_ordering(request, queryset, view)
+        elif view is not None:
+            ordenacao = getattr(view, 'ordering', None)
+
+        campos = []
+        for campo in ordenacao or self.ordering:
+            nome = campo.lstrip('-')
+            if nome == 'pk':
+                nome = 'id'
+            if nome not in queryset.query.annotations:
+                try:
+                    queryset.model._meta.get_field(nome)
+                except FieldDoesNotExist:
+                    # Campos relacionados (a__b) não entram no cursor
+                    continue
+            if nome not in (n for n, _ in campos):
+                campos.append((nome, campo.startswith('-')))
+        if 'id' not in (nome for nome, _ in campos):
+            campos.append(('id', campos[0][1] if campos else True))
+        return campos
+
+    def _depois_de(self, valores, reverso):
+        """
+        Condição "linha vem depois do cursor" na ordem lexicográfica dos campos.
+
+        Nulos ficam por último no sentido normal (e primeiro no reverso).
+        """
+        alternativas = []
+        for i, ((nome, desc), valor) in enumerate(zip(self.campos, valores)):
+            iguais = [
+                Q(**{f'{n}__isnull': True}) if v is None else Q(**{n: v})
+                for (n, _), v in zip(self.campos[:i], valores[:i])
+            ]
+            maior = desc == reverso  # sentido efetivo da comparação
+            if not reverso:
+                if valor is None:
+                    continue  # Nada vem depois de um nulo
+                depois = Q(**{f'{nome}__{"gt" if maior else "lt"}': valor}) | Q(**{f'{nome}__isnull': True})
+            else:
+                if valor is None:
+                    depois = Q(**{f'{nome}__isnull': False})
+                else:
+                    depois = Q(**{f'{nome}__{"gt" if maior else "lt"}': valor})
+            alternativas.append(reduce(and_, iguais + [depois]))
+        return reduce(or_, alternativas) if alternativas else Q(pk__in=[])
+
+    def _decodificar(self, request, modelo):
+        """
+        Lê o cursor da URL, convertendo os valores para os tipos dos campos.
+
+        Returns:
+            {'v': valores, 'r': reverso} ou None se não há cursor
+        """
+        codificado = request.query_params.get(self.cursor_query_param)
+        if not codificado:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(codificado.encode('ascii')).decode('utf-8'))
+            # Cursor de outra ordenação não é aceito
+            if not isinstance(cursor, dict) or len(cursor['v']) != len(self.campos):
+                raise ValueError
+            valores = [
+                None if valor is None else self._converter(modelo, nome, valor)
+                for (nome, _), valor in zip(self.campos, cursor['v'])
+            ]
+            return {'v': valores, 'r': bool(cursor.get('r'))}
+        except (ValueError, KeyError, TypeError, UnicodeError, ValidationError):
+            raise NotFound('Cursor inválido.')
+
+    @staticmethod
+    def _converter(modelo, nome, valor):
+        try:
+            return modelo._meta.get_field(nome).to_python(valor)
+        except FieldDoesNotExist:
+            # Anotação numérica (ex.: relevancia da busca)
+            return float(valor)
+
+    def _link(self, item, reverso):
+        valores = []
+        for nome, _ in self.campos:
+            valor = getattr(item, nome)
+            if valor is not None:
+                try:
+                    valor = item._meta.get_field(nome).value_to_string(item)
+                except FieldDoesNotExist:
+                    pass
+            valores.append(valor)
+        cursor = json.dumps({'v': valores, 'r': int(reverso)}, separators=(',', ':'))
+        codificado = base64.urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii')
+        url = remove_query_param(self.request.build_absolute_uri(), 'page')
+        return replace_query_param(url, self.cursor_query_param, codificado)
+
+# Outras classes base como mixins podem ser adicionadas aqui
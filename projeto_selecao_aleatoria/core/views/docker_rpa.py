@@ -1,4 +1,6 @@
 import logging
+from django.db.models import Avg, Count, Q
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
@@ -8,10 +10,12 @@ from rest_framework.pagination import PageNumberPagination
 from ..models import ProcessamentoRPA
 from ..serializers import (
     RPADockerCreateSerializer, RPADockerSerializer, 
-    RPADockerHistoricoSerializer
+    RPADockerHistoricoSerializer, RPAStatusSerializer, ProcessamentoEventoSerializer
 )
+from ..services.logs import abrir_leitor
+from ..services.registro_vivo import obter_registro
 from .processors.docker_processor import RPADockerProcessor
-from .base import HistoricoPagination
+from .base import AdiarCamposPesadosMixin, HistoricoCursorPagination
 
 docker_logger = logging.getLogger('docker_rpa')
 
@@ -68,47 +72,98 @@ class RPADockerViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def ativos(self, request):
-        """Só processos docker pendentes ou processando."""
-        qs = ProcessamentoRPA.objects.filter(
-            user=request.user,
-            tipo='docker_rpa',
-            status__in=['pendente', 'processando']
-        ).order_by('-criado_em')
-        serializer = RPADockerSerializer(qs, many=True)
+        """
+        Só processos docker pendentes ou processando.
+        Servido do registro em memória (o banco é consultado no máximo uma vez por RPA_REGISTRO_TTL).
+        """
+        estados = obter_registro().ativos_do_usuario(request.user.id, tipo='docker_rpa')
+        serializer = RPAStatusSerializer(estados, many=True)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['get'])
+    def logs(self, request, pk=None):
+        """
+        Lê um trecho do log do container sem descomprimir o arquivo inteiro.
+        GET /api/docker-rpa/{id}/logs/?offset=0&limit=200
+        """
+        # Logs ficam disponíveis também após o término (fora do queryset de ativos)
+        processamento = get_object_or_404(
+            ProcessamentoRPA, id=pk, user=request.user, tipo='docker_rpa'
+        )
+
+        try:
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+            limit = min(max(int(request.query_params.get('limit', 200)), 1), 1000)
+        except ValueError:
+            return Response(
+                {'erro': 'offset e limit devem ser inteiros'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        leitor = abrir_leitor(processamento)
+        if leitor is None:
+            return Response(
+                {'detail': 'Nenhum log disponível para este processamento.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        try:
+            linhas, total = leitor.ler(offset, limit)
+        except Exception as e:
+            # Detalhes (caminhos, erros de parsing) ficam apenas no log do servidor
+            docker_logger.error("Erro ao ler log do processamento %s: %s", processamento.id, e)
+            return Response(
+                {'detail': 'Erro ao ler o log deste processamento.'},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
+
+        return Response({
+            'processamento_id': str(processamento.id),
+            'offset': offset,
+            'limit': limit,
+            'total_linhas': total,
+            'proximo_offset': offset + len(linhas) if offset + len(linhas) < total else None,
+            'linhas': linhas,
+        })
+    
+    @action(detail=True, methods=['get'])
+    def eventos(self, request, pk=None):
+        """
+        Linha do tempo da execução (container, S3, coleta, término).
+        GET /api/docker-rpa/{id}/eventos/
+        """
+        processamento = get_object_or_404(
+            ProcessamentoRPA, id=pk, user=request.user, tipo='docker_rpa'
+        )
+        serializer = ProcessamentoEventoSerializer(processamento.eventos.all(), many=True)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['post'])
     def reiniciar(self, request, pk=None):
         """Permite reiniciar um processamento."""
         processamento = self.get_object()
 
-        if processamento.status in ['concluido', 'falha']:
-            processamento.status = 'pendente'
-            processamento.iniciado_em = None
-            processamento.concluido_em = None
-            processamento.resultado = None
-            processamento.mensagem_erro = None
-            processamento.progresso = 0
-            processamento.tempo_real = None
-            processamento.save()
-
+        # Compare-and-set: dois pedidos simultâneos não disparam duas execuções
+        if processamento.reiniciar():
             RPADockerProcessor.processar_async(processamento)
 
             return Response({'mensagem': 'Processamento Docker RPA reiniciado'})
         else:
+            processamento.refresh_from_db(fields=['status'])
             return Response(
                 {'erro': f'Não é possível reiniciar um processamento com status {processamento.status}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class DockerHistoricoViewSet(viewsets.ReadOnlyModelViewSet):
+class DockerHistoricoViewSet(AdiarCamposPesadosMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet para listar e resumir o histórico de processamentos Docker do usuário.
-    Aceita ?page=…&page_size=… e ?status=pendente|processando|concluido|falha
+    Aceita ?cursor=…&page_size=… (ou ?paginacao=pagina&page=…), ?status=pendente|processando|concluido|falha
+    e ?fields=… (campos da resposta)
     """
     serializer_class = RPADockerHistoricoSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = HistoricoPagination
+    pagination_class = HistoricoCursorPagination
     lookup_field = 'id'
 
     def get_queryset(self):
@@ -123,7 +178,7 @@ class DockerHistoricoViewSet(viewsets.ReadOnlyModelViewSet):
         if status in {'pendente','processando','concluido','falha'}:
             qs = qs.filter(status=status)
 
-        return qs.order_by('-criado_em')
+        return qs.select_related('container').order_by('-criado_em')
 
     @action(detail=False, methods=['get'])
     def resumo(self, request):
@@ -135,31 +190,29 @@ class DockerHistoricoViewSet(viewsets.ReadOnlyModelViewSet):
          - tempo_medio_segundos
          - imagens_populares (top 5)
         """
-        qs = self.get_queryset()
-        total_executados = qs.count()
-        concluidos      = qs.filter(status='concluido').count()
-        falhas          = qs.filter(status='falha').count()
-
-        # tempo médio de execução
-        soma = 0
-        cont = 0
-        for p in qs.filter(status='concluido'):
-            info = p.resultado.get('container_info') if p.resultado else None
-            if info and info.get('duracao_segundos') is not None:
-                soma += info['duracao_segundos']
-                cont += 1
-        tempo_medio = (soma / cont) if cont else 0
-
-        # imagens mais usadas
-        imagens = {}
-        for p in qs:
-            info = p.resultado.get('container_info') if p.resultado else None
-            img = info.get('imagem') if info else None
-            if img:
-                imagens[img] = imagens.get(img, 0) + 1
-        imagens_populares = dict(
-            sorted(imagens.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Sem select_related/ordenação: apenas agregações no banco
+        qs = self.get_queryset().select_related(None).order_by()
+
+        # Contagens e tempo médio (colunas tipadas de ContainerExecucao) em uma consulta
+        totais = qs.aggregate(
+            total_executados=Count('id'),
+            concluidos=Count('id', filter=Q(status='concluido')),
+            falhas=Count('id', filter=Q(status='falha')),
+            tempo_medio=Avg('container__duracao_segundos', filter=Q(status='concluido')),
+        )
+        total_executados = totais['total_executados']
+        concluidos = totais['concluidos']
+        falhas = totais['falhas']
+        tempo_medio = totais['tempo_medio'] or 0
+
+        # imagens mais usadas (GROUP BY imagem, top 5)
+        imagens = (
+            qs.filter(container__imagem__gt='')  # INNER JOIN: ignora sem container/imagem
+            .values('container__imagem')
+            .annotate(total=Count('id'))
+            .order_by('-total', 'container__imagem')[:5]
         )
+        imagens_populares = {i['container__imagem']: i['total'] for i in imagens}
 
         return Response({
             'total_executados': total_executados,
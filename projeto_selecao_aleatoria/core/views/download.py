@@ -3,6 +3,7 @@ import logging
 import mimetypes
 import boto3
 from botocore.exceptions import ClientError
+from django.db.models import Count
 from django.http import HttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -12,10 +13,11 @@ from rest_framework.response import Response
 from ..models import ProcessamentoRPA, ResultadoProcessamento
 from ..serializers import ResultadoDownloadSerializer
 from ..permissions import IsOwnerOrAdmin
+from .base import AdiarCamposPesadosMixin
 
 logger = logging.getLogger("download_api")
 
-class ResultadoDownloadViewSet(viewsets.ReadOnlyModelViewSet):
+class ResultadoDownloadViewSet(AdiarCamposPesadosMixin, viewsets.ReadOnlyModelViewSet):
     """API para gerenciar downloads de resultados de processamento."""
     serializer_class = ResultadoDownloadSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
@@ -24,9 +26,17 @@ class ResultadoDownloadViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         """Retorna apenas os processamentos do usuário autenticado ou todos para admin."""
         user = self.request.user
-        if user.is_staff:
-            return ProcessamentoRPA.objects.all()
-        return ProcessamentoRPA.objects.filter(user=user)
+        queryset = ProcessamentoRPA.objects.all()
+        if not user.is_staff:
+            queryset = queryset.filter(user=user)
+        
+        # Evita uma consulta por linha/arquivo: contagem anotada na listagem
+        # e resultados carregados junto com o processamento no detalhe
+        if self.action == 'arquivos':
+            return queryset.prefetch_related('resultados_associados')
+        if self.action in ('list', 'retrieve'):
+            return queryset.annotate(resultados_count=Count('resultados_associados'))
+        return queryset
     
     @action(detail=True, methods=['get'])
     def arquivos(self, request, id=None):
@@ -35,8 +45,8 @@ class ResultadoDownloadViewSet(viewsets.ReadOnlyModelViewSet):
         arquivos = []
         
         # 1. Verificar se existem resultados no modelo ResultadoProcessamento
-        resultados = ResultadoProcessamento.objects.filter(processamento=processamento)
-        if resultados.exists():
+        resultados = list(processamento.resultados_associados.all())  # prefetch de get_queryset
+        if resultados:
             for r in resultados:
                 arquivos.append({
                     'id': str(r.id),
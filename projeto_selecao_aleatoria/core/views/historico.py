@@ -3,9 +3,9 @@ from rest_framework.permissions import IsAuthenticated
 
 from ..models import ProcessamentoRPA
 from ..serializers import RPAHistoricoSerializer
-from .base import HistoricoPagination
+from .base import AdiarCamposPesadosMixin, HistoricoPagination
 
-class HistoricoRPAViewSet(viewsets.ReadOnlyModelViewSet):
+class HistoricoRPAViewSet(AdiarCamposPesadosMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet para listar histórico de processamentos do usuário"""
     permission_classes = [IsAuthenticated]
     serializer_class = RPAHistoricoSerializer
@@ -1,7 +1,19 @@
 import os, shlex, subprocess, threading, logging
-from pathlib import Path
 from datetime import datetime
 
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import ContainerExecucao, ProcessamentoRPA
+from core.services import perfis
+from core.services import logs as logs_processamento
+from core.services.eventos_docker import LABEL_PROCESSAMENTO, obter_ouvinte
+from core.services.logs.seguidor import seguir
+from core.services.logs.tail import criar_buffer, encerrar_buffer
+from core.services.registro_vivo import obter_registro
+from core.services.coleta import ColetorResultados, metadados_arquivo
+from core.services.workspace import AreaTrabalho
+
 docker_logger = logging.getLogger("docker_rpa")
 
  # helper no topo do arquivo (depois dos imports)
@@ -9,10 +21,18 @@ def _safe_console(s: str) -> str:
     # Remove apenas chars que não existem no cp1252 (emojis, etc.); mantém acentos.
     return s.encode("cp1252", "ignore").decode("cp1252") if os.name == "nt" else s
 
+# Tempo máximo (s) aguardando o fim do `docker logs -f` depois do término do container
+ESPERA_FIM_LOGS = 30
+
+
 class RPADockerProcessor:
     """
     Executa o ETL dentro de um container Docker, fazendo stream dos logs e
     atualizando o modelo ProcessamentoRPA em tempo real.
+
+    O container roda em segundo plano (`docker run -d`); o término é
+    informado pelo ouvinte de `docker events`, que chama
+    ExecucaoDocker.finalizar com o código de saída e o indicador de OOM.
     """
 
  
@@ -20,6 +40,19 @@ class RPADockerProcessor:
     # ──────────────────────────────────────────────────────────────────────────
     # DISPARA EM THREAD
     # ──────────────────────────────────────────────────────────────────────────
+    @staticmethod
+    def iniciar_ouvinte():
+        """
+        Assina os eventos do Docker ao subir o servidor, sem aguardar a conexão.
+
+        A primeira conexão reconcilia os containers que terminaram enquanto o
+        servidor estava fora do ar, e os que ainda rodam são finalizados como
+        órfãos quando terminarem, sem depender de um novo disparo.
+        """
+        if not settings.RPA_EVENTOS_NA_INICIALIZACAO:
+            return
+        obter_ouvinte(ao_orfao=RPADockerProcessor.finalizar_orfao).iniciar(timeout=0)
+
     @staticmethod
     def processar_async(processamento):
         threading.Thread(
@@ -37,33 +70,62 @@ class RPADockerProcessor:
  
     @staticmethod
     def _processar(processamento):
+        area = AreaTrabalho(processamento)
+        execucao = None
+        ouvinte = obter_ouvinte(ao_orfao=RPADockerProcessor.finalizar_orfao)
         try:
             docker_logger.info(
                 "Iniciando Docker ETL (proc=%s, user=%s)",
                 processamento.id,
                 processamento.user_id,
             )
-            processamento.iniciar_processamento()
+            if not processamento.iniciar_processamento():
+                # Outro disparo já iniciou este processamento: não roda dois containers
+                docker_logger.warning("Processamento %s já foi iniciado; ignorando.", processamento.id)
+                return
 
-            # 1) Dados base 
-            imagem_docker = "selecao_aleatoria:v3.1"  # use a mesma tag em todo lugar
-            comando = processamento.dados_entrada.get("comando", "python -u main.py")
+            # 1) Dados base (imagem, comando, bucket etc. vêm do perfil de execução)
+            perfil = perfis.resolver(processamento)
+            imagem_docker = perfil.imagem
+            comando = processamento.dados_entrada.get("comando", perfil.comando)
+            bucket_name = perfil.bucket
+            s3_dir_key = f"{perfil.prefixo_s3}/usuarios/{processamento.user_id}/resultados/processamento_{processamento.id}/"
             container_name = f"selecao-aleatoria-{str(processamento.id).replace('-', '')[:12]}"
 
             container_info = {
                 "container_iniciado": datetime.now().isoformat(),
                 "imagem": imagem_docker,          # agora bate com o docker run
                 "comando": comando,
+                "perfil": perfil.nome,
                 "container_name": container_name,
                 "user_id": processamento.user_id,
             }
-            processamento.resultado = {"container_info": container_info}
-            processamento.save(update_fields=["resultado"])
+            # Etapas vão para a linha do tempo; `resultado` só é gravado no final
+            processamento.registrar_evento("container_configurado", **container_info)
+            # Colunas tipadas (um reinício sobrescreve a execução anterior)
+            ContainerExecucao.objects.update_or_create(
+                processamento=processamento,
+                defaults={
+                    "imagem": imagem_docker,
+                    "comando": comando or "",
+                    "perfil": perfil.nome,
+                    "container_name": container_name,
+                    "iniciado_em": timezone.now(),
+                    "container_id": "",
+                    "exit_code": None,
+                    "oom": False,
+                    "finalizado_em": None,
+                    "duracao_segundos": None,
+                    "s3_directory": "",
+                    "logs_s3": "",
+                    "output_dir": "",
+                },
+            )
 
 
-            # 2) Criar estrutura de diretórios local temporária para os resultados
-            output_dir = Path(f"temp_output/{processamento.user_id}/processamento_{processamento.id}")
-            output_dir.mkdir(parents=True, exist_ok=True) 
+            # 2) Criar área de trabalho local temporária para os resultados
+            area.criar()
+            output_dir = area.output_dir
   
 
             # 2.2) Criar estrutura de diretórios no S3
@@ -74,11 +136,6 @@ class RPADockerProcessor:
                 session = boto3.Session(profile_name='appbeta-s3-user', region_name='us-east-2')
                 s3_client = session.client('s3')
                 
-                bucket_name = "appbeta-user-results"
-                
-                # Caminho para a pasta do processamento
-                s3_dir_key = f"selecao_aleatoria/usuarios/{processamento.user_id}/resultados/processamento_{processamento.id}/"
-                
                 # Criar diretório no S3
                 s3_client.put_object(
                     Bucket=bucket_name,
@@ -88,24 +145,24 @@ class RPADockerProcessor:
                 
                 # Registrar o caminho nos metadados do processamento
                 container_info["s3_directory"] = f"s3://{bucket_name}/{s3_dir_key}"
-                processamento.resultado["container_info"] = container_info
-                processamento.save(update_fields=["resultado"])
+                processamento.registrar_evento("diretorio_s3", s3_directory=container_info["s3_directory"])
+                ContainerExecucao.atualizar(processamento.id, s3_directory=container_info["s3_directory"])
                 
                 docker_logger.info(f"Diretório S3 criado: s3://{bucket_name}/{s3_dir_key}")
             except Exception as e:
                 docker_logger.error(f"Erro ao criar diretório no S3: {e}")
 
           # 3) Variáveis de ambiente (inclui AWS e OUTPUT_DIR)
-            env_vars = processamento.dados_entrada.get("env_vars", {})
+            env_vars = {**perfil.env_padrao, **processamento.dados_entrada.get("env_vars", {})}
             env_vars.update({
                 "USER_ID": str(processamento.user_id),
                 "PROCESSAMENTO_ID": str(processamento.id),
                 "OUTPUT_DIR": "/app/output",  # garanta que seu salvar_excel use isso
                 "AWS_REGION": os.getenv("AWS_REGION", "us-east-2"),
-                "AWS_S3_BUCKET": os.getenv("AWS_S3_BUCKET", "appbeta-user-results"),
+                "AWS_S3_BUCKET": bucket_name,
                 "AWS_PROFILE": os.getenv("AWS_PROFILE", "appbeta-s3-user"),
                 "S3_SSE": os.getenv("S3_SSE", "AES256"),
-                "S3_BASE_PREFIX": os.getenv("S3_BASE_PREFIX", "selecao_aleatoria"),
+                "S3_BASE_PREFIX": perfil.prefixo_s3,
             })
 
             # 4) Volumes (output + dados + ~/.aws)
@@ -115,24 +172,18 @@ class RPADockerProcessor:
                     return f"/{drive.rstrip(':').lower()}{rest.replace('\\', '/')}"
                 return p
 
-            output_dir.mkdir(parents=True, exist_ok=True)
-            host_output = to_docker_path(str(output_dir.resolve()))
-
             aws_creds_dir = os.path.expanduser("~/.aws")
             aws_creds_dir_docker = to_docker_path(aws_creds_dir)
 
-            dados_dir = Path(f"temp_dados/{processamento.user_id}/processamento_{processamento.id}")
-            dados_dir.mkdir(parents=True, exist_ok=True)
-            host_dados = to_docker_path(str(dados_dir.resolve()))
-
             # 5) docker run como LISTA (sem -it, sem aspas simples) 
             args = [
-                "docker", "run", "--rm",
+                "docker", "run", "-d",
                 "--name", container_name,
+                "--label", f"{LABEL_PROCESSAMENTO}={processamento.id}",
                 "-w", "/app",
-                "-v", f"{host_output}:/app/output:rw",
                 "-v", f"{aws_creds_dir_docker}:/root/.aws:ro",
-                "-v", f"{host_dados}:/app/dados:rw",
+                *area.argumentos_docker(to_docker_path),
+                *perfil.argumentos_limites(),
             ]
             for k, v in env_vars.items():
                 args += ["-e", f"{k}={v}"]
@@ -143,116 +194,343 @@ class RPADockerProcessor:
 
             docker_logger.info("Docker args: %s", args)
 
-            # 6) Executa container e stream de logs
-            run_proc = subprocess.Popen(
-                args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                bufsize=1,
+
+            # 6) Estado da execução (coleta de resultados, log e término)
+            execucao = ExecucaoDocker(
+                processamento, perfil, area, container_info, bucket_name, s3_dir_key
+            )
+            # Glob só do perfil (configurado pelo admin), nunca da requisição
+            execucao.iniciar_coleta(perfil.output_glob)
+
+            # 7) Executa container em segundo plano; o término chega pelo docker events
+            ouvinte.acompanhar(processamento.id, execucao.finalizar)
+            subprocess.run(["docker", "rm", "-f", container_name], capture_output=True)
+            run_proc = subprocess.run(args, capture_output=True, text=True)
+            if run_proc.returncode != 0:
+                ouvinte.esquecer(processamento.id)
+                raise RuntimeError(
+                    f"docker run falhou (código {run_proc.returncode}): {run_proc.stderr.strip()}"
+                )
+            container_id = run_proc.stdout.strip()
+            container_info["container_id"] = container_id
+            processamento.registrar_evento("container_iniciado", container_id=container_id)
+            ContainerExecucao.atualizar(processamento.id, container_id=container_id)
+            ouvinte.associar_container(processamento.id, container_id)
+
+            # 8) Stream de logs (leitura multiplexada, sem thread por container)
+            seguir(
+                ["docker", "logs", "-f", container_name],
+                execucao.receber_linha,
+                execucao.fim_dos_logs,
+            )
+
+        except Exception as exc:
+            docker_logger.exception("Falha geral no Docker ETL: %s", exc)
+            if execucao:
+                ouvinte.esquecer(processamento.id)
+                execucao.abortar(str(exc))
+            else:
+                processamento.falhar(str(exc))
+                area.reter()
+
+    @staticmethod
+    def finalizar_orfao(processamento_id, exit_code, oom, container_id):
+        """
+        Finaliza um container cujo processamento não está sendo acompanhado
+        neste processo (ex.: servidor reiniciado durante a execução).
+        """
+        processamento = ProcessamentoRPA.objects.filter(
+            id=processamento_id, status="processando"
+        ).first()
+        if processamento is None:
+            return
+        esperado = (
+            ContainerExecucao.objects.filter(processamento=processamento)
+            .values_list("container_id", flat=True).first()
+        )
+        if esperado and container_id and esperado != container_id:
+            return
+        if not ContainerExecucao.reivindicar_finalizacao(processamento_id, container_id):
+            # Dono (ou outro processo) já está finalizando: não recria log nem reenvia resultados
+            docker_logger.info("Término do processamento %s já está sendo tratado", processamento_id)
+            return
+
+        docker_logger.info("Finalizando processamento órfão %s (exit=%s)", processamento_id, exit_code)
+        execucao = ExecucaoDocker.recuperar(processamento)
+        execucao.encerrar(exit_code, oom, container_id)
+
+
+class ExecucaoDocker:
+    """
+    Estado de um container em execução, mantido até o evento de término.
+
+    Reúne o coletor de resultados, o log compactado e o buffer do tail ao
+    vivo. `finalizar` é chamado pelo ouvinte de eventos e só prossegue se
+    reservar a finalização (ContainerExecucao.reivindicar_finalizacao).
+    """
+
+    def __init__(self, processamento, perfil, area, container_info, bucket_name, s3_dir_key):
+        self.processamento = processamento
+        self.perfil = perfil
+        self.area = area
+        self.container_info = container_info
+        self.container_name = container_info["container_name"]
+        self.bucket_name = bucket_name
+        self.s3_dir_key = s3_dir_key
+
+        self.coletor = None
+        self.escritor_log = logs_processamento.EscritorLogCompactado(
+            logs_processamento.diretorio_local(processamento)
+        )
+        self.buffer_log = criar_buffer(processamento)
+        self._logs_encerrados = threading.Event()
+        # Estado vivo deste processamento é mantido aqui até o término (sem TTL)
+        obter_registro().acompanhar(processamento.id)
+
+        self._s3 = None
+        self._s3_lock = threading.Lock()
+
+    @classmethod
+    def recuperar(cls, processamento):
+        """
+        Reconstrói a execução a partir do banco e da área de trabalho, lendo
+        o log completo do container já encerrado.
+        """
+        perfil = perfis.resolver(processamento)
+        execucao_container = ContainerExecucao.objects.filter(processamento=processamento).first()
+        if execucao_container is not None:
+            container_info = execucao_container.como_container_info()
+        else:
+            container_info = processamento.dados_eventos(
+                "container_configurado", "diretorio_s3", "container_iniciado"
+            )
+        container_info.setdefault(
+            "container_name",
+            f"selecao-aleatoria-{str(processamento.id).replace('-', '')[:12]}",
+        )
+        container_info.setdefault("container_iniciado", datetime.now().isoformat())
+        s3_dir_key = f"{perfil.prefixo_s3}/usuarios/{processamento.user_id}/resultados/processamento_{processamento.id}/"
+
+        execucao = cls(
+            processamento, perfil, AreaTrabalho(processamento), container_info, perfil.bucket, s3_dir_key
+        )
+        # Sem thread de observação: a varredura final envia tudo que estiver na saída
+        execucao.coletor = ColetorResultados(
+            execucao.area.output_dir,
+            perfil.output_glob,
+            execucao.enviar_resultado,
+        )
+        saida = subprocess.run(
+            ["docker", "logs", execucao.container_name],
+            capture_output=True, text=True, encoding="utf-8", errors="replace",
+        )
+        for linha in (saida.stdout + saida.stderr).splitlines():
+            execucao.escritor_log.escrever(linha)
+        execucao.fim_dos_logs()
+        return execucao
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Durante a execução
+    # ──────────────────────────────────────────────────────────────────────
+    def obter_s3(self):
+        with self._s3_lock:
+            if self._s3 is None:
+                import boto3
+                # Usar perfil específico
+                session = boto3.Session(profile_name='appbeta-s3-user', region_name='us-east-2')
+                self._s3 = session.client('s3')
+            return self._s3
+
+    def enviar_resultado(self, arq):
+        info = {
+            "nome": arq.name,
+            "data_upload": datetime.now().isoformat(),
+        }
+        # Upload para o S3 com a estrutura solicitada
+        try:
+            # Arquivo removido/sem permissão também vira registro não enviado (área retida)
+            info.update(metadados_arquivo(arq))
+
+            # Caminho no formato: selecao_aleatoria/usuarios/14/resultados/processamento_1/arquivo.xlsx
+            s3_key = f"{self.s3_dir_key}{arq.name}"
+
+            # Upload do arquivo
+            self.obter_s3().upload_file(
+                str(arq), self.bucket_name, s3_key,
+                ExtraArgs={"ServerSideEncryption": "AES256", "ContentType": info["content_type"]}
             )
-            for linha in run_proc.stdout:
-                linha = linha.rstrip()
-                docker_logger.info("[%s] %s", container_name, _safe_console(linha))  # <- sem emojis no console
-
-                # Use a linha original para detectar progresso (funciona mesmo com emojis)
-                if any(p in linha for p in ("Baixando arquivo", "Extraindo dados")):
-                    processamento.atualizar_progresso(25)
-                elif any(p in linha for p in ("Transformação", "Coluna para acessar")):
-                    processamento.atualizar_progresso(50)
-                elif "Seleção de itens concluída" in linha:
-                    processamento.atualizar_progresso(60)
-                elif "Resultado salvo como" in linha:
-                    processamento.atualizar_progresso(75)
-                elif "Upload concluído" in linha:
-                    processamento.atualizar_progresso(90)
-                elif "Pipeline ETL Concluído" in linha:
-                    processamento.atualizar_progresso(100)
-
-            # 7) Aguarda término
-            run_proc.wait()
-            exit_code = run_proc.returncode or 0
-
-            # 8) Procura arquivos de resultado e faz upload para S3
-            arquivos = [f for f in output_dir.glob("SA_*.xlsx") if f.is_file()]
+
+            # Caminho completo para o arquivo no S3
+            s3_path = f"s3://{self.bucket_name}/{s3_key}"
+            docker_logger.info(f"Arquivo enviado para S3: {s3_path}")
+            return {**info, "caminho": s3_path, "enviado": True}
+        except Exception as e:
+            # Fallback para caminho local se falhar o upload
+            docker_logger.error(f"Erro ao enviar para S3: {e}")
+            return {**info, "caminho": str(arq), "enviado": False, "erro": str(e)}
+
+    def iniciar_coleta(self, output_glob):
+        """Upload de resultados em paralelo à execução do container."""
+        self.coletor = ColetorResultados(
+            self.area.output_dir, output_glob, self.enviar_resultado
+        ).iniciar()
+
+    def receber_linha(self, linha):
+        self.escritor_log.escrever(linha)
+        self.buffer_log.publicar(linha)
+        # Linha a linha só em DEBUG: o log completo fica no arquivo do processamento
+        docker_logger.debug("[%s] %s", self.container_name, _safe_console(linha))  # <- sem emojis no console
+
+        # Use a linha original para detectar progresso (funciona mesmo com emojis)
+        marcador = self.perfil.marcador_para_linha(linha)
+        if marcador:
+            self.processamento.atualizar_progresso(marcador[0])
+            obter_registro().atualizar(self.processamento.id, fase=marcador[1], ultima_linha=linha)
+        else:
+            obter_registro().atualizar(self.processamento.id, ultima_linha=linha)
+
+    def fim_dos_logs(self):
+        self._logs_encerrados.set()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Término
+    # ──────────────────────────────────────────────────────────────────────
+    def finalizar(self, exit_code, oom=False, container_id=None):
+        """
+        Conclui o processamento a partir do evento de término do container.
+
+        Args:
+            exit_code: Código de saída informado pelo Docker
+            oom: O container foi encerrado por falta de memória
+            container_id: ID do container encerrado
+        """
+        if not ContainerExecucao.reivindicar_finalizacao(self.processamento.id, container_id):
+            # Finalizado em outro processo (ex.: como órfão): só libera o que é deste processo
+            docker_logger.info("Término do processamento %s já foi tratado", self.processamento.id)
+            if self.coletor:
+                self.coletor.parar()
+            encerrar_buffer(self.buffer_log)
+            obter_registro().liberar(self.processamento.id)
+            return
+        self.encerrar(exit_code, oom, container_id)
+
+    def encerrar(self, exit_code, oom=False, container_id=None):
+        """Finalização propriamente dita; exige a finalização já reservada."""
+        processamento = self.processamento
+        container_info = self.container_info
+        try:
+            # O container terminou: espera o restante do log chegar
+            if not self._logs_encerrados.wait(ESPERA_FIM_LOGS):
+                docker_logger.warning("Log do container %s não terminou a tempo", self.container_name)
+
+            # Conclui a coleta (só falta o que não estava fechado)
+            enviados = self.coletor.finalizar()
+            processamento.registrar_evento(
+                "resultados_coletados",
+                arquivos=[r["nome"] for r in enviados],
+                enviados=sum(1 for r in enviados if r["enviado"]),
+            )
+
+            # Log do container vai para o S3 junto dos resultados
+            self.escritor_log.fechar()
+            try:
+                logs_s3 = logs_processamento.enviar_para_s3(
+                    self.escritor_log, self.obter_s3(), self.bucket_name, f"{self.s3_dir_key}logs/"
+                )
+                if logs_s3:  # Log vazio: nada enviado, o endpoint de logs responde 404
+                    container_info["logs_s3"] = logs_s3
+                    processamento.registrar_evento("log_enviado", logs_s3=logs_s3)
+            except Exception as e:
+                docker_logger.error(f"Erro ao enviar log para S3 (mantido local): {e}")
+            upload_ok = all(r["enviado"] for r in enviados)
+            arquivos = [
+                {k: v for k, v in r.items() if k != "enviado"} for r in enviados
+            ]
             if arquivos:
-                arq = arquivos[0]
-                
-                # Upload para o S3 com a estrutura solicitada
-                try:
-                    import boto3
-                    # Usar perfil específico
-                    session = boto3.Session(profile_name='appbeta-s3-user', region_name='us-east-2')
-                    s3_client = session.client('s3')
-                    
-                    bucket_name = "appbeta-user-results"
-                    
-                    # Caminho no formato: selecao_aleatoria/usuarios/14/resultados/processamento_1/arquivo.xlsx
-                    s3_key = f"selecao_aleatoria/usuarios/{processamento.user_id}/resultados/processamento_{processamento.id}/{arq.name}"
-                    
-                    # Upload do arquivo
-                    s3_client.upload_file(
-                        str(arq), bucket_name, s3_key,
-                        ExtraArgs={"ServerSideEncryption": "AES256", "ContentType": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}
-                    )
-
-                    # Caminho completo para o arquivo no S3
-                    s3_path = f"s3://{bucket_name}/{s3_key}"
-                    container_info.update(
-                        resultado_arquivo=arq.name,
-                        caminho_arquivo=s3_path,
-                    )
-                    docker_logger.info(f"Arquivo enviado para S3: {s3_path}")
-                except Exception as e:
-                    # Fallback para caminho local se falhar o upload
-                    docker_logger.error(f"Erro ao enviar para S3: {e}")
-                    container_info.update(
-                        resultado_arquivo=arq.name,
-                        caminho_arquivo=str(arq),
-                    )
-
-            # 9) Metadados finais
+                # Primeiro arquivo mantido nos campos antigos para compatibilidade
+                container_info.update(
+                    resultado_arquivo=arquivos[0]["nome"],
+                    caminho_arquivo=arquivos[0]["caminho"],
+                )
+
+            # Metadados finais
             fim = datetime.now()
-            duracao = (
-                fim - datetime.fromisoformat(container_info["container_iniciado"])
-            ).total_seconds()
+            inicio = datetime.fromisoformat(container_info["container_iniciado"])
+            if timezone.is_aware(inicio):
+                # Execução recuperada das colunas tipadas (datas com fuso)
+                inicio = timezone.make_naive(inicio)
+            duracao = (fim - inicio).total_seconds()
 
             container_info.update(
                 container_finalizado=fim.isoformat(),
                 duracao_segundos=duracao,
                 exit_code=exit_code,
-                output_dir=str(output_dir),
+                oom=oom,
+                output_dir=str(self.area.output_dir),
+            )
+            processamento.registrar_evento(
+                "container_finalizado", exit_code=exit_code, oom=oom, duracao_segundos=duracao
+            )
+            ContainerExecucao.atualizar(
+                processamento.id,
+                exit_code=exit_code,
+                oom=oom,
+                finalizado_em=timezone.now(),
+                duracao_segundos=duracao,
+                logs_s3=container_info.get("logs_s3", ""),
+                output_dir=str(self.area.output_dir),
             )
-            processamento.resultado["container_info"] = container_info
-            processamento.save(update_fields=["resultado"])
 
-            # 10) Status final
-            if exit_code == 0:
+            # Status final
+            if exit_code == 0 and not oom:
                 processamento.concluir(
                     {
                         "tipo": processamento.tipo,
                         "mensagem": "Processamento ETL concluído com sucesso",
                         "timestamp": fim.isoformat(),
                         **container_info,
+                        "arquivos": arquivos,
                     }
                 )
                 docker_logger.info("Processo %s concluído com sucesso.", processamento.id)
             else:
-                processamento.falhar(
-                    f"Container retornou código {exit_code}."
-                )
+                upload_ok = False
+                if oom:
+                    mensagem = f"Container encerrado por falta de memória (OOM, código {exit_code})."
+                else:
+                    mensagem = f"Container retornou código {exit_code}."
+                processamento.falhar(mensagem, resultado={"container_info": container_info})
                 docker_logger.error(
-                    "Processo %s falhou (exit=%s).", processamento.id, exit_code
+                    "Processo %s falhou (exit=%s, oom=%s).", processamento.id, exit_code, oom
                 )
 
+            # Área de trabalho: remove após upload, mantém (com TTL) para depuração
+            if upload_ok:
+                self.area.remover()
+            else:
+                self.area.reter()
+
+            # Sem --rm no docker run: o container é removido depois de lido o código de saída
+            subprocess.run(["docker", "rm", "-f", container_id or self.container_name], capture_output=True)
+
         except Exception as exc:
-            docker_logger.exception("Falha geral no Docker ETL: %s", exc)
-            processamento.falhar(str(exc))
-            # Limpeza (se ainda existir)
-            try:
-                subprocess.run(["docker", "rm", "-f", container_name])
-            except Exception:
-                pass
-                
\ No newline at end of file
+            docker_logger.exception("Falha ao finalizar o Docker ETL: %s", exc)
+            self.abortar(str(exc))
+        finally:
+            encerrar_buffer(self.buffer_log)
+            obter_registro().liberar(self.processamento.id)
+
+    def abortar(self, mensagem):
+        """Marca a falha e libera os recursos da execução."""
+        self.processamento.falhar(mensagem, resultado={"container_info": self.container_info})
+        if self.coletor:
+            self.coletor.parar()
+        self.escritor_log.fechar()
+        self.area.reter()
+        encerrar_buffer(self.buffer_log)
+        obter_registro().liberar(self.processamento.id)
+        # Limpeza (se ainda existir)
+        try:
+            subprocess.run(["docker", "rm", "-f", self.container_name], capture_output=True)
+        except Exception:
+            pass
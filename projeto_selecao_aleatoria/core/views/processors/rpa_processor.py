@@ -24,7 +24,9 @@ class RPAProcessor:
         """Executa o processamento simulado."""
         try:
             logger.info(f"Iniciando processamento RPA {processamento.id}")
-            processamento.iniciar_processamento()
+            if not processamento.iniciar_processamento():
+                logger.warning(f"Processamento RPA {processamento.id} já foi iniciado; ignorando.")
+                return
 
             duracao_total = 30  # tempo total do processamento (segundos)
             processamento.tempo_estimado = duracao_total
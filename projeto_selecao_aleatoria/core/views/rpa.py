@@ -1,20 +1,51 @@
+import hashlib
+import json
 import logging
+import threading
+import time
+import uuid
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 
 from ..models import ProcessamentoRPA
-from ..serializers import RPADockerSerializer
+from ..serializers import RPADockerSerializer, RPAStatusSerializer
+from ..services.pubsub import barramento, topico_processamento
+from ..services.registro_vivo import CAMPOS_MODELO, STATUS_ATIVOS, obter_registro
+from .base import AtivosPagination
 from .processors.rpa_processor import RPAProcessor
 
 logger = logging.getLogger(__name__)
 
+# Tempo máximo (s) que uma requisição de long-poll fica aguardando mudança
+TIMEOUT_AGUARDAR_MAX = 30
+
+# Quantidade máxima de ids por consulta de status em lote
+LIMITE_IDS_STATUS = 200
+
+def _etag_pagina(total, numero, tamanho, estados):
+    """
+    ETag de uma página de processamentos ativos, a partir dos campos serializados.
+
+    Returns:
+        ETag entre aspas
+    """
+    assinatura = [total, numero, tamanho] + [
+        [getattr(estado, campo, None) for campo in RPAStatusSerializer.Meta.fields]
+        for estado in estados
+    ]
+    conteudo = json.dumps(assinatura, default=str, separators=(',', ':')).encode('utf-8')
+    return quote_etag(hashlib.sha1(conteudo).hexdigest())
+
 class RPAViewSet(viewsets.ModelViewSet):
     """ViewSet para gerenciar processamentos RPA."""
     permission_classes = [IsAuthenticated]
-    pagination_class = PageNumberPagination
+    pagination_class = AtivosPagination
 
     def get_object(self):
         # Check if this is a schema request
@@ -30,12 +61,151 @@ class RPAViewSet(viewsets.ModelViewSet):
             user=self.request.user
         )
 
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Estado de um processamento do usuário.
+        Processamentos ativos são servidos do registro em memória, sem consultar o banco.
+        """
+        objeto = obter_registro().estado_do_processamento(kwargs['pk'], request.user.id)
+        if objeto is None:
+            raise NotFound("Processamento não encontrado.")
+        return Response(RPAStatusSerializer(objeto).data)
+
+    @action(detail=True, methods=['get'])
+    def aguardar(self, request, pk=None):
+        """
+        Long-poll: responde quando o processamento difere do estado conhecido pelo cliente.
+        GET /api/rpa/{id}/aguardar/?progresso=40&status=processando&timeout=30
+
+        Retorna imediatamente se o estado atual já é diferente (ou terminal);
+        caso contrário aguarda uma notificação de mudança ou o timeout. Em
+        ambos os casos a resposta é o estado atual, com `alterado` indicando
+        se houve mudança em relação ao informado.
+        """
+        try:
+            progresso = request.query_params.get('progresso')
+            progresso = int(progresso) if progresso not in (None, '') else None
+            timeout = min(max(float(request.query_params.get('timeout', TIMEOUT_AGUARDAR_MAX)), 0), TIMEOUT_AGUARDAR_MAX)
+        except ValueError:
+            return Response(
+                {'erro': 'progresso e timeout devem ser numéricos'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        status_conhecido = request.query_params.get('status') or None
+
+        def alterado(objeto):
+            return (
+                (status_conhecido is not None and objeto.status != status_conhecido)
+                or (progresso is not None and objeto.progresso != progresso)
+            )
+
+        registro = obter_registro()
+        mudou = threading.Event()
+        # Assina antes de ler o estado: uma mudança entre a leitura e a espera não é perdida
+        cancelar = barramento.assinar(topico_processamento(pk), lambda mensagem: mudou.set())
+        try:
+            objeto = registro.estado_do_processamento(pk, request.user.id)
+            if objeto is None:
+                raise NotFound("Processamento não encontrado.")
+
+            limite = time.monotonic() + timeout
+            while (
+                objeto.status in STATUS_ATIVOS
+                and (status_conhecido is not None or progresso is not None)
+                and not alterado(objeto)
+            ):
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                # Processamentos de outros processos não notificam: relê a cada TTL do registro
+                mudou.wait(min(restante, max(registro.ttl, 1)))
+                mudou.clear()
+                objeto = registro.estado_do_processamento(pk, request.user.id) or objeto
+        finally:
+            cancelar()
+
+        return Response({**RPAStatusSerializer(objeto).data, 'alterado': alterado(objeto)})
+
+    @action(detail=False, methods=['post'], url_path='status')
+    def status_lote(self, request):
+        """
+        Estado de vários processamentos em uma única requisição.
+        POST /api/rpa/status/  {"ids": ["<uuid>", ...]}
+
+        Ativos são lidos do registro em memória; os demais com uma única
+        consulta `id__in` restrita às colunas do status.
+        """
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list):
+            return Response(
+                {'erro': 'Informe "ids" como uma lista'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(ids) > LIMITE_IDS_STATUS:
+            return Response(
+                {'erro': f'Máximo de {LIMITE_IDS_STATUS} ids por requisição'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # id informado -> forma canônica do UUID (None se inválido)
+        chaves = {}
+        for valor in map(str, ids):
+            try:
+                chaves[valor] = str(uuid.UUID(valor))
+            except ValueError:
+                chaves[valor] = None
+
+        registro = obter_registro()
+        encontrados = {}
+        faltantes = []
+        for chave in dict.fromkeys(c for c in chaves.values() if c):
+            estado = registro.obter(chave, request.user.id)
+            if estado is not None:
+                encontrados[chave] = estado
+            else:
+                faltantes.append(chave)
+
+        if faltantes:
+            for processamento in ProcessamentoRPA.objects.filter(
+                user=request.user, id__in=faltantes
+            ).only(*CAMPOS_MODELO):
+                chave = str(processamento.id)
+                if processamento.status in STATUS_ATIVOS:
+                    encontrados[chave] = registro.registrar(processamento, local=False)
+                else:
+                    encontrados[chave] = processamento
+
+        return Response({
+            'processamentos': RPAStatusSerializer(
+                [encontrados[c] for c in dict.fromkeys(chaves.values()) if c in encontrados], many=True
+            ).data,
+            'nao_encontrados': [valor for valor, chave in chaves.items() if chave not in encontrados],
+        })
+
     def list(self, request, *args, **kwargs):
-        # Log para verificar processos retornados
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        logger.info(f"Processos retornados: {serializer.data}")
-        return Response(serializer.data)
+        """
+        Processamentos ativos do usuário, paginados, na representação compacta de status.
+        GET /api/rpa/?page=1&page_size=20
+
+        Servido do registro em memória (como /api/docker-rpa/ativos/). A resposta
+        traz um ETag do conteúdo da página: com If-None-Match igual, responde
+        304 sem corpo e sem serializar.
+        """
+        estados = obter_registro().ativos_do_usuario(request.user.id)
+        pagina = self.paginate_queryset(estados)
+        paginacao = self.paginator.page
+
+        etag = _etag_pagina(paginacao.paginator.count, paginacao.number, len(pagina), pagina)
+        nao_modificado = get_conditional_response(request, etag=etag)
+        if nao_modificado is not None:
+            nao_modificado['ETag'] = etag
+            return nao_modificado
+
+        response = self.get_paginated_response(RPAStatusSerializer(pagina, many=True).data)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        logger.info("Processamentos ativos retornados: %d de %d", len(pagina), paginacao.paginator.count)
+        return response
 
     def get_queryset(self):
         """Somente processos ativos do usuário logado."""
@@ -82,20 +252,13 @@ class RPAViewSet(viewsets.ModelViewSet):
         """Permite reiniciar um processamento concluído ou com falha."""
         processamento = self.get_object()
 
-        if processamento.status in ['concluido', 'falha']:
-            processamento.status = 'pendente'
-            processamento.iniciado_em = None
-            processamento.concluido_em = None
-            processamento.resultado = None
-            processamento.mensagem_erro = None
-            processamento.progresso = 0
-            processamento.tempo_real = None
-            processamento.save()
-
+        # Compare-and-set: dois pedidos simultâneos não disparam duas execuções
+        if processamento.reiniciar():
             RPAProcessor.processar_async(processamento)
 
             return Response({'mensagem': 'Processamento RPA reiniciado'})
         else:
+            processamento.refresh_from_db(fields=['status'])
             return Response(
                 {'erro': f'Não é possível reiniciar um processamento com status {processamento.status}'},
                 status=status.HTTP_400_BAD_REQUEST
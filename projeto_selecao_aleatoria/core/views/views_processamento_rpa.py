@@ -7,9 +7,10 @@ from drf_yasg import openapi
 
 from core.models import ProcessamentoRPA
 from core.serializers.processamentoserializer import ProcessamentoRPASerializer
+from core.views.base import AdiarCamposPesadosMixin
 
 
-class ProcessamentoRPAViewSet(viewsets.ReadOnlyModelViewSet):
+class ProcessamentoRPAViewSet(AdiarCamposPesadosMixin, viewsets.ReadOnlyModelViewSet):
     """
     API para listar e visualizar informações de processamentos RPA.
     """